@@ -0,0 +1,309 @@
+# ABOUTME: Local agent that keeps an authenticated client and secret cache in memory.
+# ABOUTME: Serves read requests over a Unix domain socket only the current user can reach.
+
+import builtins
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from pathlib import Path
+
+from vaultuner.cache import get_cache_dir
+from vaultuner.profile import span
+
+DEFAULT_AGENT_TTL = 300
+CONNECT_TIMEOUT = 0.5
+REQUEST_TIMEOUT = 60.0
+
+
+def get_agent_socket_path() -> Path:
+    """Return the agent socket path, honouring VAULTUNER_AGENT_SOCKET."""
+    override = os.environ.get("VAULTUNER_AGENT_SOCKET")
+    if override:
+        return Path(override)
+    return get_cache_dir() / "agent.sock"
+
+
+class SecretCache:
+    """In-memory cache of the organization listing and fetched secrets.
+
+    The lock only guards the cached entries; SDK calls run outside it, so
+    cache hits never wait behind a fetch. Each entry is fetched by one request
+    at a time, and concurrent requests for it wait for that fetch instead of
+    starting their own.
+    """
+
+    LISTING = "list"
+    PROJECTS = "projects"
+
+    def __init__(self, client, organization_id: str, ttl: int = DEFAULT_AGENT_TTL):
+        self.client = client
+        self.organization_id = organization_id
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # Keyed by LISTING, PROJECTS or a secret ID
+        self._entries: dict[str, tuple[float, dict]] = {}
+        self._inflight: dict[str, Future] = {}
+        # Bumped by invalidate so fetches started before it are not stored
+        self._generation = 0
+
+    def _fresh(self, fetched_at: float) -> bool:
+        return time.monotonic() - fetched_at < self.ttl
+
+    def _load(
+        self,
+        keys: builtins.list[str],
+        fetch: Callable[[builtins.list[str]], dict[str, dict]],
+    ) -> dict[str, dict]:
+        """Return cached entries for ``keys``, fetching missing or stale ones.
+
+        ``fetch`` is called with the keys no other request is fetching and
+        returns the entries it found. Keys it does not return are left out.
+        """
+        claimed: builtins.list[str] = []
+        waiting: builtins.list[Future] = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                entry = self._entries.get(key)
+                if entry is not None and self._fresh(entry[0]):
+                    continue
+                if key in self._inflight:
+                    waiting.append(self._inflight[key])
+                else:
+                    self._inflight[key] = Future()
+                    claimed.append(key)
+            generation = self._generation
+
+        if claimed:
+            try:
+                fetched = fetch(claimed)
+            except BaseException as e:
+                with self._lock:
+                    for key in claimed:
+                        self._inflight.pop(key).set_exception(e)
+                raise
+            now = time.monotonic()
+            with self._lock:
+                if generation == self._generation:
+                    for key, value in fetched.items():
+                        self._entries[key] = (now, value)
+                for key in claimed:
+                    self._inflight.pop(key).set_result(None)
+        for future in waiting:
+            future.result()
+
+        with self._lock:
+            return {key: self._entries[key][1] for key in keys if key in self._entries}
+
+    def _load_one(self, key: str, fetch: Callable[[], dict]) -> dict:
+        while True:
+            found = self._load([key], lambda _: {key: fetch()})
+            # Missing only if invalidated while fetching; fetch again
+            if key in found:
+                return found[key]
+
+    def list(self) -> dict:
+        """Return the serialized secret identifiers response."""
+        return self._load_one(
+            self.LISTING,
+            lambda: self.client.secrets().list(self.organization_id).to_dict(),
+        )
+
+    def list_projects(self) -> dict:
+        """Return the serialized projects response."""
+        return self._load_one(
+            self.PROJECTS,
+            lambda: self.client.projects().list(self.organization_id).to_dict(),
+        )
+
+    def get_by_ids(self, ids: builtins.list[str]) -> builtins.list[dict]:
+        """Return serialized secrets for the given IDs, fetching missing ones in bulk."""
+        from vaultuner.client import get_secrets_by_ids
+
+        def fetch(missing: builtins.list[str]) -> dict[str, dict]:
+            return {
+                secret_id: secret.to_dict()
+                for secret_id, secret in get_secrets_by_ids(self.client, missing).items()
+            }
+
+        found = self._load(ids, fetch)
+        return [found[i] for i in ids if i in found]
+
+    def invalidate(self) -> None:
+        """Drop everything so the next request refetches."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+class AgentRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON request line and answer with one JSON response line."""
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            response = self.server.dispatch(request)
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class AgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path, cache: SecretCache):
+        self.cache = cache
+        super().__init__(str(path), AgentRequestHandler)
+
+    def dispatch(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ping":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "organization_id": self.cache.organization_id,
+            }
+        if op == "list":
+            return {"ok": True, "data": self.cache.list()}
+        if op == "list_projects":
+            return {"ok": True, "data": self.cache.list_projects()}
+        if op == "get_by_ids":
+            return {"ok": True, "data": self.cache.get_by_ids(request["ids"])}
+        if op == "invalidate":
+            self.cache.invalidate()
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown operation: {op}"}
+
+
+def serve_agent(client, organization_id: str, ttl: int = DEFAULT_AGENT_TTL) -> None:
+    """Serve cached secrets on the agent socket until interrupted."""
+    path = get_agent_socket_path()
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+
+    # Create the socket without group/other access from the start
+    old_umask = os.umask(0o177)
+    try:
+        server = AgentServer(path, SecretCache(client, organization_id, ttl))
+    finally:
+        os.umask(old_umask)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+
+
+def agent_request(request: dict, timeout: float = REQUEST_TIMEOUT) -> dict | None:
+    """Send a request to the running agent. Returns None if no agent answers."""
+    path = get_agent_socket_path()
+    if not path.exists():
+        return None
+    try:
+        with (
+            span(f"agent.{request['op']}", "agent"),
+            socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock,
+        ):
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(path))
+            sock.settimeout(timeout)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except OSError:
+        return None
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def invalidate_agent() -> None:
+    """Tell a running agent to drop its cache after a write."""
+    agent_request({"op": "invalidate"}, timeout=CONNECT_TIMEOUT)
+
+
+def _agent_data(request: dict):
+    """Send a request to the agent and return its data, raising like the SDK on failure."""
+    response = agent_request(request)
+    if response is None:
+        raise Exception("vaultuner agent is not responding")
+    if not response["ok"]:
+        raise Exception(response["error"])
+    return response["data"]
+
+
+class AgentSecretsClient:
+    """Read-only stand-in for the SDK's SecretsClient, backed by the agent."""
+
+    def list(self, organization_id: str):
+        from bitwarden_sdk.schemas import ResponseForSecretIdentifiersResponse
+
+        return ResponseForSecretIdentifiersResponse.from_dict(
+            _agent_data({"op": "list"})
+        )
+
+    def get_by_ids(self, ids: builtins.list[str]):
+        from bitwarden_sdk.schemas import ResponseForSecretsResponse
+
+        secrets = _agent_data({"op": "get_by_ids", "ids": [str(i) for i in ids]})
+        return ResponseForSecretsResponse.from_dict(
+            {"success": True, "data": {"data": secrets}}
+        )
+
+    def get(self, id: str):
+        from bitwarden_sdk.schemas import ResponseForSecretResponse
+
+        secrets = _agent_data({"op": "get_by_ids", "ids": [str(id)]})
+        if not secrets:
+            raise Exception(f"Secret not found: {id}")
+        return ResponseForSecretResponse.from_dict({"success": True, "data": secrets[0]})
+
+
+class AgentProjectsClient:
+    """Read-only stand-in for the SDK's ProjectsClient, backed by the agent."""
+
+    def list(self, organization_id: str):
+        from bitwarden_sdk.schemas import ResponseForProjectsResponse
+
+        return ResponseForProjectsResponse.from_dict(_agent_data({"op": "list_projects"}))
+
+
+class AgentClient:
+    """Read-only stand-in for BitwardenClient, backed by the agent."""
+
+    def secrets(self) -> AgentSecretsClient:
+        return AgentSecretsClient()
+
+    def projects(self) -> AgentProjectsClient:
+        return AgentProjectsClient()
+
+
+def ping_agent() -> dict | None:
+    """Return the running agent's ping response, or None if no agent answers."""
+    response = agent_request({"op": "ping"}, timeout=CONNECT_TIMEOUT)
+    if response is None or not response.get("ok"):
+        return None
+    return response
+
+
+def connect_agent() -> AgentClient | None:
+    """Return a client for the running agent, or None if it is not running.
+
+    An agent started for another organization is ignored, so a shell with a
+    different BWS_ORGANIZATION_ID falls back to talking to Bitwarden itself.
+    """
+    from vaultuner.config import get_settings
+
+    response = ping_agent()
+    if response is None:
+        return None
+    if response.get("organization_id") != get_settings().organization_id:
+        return None
+    return AgentClient()
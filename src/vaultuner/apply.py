@@ -0,0 +1,126 @@
+# ABOUTME: Apply a JSON/YAML manifest of secrets to Bitwarden Secrets Manager.
+# ABOUTME: Loads manifests and diffs them against existing secrets to plan creates and updates.
+
+from pathlib import Path
+from typing import NamedTuple
+
+import yaml
+
+from vaultuner.models import (
+    SecretMetadata,
+    SecretPath,
+    is_unchanged,
+    parse_note,
+    render_note,
+)
+
+ENTRY_FIELDS = {"value", "description", "note"}
+NULL_TAG = "tag:yaml.org,2002:null"
+
+
+class ManifestLoader(yaml.SafeLoader):
+    """Safe loader that reads every plain scalar except null as a string.
+
+    The default resolvers turn ``yes`` into True, ``0123`` into 83 and dates
+    into date objects, none of which convert back to the text in the file.
+    """
+
+
+ManifestLoader.yaml_implicit_resolvers = {
+    first: [(tag, regexp) for tag, regexp in resolvers if tag == NULL_TAG]
+    for first, resolvers in yaml.SafeLoader.yaml_implicit_resolvers.items()
+}
+
+
+class ManifestEntry(NamedTuple):
+    path: str
+    value: str | None = None
+    description: str | None = None
+    note: str | None = None
+
+
+class PlannedWrite(NamedTuple):
+    path: str
+    value: str
+    note: str | None
+    # ID of the secret to update, or None to create it
+    secret_id: str | None = None
+
+
+def load_manifest(path: Path) -> list[ManifestEntry]:
+    """Load a manifest mapping secret paths to a value or to value/description/note.
+
+    JSON manifests are read as YAML, which is a superset of JSON. Scalars are
+    kept as written, so ``yes`` or ``0123`` stay strings. Raises ValueError if
+    the manifest is malformed.
+    """
+    try:
+        data = yaml.load(path.read_text(), Loader=ManifestLoader)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid manifest {path}: {e}") from None
+
+    if data is None:
+        return []
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid manifest {path}: expected a mapping of secret paths")
+
+    entries: list[ManifestEntry] = []
+    for secret_path, spec in data.items():
+        secret_path = str(secret_path)
+        SecretPath.parse(secret_path)
+
+        if not isinstance(spec, dict):
+            spec = {"value": spec}
+        unknown = set(spec) - ENTRY_FIELDS
+        if unknown:
+            raise ValueError(
+                f"Unknown fields for {secret_path}: {', '.join(sorted(unknown))}"
+            )
+
+        fields = {name: spec.get(name) for name in ENTRY_FIELDS}
+        for name, field in fields.items():
+            if field is not None and not isinstance(field, str):
+                raise ValueError(
+                    f"Invalid {name} for {secret_path}: expected a string, "
+                    f"got {type(field).__name__}"
+                )
+        entries.append(ManifestEntry(secret_path, **fields))
+    return entries
+
+
+def plan_apply(
+    entries: list[ManifestEntry], existing: dict
+) -> tuple[list[PlannedWrite], list[str]]:
+    """Diff manifest entries against existing secrets, keyed by secret key.
+
+    Metadata is merged into existing notes the same way ``set`` does, and
+    entries without a value keep the existing one. Returns ``(writes,
+    unchanged)``. Raises ValueError for a new secret without a value.
+    """
+    writes: list[PlannedWrite] = []
+    unchanged: list[str] = []
+
+    for entry in entries:
+        secret = existing.get(entry.path)
+        if secret is None:
+            if entry.value is None:
+                raise ValueError(f"No value given for new secret: {entry.path}")
+            metadata = SecretMetadata(description=entry.description)
+            note = render_note(metadata, entry.note or "")
+            writes.append(PlannedWrite(entry.path, entry.value, note))
+            continue
+
+        metadata, body = parse_note(secret.note)
+        if entry.description is not None:
+            metadata.description = entry.description
+        if entry.note is not None:
+            body = entry.note
+        note = render_note(metadata, body)
+        value = secret.value if entry.value is None else entry.value
+
+        if is_unchanged(secret.value, secret.note, value, note):
+            unchanged.append(entry.path)
+        else:
+            writes.append(PlannedWrite(entry.path, value, note, str(secret.id)))
+
+    return writes, unchanged
@@ -0,0 +1,123 @@
+# ABOUTME: Encrypted on-disk cache for per-organization data.
+# ABOUTME: Entries are encrypted with a key derived from the access token and expire by age.
+
+import base64
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from vaultuner.profile import span
+
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+
+    from vaultuner.config import Settings
+
+
+def get_cache_dir() -> Path:
+    """Return the cache directory, honouring VAULTUNER_CACHE_DIR and XDG_CACHE_HOME."""
+    override = os.environ.get("VAULTUNER_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "vaultuner"
+
+
+def cache_path(name: str, settings: "Settings") -> Path:
+    """Path of a cache entry for the configured organization."""
+    digest = hashlib.sha256(settings.organization_id.encode()).hexdigest()[:16]
+    return get_cache_dir() / f"{name}-{digest}.bin"
+
+
+def get_fernet(settings: "Settings") -> "Fernet":
+    """Cipher keyed by the access token, for data only this token may read."""
+    from cryptography.fernet import Fernet
+
+    token = settings.access_token.get_secret_value()
+    key = hashlib.sha256(f"vaultuner-cache:{token}".encode()).digest()
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+def write_private(path: Path, data: bytes) -> None:
+    """Atomically write a file readable only by the current user."""
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def read_cache(name: str, settings: "Settings", max_age: int | None = None):
+    """Read and decrypt a cache entry. Returns None if missing, expired or unreadable."""
+    from cryptography.fernet import InvalidToken
+
+    with span(f"cache.read {name}", "cache"):
+        try:
+            token = cache_path(name, settings).read_bytes()
+        except OSError:
+            return None
+        try:
+            return json.loads(get_fernet(settings).decrypt(token, ttl=max_age))
+        except (InvalidToken, ValueError):
+            return None
+
+
+def write_cache(name: str, settings: "Settings", data) -> None:
+    """Encrypt and store a JSON-serializable cache entry."""
+    with span(f"cache.write {name}", "cache"):
+        token = get_fernet(settings).encrypt(json.dumps(data).encode())
+        write_private(cache_path(name, settings), token)
+
+
+def clear_cache() -> int:
+    """Delete every cache entry, for all organizations. Returns the number removed.
+
+    Login sessions are kept; ``auth clear`` removes those.
+    """
+    removed = 0
+    for path in get_cache_dir().glob("*.bin"):
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+def load_key_index(settings: "Settings") -> dict[str, str] | None:
+    """Load the cached key→ID index, or None if disabled or stale."""
+    if settings.index_ttl <= 0:
+        return None
+    return read_cache("index", settings, max_age=settings.index_ttl)
+
+
+def save_key_index(settings: "Settings", index: dict[str, str]) -> None:
+    """Store the key→ID index for the configured organization."""
+    if settings.index_ttl <= 0:
+        return
+    try:
+        write_cache("index", settings, index)
+    except OSError:
+        # The index is only an optimization; never fail a command over it
+        pass
+
+
+def load_project_ids(settings: "Settings") -> dict[str, str] | None:
+    """Load the cached project name→ID mapping, or None if disabled or stale."""
+    if settings.index_ttl <= 0:
+        return None
+    return read_cache("projects", settings, max_age=settings.index_ttl)
+
+
+def save_project_ids(settings: "Settings", project_ids: dict[str, str]) -> None:
+    """Store the project name→ID mapping for the configured organization."""
+    if settings.index_ttl <= 0:
+        return
+    try:
+        write_cache("projects", settings, project_ids)
+    except OSError:
+        pass
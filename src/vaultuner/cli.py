@@ -1,34 +1,20 @@
 # ABOUTME: Typer CLI for Bitwarden Secrets Manager.
 # ABOUTME: Commands for listing, getting, setting, and deleting secrets.
 
-import builtins
+import os
+import time
 from importlib.metadata import version
 from pathlib import Path
 from typing import Annotated, Literal
 
 import typer
-from rich.console import Console
-from rich.table import Table
 
-from vaultuner.client import find_secret_by_key, get_client, get_or_create_project
+from vaultuner.agent import DEFAULT_AGENT_TTL
 from vaultuner.generate import generate_secret
-from vaultuner.config import (
-    DEFAULT_PROJECT_NAME,
-    delete_keyring_value,
-    get_keyring_value,
-    get_settings,
-    is_keyring_accessible,
-    set_keyring_value,
-)
-from vaultuner.models import (
-    SecretPath,
-    is_deleted,
-    mark_deleted,
-    parse_note,
-    render_note,
-    SecretMetadata,
-    unmark_deleted,
-)
+from vaultuner.parallel import run_parallel
+
+# Heavy dependencies (the Bitwarden SDK, pydantic, keyring, rich tables) are
+# imported inside the commands that need them to keep startup fast.
 
 __version__ = version("vaultuner")
 
@@ -45,19 +31,112 @@ app = typer.Typer(
 )
 config_app = typer.Typer(help="Manage vaultuner credentials stored in system keychain.")
 app.add_typer(config_app, name="config")
+auth_app = typer.Typer(help="Inspect and clear the persisted login session.")
+app.add_typer(auth_app, name="auth")
+cache_app = typer.Typer(help="Manage the local key index and value cache.")
+app.add_typer(cache_app, name="cache")
 
 
 @app.callback()
 def main(
+    ctx: typer.Context,
     version: Annotated[
         bool, typer.Option("--version", "-V", callback=version_callback, is_eager=True)
     ] = False,
+    stats: Annotated[
+        bool,
+        typer.Option(
+            "--stats", help="Print SDK request, retry and throttle counts when done"
+        ),
+    ] = False,
+    profile: Annotated[
+        bool,
+        typer.Option(
+            "--profile",
+            envvar="VAULTUNER_PROFILE",
+            help="Print where the command spent its time when done",
+        ),
+    ] = False,
+    profile_output: Annotated[
+        Path | None,
+        typer.Option(
+            "--profile-output",
+            envvar="VAULTUNER_PROFILE_OUTPUT",
+            help="Write timing spans to this file as Chrome trace JSON",
+        ),
+    ] = None,
 ) -> None:
     """Bitwarden Secrets Manager CLI."""
+    if stats:
+        ctx.call_on_close(print_request_stats)
+    if profile or profile_output:
+        from vaultuner.profile import profiler
+
+        profiler.enable()
+        # Registered first so it runs after the command span below has ended
+        ctx.call_on_close(lambda: report_profile(profile, profile_output))
+        command = f"command {ctx.invoked_subcommand}"
+        ctx.with_resource(profiler.span(command, "command"))
+
+
+def report_profile(show_summary: bool, output: Path | None) -> None:
+    from vaultuner.profile import profiler
+
+    if output is not None:
+        profiler.write_trace(output)
+        err_console.print(f"[dim]Profile written to {output}[/dim]")
+    if not show_summary:
+        return
+
+    from rich.table import Table
+
+    table = Table(title="Profile", show_header=True, header_style="bold")
+    table.add_column("Span", style="cyan")
+    table.add_column("Category", style="yellow")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total ms", justify="right")
+    table.add_column("Max ms", justify="right")
+    for summary in profiler.summary():
+        table.add_row(
+            summary.name,
+            summary.category,
+            str(summary.count),
+            f"{summary.total * 1000:.1f}",
+            f"{summary.longest * 1000:.1f}",
+        )
+    err_console.print(table)
+
+
+def print_request_stats() -> None:
+    from vaultuner.retry import retry_stats
+
+    err_console.print(
+        f"[dim]SDK requests: {retry_stats.calls}, retries: {retry_stats.retries}, "
+        f"throttled: {retry_stats.throttles}, "
+        f"waited: {retry_stats.waited:.1f}s[/dim]"
+    )
+
+
+class LazyConsole:
+    """Rich console that is only created (and rich imported) on first use."""
 
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._console = None
 
-console = Console()
-err_console = Console(stderr=True)
+    def __getattr__(self, name: str):
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console(**self._kwargs)
+        return getattr(self._console, name)
+
+
+console = LazyConsole()
+err_console = LazyConsole(stderr=True)
+
+REFRESH_HELP = "Ignore the local key index and list the organization"
+SNAPSHOT_HELP = "Read from a file written by vaultuner snapshot instead of Bitwarden"
 
 ConfigKey = Literal["access-token", "organization-id"]
 KEYRING_MAP = {
@@ -66,12 +145,49 @@ KEYRING_MAP = {
 }
 
 
+def invalidate_caches() -> None:
+    """Drop cached secrets after a write: the agent's and the local value cache."""
+    from vaultuner.agent import invalidate_agent
+    from vaultuner.value_cache import clear_values
+
+    invalidate_agent()
+    clear_values()
+
+
+def fetch_secret(client, key: str, refresh: bool = False):
+    """Find a secret by key and fetch it.
+
+    Returns ``(secret_info, response)`` or None if the key does not exist. A
+    cached index entry pointing at a missing or renamed secret triggers a
+    fresh lookup.
+    """
+    from vaultuner.client import find_secret_by_key
+
+    secret_info = find_secret_by_key(client, key, refresh=refresh)
+    if not secret_info:
+        return None
+
+    cached = secret_info.get("cached", False)
+    try:
+        response = client.secrets().get(secret_info["id"])
+    except Exception:
+        if not cached:
+            raise
+        return fetch_secret(client, key, refresh=True)
+
+    if cached and (not response.data or response.data.key != key):
+        return fetch_secret(client, key, refresh=True)
+    return secret_info, response
+
+
 @config_app.command("set")
 def config_set(
     key: ConfigKey = typer.Argument(..., help="Config key to set"),
     value: str = typer.Argument(..., help="Value to store"),
 ):
     """Store a credential in the system keychain."""
+    from vaultuner.config import set_keyring_value
+
     keyring_key = KEYRING_MAP[key]
     set_keyring_value(keyring_key, value)
     console.print(f"[green]Stored:[/green] {key}")
@@ -80,21 +196,25 @@ def config_set(
 @config_app.command("show")
 def config_show():
     """Show current configuration status."""
+    from rich.table import Table
+
+    from vaultuner.config import load_keyring_credentials
+
     table = Table(show_header=True, header_style="bold")
     table.add_column("Setting", style="cyan")
     table.add_column("Status")
 
-    keyring_available = is_keyring_accessible()
+    credentials = load_keyring_credentials()
 
-    if not keyring_available:
+    if not credentials.accessible:
         console.print(
             "[yellow]Warning:[/yellow] Keychain is not accessible. "
             "Run this command from a regular (non-remote) shell to manage keychain credentials.\n"
             "You can still use environment variables BWS_ACCESS_TOKEN and BWS_ORGANIZATION_ID.\n"
         )
 
-    access_token = get_keyring_value(KEYRING_MAP["access-token"])
-    org_id = get_keyring_value(KEYRING_MAP["organization-id"])
+    access_token = credentials.values.get("access_token")
+    org_id = credentials.values.get("organization_id")
 
     table.add_row(
         "access-token",
@@ -112,11 +232,144 @@ def config_delete(
     key: ConfigKey = typer.Argument(..., help="Config key to delete"),
 ):
     """Remove a credential from the system keychain."""
+    from vaultuner.config import delete_keyring_value
+
     keyring_key = KEYRING_MAP[key]
     delete_keyring_value(keyring_key)
     console.print(f"[red]Deleted:[/red] {key}")
 
 
+def format_age(seconds: float) -> str:
+    """Format a duration as a short human-readable age."""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds}s"
+    hours, minutes = divmod(minutes, 60)
+    if hours < 24:
+        return f"{hours}h {minutes}m"
+    days, hours = divmod(hours, 24)
+    return f"{days}d {hours}h"
+
+
+@auth_app.command("status")
+def auth_status():
+    """Show whether a persisted login session is available and how old it is."""
+    from rich.table import Table
+
+    from vaultuner.client import session_state_path
+    from vaultuner.config import get_settings
+
+    settings = get_settings()
+    state_path = session_state_path(settings)
+
+    table = Table(show_header=True, header_style="bold")
+    table.add_column("Setting", style="cyan")
+    table.add_column("Status")
+    table.add_row(
+        "persist-session",
+        "[green]enabled[/green]"
+        if settings.persist_session
+        else "[dim]disabled (set BWS_PERSIST_SESSION=true)[/dim]",
+    )
+    if state_path.exists() and state_path.stat().st_size > 0:
+        age = time.time() - state_path.stat().st_mtime
+        table.add_row("state-file", str(state_path))
+        table.add_row("age", format_age(age))
+    else:
+        table.add_row("state-file", "[dim]none[/dim]")
+    console.print(table)
+
+
+@auth_app.command("clear")
+def auth_clear():
+    """Remove all persisted login sessions."""
+    from vaultuner.cache import get_cache_dir
+
+    removed = 0
+    for state_path in get_cache_dir().glob("session-*.json"):
+        state_path.unlink(missing_ok=True)
+        removed += 1
+    console.print(f"[red]Cleared:[/red] {removed} session(s)")
+
+
+@cache_app.command("clear")
+def cache_clear():
+    """Delete cached key indexes, project IDs, values and sync checkpoints."""
+    from vaultuner.cache import clear_cache
+
+    removed = clear_cache()
+    console.print(f"[red]Cleared:[/red] {removed} cache file(s)")
+
+
+def print_secrets_table(rows, deleted: bool) -> None:
+    """Render listed secrets as a rich table."""
+    from rich.table import Table
+
+    from vaultuner.profile import span
+
+    with span("render"):
+        table = Table(show_header=True, header_style="bold")
+        table.add_column("Project", style="cyan")
+        table.add_column("Env", style="yellow")
+        table.add_column("Name", style="green")
+        if deleted:
+            table.add_column("Status", style="red")
+
+        count = 0
+        for path, secret_deleted in rows:
+            if deleted:
+                status = (
+                    "[red]deleted[/red]" if secret_deleted else "[green]active[/green]"
+                )
+                table.add_row(path.project, path.env or "-", path.name, status)
+            else:
+                table.add_row(path.project, path.env or "-", path.name)
+            count += 1
+
+        if count == 0:
+            console.print("[dim]No secrets found.[/dim]")
+        else:
+            console.print(table)
+
+
+def stream_secrets(rows, output_format: str, deleted: bool) -> None:
+    """Write listed secrets to stdout one line at a time as TSV or JSON lines."""
+    import json
+    import sys
+
+    write = sys.stdout.write
+    for path, secret_deleted in rows:
+        if output_format == "jsonl":
+            record = {
+                "key": path.to_key(),
+                "project": path.project,
+                "env": path.env,
+                "name": path.name,
+            }
+            if deleted:
+                record["deleted"] = secret_deleted
+            write(json.dumps(record) + "\n")
+        else:
+            fields = [path.project, path.env or "-", path.name]
+            if deleted:
+                fields.append("deleted" if secret_deleted else "active")
+            write("\t".join(fields) + "\n")
+
+
+def read_snapshot_or_exit(path: Path, project: str | None = None) -> list:
+    """Load a snapshot's secrets, exiting with an error if the file is unusable."""
+    from vaultuner.snapshot import SnapshotError, load_snapshot
+
+    try:
+        return load_snapshot(path, project)
+    except SnapshotError as e:
+        err_console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1) from None
+
+
 @app.command("list")
 def list_secrets(
     project: str | None = typer.Option(
@@ -124,75 +377,215 @@ def list_secrets(
     ),
     env: str | None = typer.Option(None, "--env", "-e", help="Filter by environment"),
     deleted: bool = typer.Option(False, "--deleted", "-d", help="Show deleted secrets"),
+    output_format: Literal["table", "tsv", "jsonl"] = typer.Option(
+        "table",
+        "--format",
+        "-f",
+        help="Output format: table, or tsv/jsonl streamed one secret per line",
+    ),
+    snapshot: Path | None = typer.Option(None, "--snapshot", help=SNAPSHOT_HELP),
 ):
     """List secrets. Optionally filter by project and/or environment."""
-    settings = get_settings()
-    client = get_client()
-    response = client.secrets().list(settings.organization_id)
-    if not response.data or not response.data.data:
-        console.print("[dim]No secrets found.[/dim]")
-        return
+    from vaultuner.index import SecretIndex, iter_listed_secrets
 
-    table = Table(show_header=True, header_style="bold")
-    table.add_column("Project", style="cyan")
-    table.add_column("Env", style="yellow")
-    table.add_column("Name", style="green")
-    if deleted:
-        table.add_column("Status", style="red")
+    if snapshot is not None:
+        secrets = read_snapshot_or_exit(snapshot, project or None)
+    else:
+        from vaultuner.agent import connect_agent
+        from vaultuner.client import get_client
+        from vaultuner.config import get_settings
+
+        settings = get_settings()
+        client = connect_agent() or get_client()
+        response = client.secrets().list(settings.organization_id)
+        secrets = response.data.data if response.data and response.data.data else []
+    if project or env:
+        index = SecretIndex(secrets)
+        rows = (
+            (entry.path, entry.deleted)
+            for entry in index.query(
+                project or None, env or None, include_deleted=deleted
+            )
+        )
+    else:
+        # Nothing to look up, so write each secret as soon as it is parsed
+        rows = iter_listed_secrets(secrets, include_deleted=deleted)
 
-    count = 0
-    for secret in response.data.data:
-        key = secret.key
-        secret_deleted = is_deleted(key)
+    if output_format == "table":
+        print_secrets_table(rows, deleted)
+    else:
+        stream_secrets(rows, output_format, deleted)
 
-        if secret_deleted and not deleted:
-            continue
 
-        display_key = unmark_deleted(key) if secret_deleted else key
+def read_paths_file(path: Path) -> list[str]:
+    """Read secret paths from a file, one per line, skipping blanks and comments."""
+    paths = []
+    for line in path.read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            paths.append(line)
+    return paths
 
-        try:
-            path = SecretPath.parse(display_key)
-        except ValueError:
-            continue
 
-        if project and path.project != project:
-            continue
-        if env and path.env != env:
-            continue
+def read_snapshot_values_or_exit(path: Path, keys: list[str]) -> dict:
+    """Load and decrypt values from a snapshot, exiting if they cannot be read."""
+    from vaultuner.config import get_settings
+    from vaultuner.snapshot import SnapshotError, load_snapshot_values
 
-        if deleted:
-            status = "[red]deleted[/red]" if secret_deleted else "[green]active[/green]"
-            table.add_row(path.project, path.env or "-", path.name, status)
-        else:
-            table.add_row(path.project, path.env or "-", path.name)
-        count += 1
+    try:
+        return load_snapshot_values(path, keys, get_settings())
+    except SnapshotError as e:
+        err_console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1) from None
 
-    if count == 0:
-        console.print("[dim]No secrets found.[/dim]")
+
+def print_secrets(
+    client,
+    paths: list[str],
+    output_format: str,
+    refresh: bool = False,
+    snapshot: Path | None = None,
+) -> None:
+    """Resolve several secrets at once and print them as JSON or shell exports."""
+    import json
+    import shlex
+
+    from vaultuner.client import get_secrets_by_keys
+    from vaultuner.export import secret_name_to_env_var
+    from vaultuner.models import SecretPath
+
+    env_vars = {}
+    for path in paths:
+        try:
+            env_vars[path] = secret_name_to_env_var(SecretPath.parse(path).name)
+        except ValueError as e:
+            err_console.print(f"[red]Error:[/red] {e}")
+            raise typer.Exit(1) from None
+
+    if snapshot is not None:
+        found = read_snapshot_values_or_exit(snapshot, paths)
     else:
-        console.print(table)
+        found = get_secrets_by_keys(client, paths, refresh=refresh)
+    missing = [path for path in paths if path not in found]
+    if missing:
+        for path in missing:
+            err_console.print(f"[red]Secret not found:[/red] {path}")
+        raise typer.Exit(1)
+
+    if output_format == "env":
+        for path in paths:
+            print(f"export {env_vars[path]}={shlex.quote(found[path].value)}")
+    else:
+        print(json.dumps({path: found[path].value for path in paths}, indent=2))
 
 
 @app.command()
 def get(
-    path: str = typer.Argument(..., help="Secret path: PROJECT/[ENV/]NAME or @ORG/REPO/[ENV/]NAME"),
+    ctx: typer.Context,
+    paths: list[str] | None = typer.Argument(
+        None, help="Secret paths: PROJECT/[ENV/]NAME or @ORG/REPO/[ENV/]NAME"
+    ),
     value_only: bool = typer.Option(
         False, "--value", "-v", help="Print only the value"
     ),
+    refresh: bool = typer.Option(False, "--refresh", help=REFRESH_HELP),
+    from_file: Path | None = typer.Option(
+        None, "--from-file", help="Read secret paths from a file, one per line"
+    ),
+    output_format: Literal["json", "env"] | None = typer.Option(
+        None,
+        "--format",
+        help="Output format for several secrets: json (default) or env (shell exports)",
+    ),
+    snapshot: Path | None = typer.Option(
+        None,
+        "--snapshot",
+        help="Read values from a file written by vaultuner snapshot --include-values",
+    ),
+    # Used by the background process that refreshes a stale cached value
+    revalidate: bool = typer.Option(False, "--revalidate", hidden=True),
 ):
-    """Get a secret by path."""
-    client = get_client()
-    secret_info = find_secret_by_key(client, path)
-    if not secret_info:
+    """Get one or more secrets by path."""
+    from rich.table import Table
+
+    from vaultuner.agent import connect_agent
+    from vaultuner.client import get_client
+    from vaultuner.models import parse_note
+
+    requested = list(paths or [])
+    if from_file is not None:
+        if not from_file.exists():
+            err_console.print(f"[red]File not found:[/red] {from_file}")
+            raise typer.Exit(1)
+        requested += read_paths_file(from_file)
+    requested = list(dict.fromkeys(requested))
+
+    if not requested:
+        err_console.print("[red]Error:[/red] Provide a secret path or --from-file")
+        raise typer.Exit(1)
+
+    several = len(requested) > 1 or from_file is not None or output_format is not None
+    path = requested[0]
+    if snapshot is not None:
+        if several:
+            print_secrets(None, requested, output_format or "json", snapshot=snapshot)
+            return
+        found = read_snapshot_values_or_exit(snapshot, [path])
+        if path not in found:
+            err_console.print(f"[red]Secret not found:[/red] {path}")
+            raise typer.Exit(1)
+        if value_only:
+            console.print(found[path].value)
+            return
+        table = Table(show_header=False, box=None)
+        table.add_column("Label", style="dim")
+        table.add_column("Value")
+        table.add_row("Path", f"[cyan]{path}[/cyan]")
+        table.add_row("Value", f"[green]{found[path].value}[/green]")
+        if found[path].metadata.get("description"):
+            table.add_row(
+                "Description", f"[dim]{found[path].metadata['description']}[/dim]"
+            )
+        console.print(table)
+        return
+
+    if value_only and not several:
+        from vaultuner.config import get_settings
+        from vaultuner.value_cache import (
+            lookup_value,
+            release_revalidation,
+            start_revalidation,
+            store_value,
+        )
+
+        if revalidate:
+            ctx.call_on_close(lambda: release_revalidation(path))
+        settings = get_settings()
+        cached = None if refresh or revalidate else lookup_value(settings, path)
+        if cached is not None:
+            if not cached.fresh:
+                start_revalidation(path)
+            console.print(cached.value)
+            return
+
+    client = (None if refresh else connect_agent()) or get_client()
+
+    if several:
+        print_secrets(client, requested, output_format or "json", refresh=refresh)
+        return
+
+    found = fetch_secret(client, path, refresh=refresh)
+    if not found:
         err_console.print(f"[red]Secret not found:[/red] {path}")
         raise typer.Exit(1)
 
-    response = client.secrets().get(secret_info["id"])
+    _, response = found
     if not response.data:
         err_console.print(f"[red]Failed to retrieve secret:[/red] {path}")
         raise typer.Exit(1)
 
     if value_only:
+        store_value(settings, path, response.data.value)
         console.print(response.data.value)
     else:
         table = Table(show_header=False, box=None)
@@ -217,8 +610,13 @@ def set(
         None, "--description", "-d", help="Secret description (stored as metadata)"
     ),
     gen: bool = typer.Option(False, "--generate", "-g", help="Generate a random value"),
+    refresh: bool = typer.Option(False, "--refresh", help=REFRESH_HELP),
 ):
     """Create or update a secret."""
+    from vaultuner.client import bitwarden_project_name, get_client, with_project
+    from vaultuner.config import get_settings
+    from vaultuner.models import SecretMetadata, is_unchanged, parse_note, render_note
+
     if gen and value is not None:
         err_console.print(
             "[red]Error:[/red] Cannot use --generate with an explicit value"
@@ -236,10 +634,10 @@ def set(
     settings = get_settings()
     client = get_client()
 
-    existing = find_secret_by_key(client, path)
+    # Fetch existing secret to preserve value/note when doing metadata-only updates
+    existing = fetch_secret(client, path, refresh=refresh)
     if existing:
-        # Fetch existing secret to preserve value/note when doing metadata-only updates
-        existing_response = client.secrets().get(existing["id"])
+        existing_info, existing_response = existing
         if not existing_response.data:
             err_console.print("[red]Failed to retrieve existing secret.[/red]")
             raise typer.Exit(1)
@@ -255,9 +653,15 @@ def set(
             existing_body = note
         final_note = render_note(existing_metadata, existing_body)
 
+        if is_unchanged(
+            existing_response.data.value, existing_response.data.note, value, final_note
+        ):
+            console.print(f"[dim]Unchanged:[/dim] {path}")
+            return
+
         response = client.secrets().update(
             organization_id=settings.organization_id,
-            id=existing["id"],
+            id=existing_info["id"],
             key=path,
             value=value,
             note=final_note,
@@ -266,6 +670,7 @@ def set(
         if not response.data:
             err_console.print("[red]Failed to update secret.[/red]")
             raise typer.Exit(1)
+        invalidate_caches()
         console.print(f"[yellow]Updated:[/yellow] {path}")
     else:
         if metadata_only:
@@ -278,17 +683,26 @@ def set(
         metadata = SecretMetadata(description=description)
         final_note = render_note(metadata, note or "")
 
-        project_id = get_or_create_project(client, DEFAULT_PROJECT_NAME)
-        response = client.secrets().create(
-            organization_id=settings.organization_id,
-            key=path,
-            value=value,
-            note=final_note,
-            project_ids=[project_id],
+        try:
+            project_name = bitwarden_project_name(path, settings.project_mode)
+        except ValueError as e:
+            err_console.print(f"[red]Error:[/red] {e}")
+            raise typer.Exit(1) from None
+        response = with_project(
+            client,
+            project_name,
+            lambda project_id: client.secrets().create(
+                organization_id=settings.organization_id,
+                key=path,
+                value=value,
+                note=final_note,
+                project_ids=[project_id],
+            ),
         )
         if not response.data:
             err_console.print("[red]Failed to create secret.[/red]")
             raise typer.Exit(1)
+        invalidate_caches()
         console.print(f"[green]Created:[/green] {path}")
 
     if gen:
@@ -300,15 +714,22 @@ def delete(
     path: str = typer.Argument(..., help="Secret path: PROJECT/[ENV/]NAME or @ORG/REPO/[ENV/]NAME"),
     force: bool = typer.Option(False, "--force", "-f", help="Skip confirmation"),
     permanent: bool = typer.Option(False, "--permanent", help="Permanently delete"),
+    refresh: bool = typer.Option(False, "--refresh", help=REFRESH_HELP),
 ):
     """Delete a secret (soft-delete by default)."""
+    from vaultuner.client import get_client
+    from vaultuner.config import get_settings
+    from vaultuner.models import mark_deleted
+
     settings = get_settings()
     client = get_client()
-    secret_info = find_secret_by_key(client, path)
-    if not secret_info:
+    found = fetch_secret(client, path, refresh=refresh)
+    if not found:
         err_console.print(f"[red]Secret not found:[/red] {path}")
         raise typer.Exit(1)
 
+    secret_info, response = found
+
     if not force:
         action = "permanently delete" if permanent else "delete"
         confirm = typer.confirm(f"{action.capitalize()} secret '{path}'?")
@@ -317,9 +738,9 @@ def delete(
 
     if permanent:
         client.secrets().delete([secret_info["id"]])
+        invalidate_caches()
         console.print(f"[red]Permanently deleted:[/red] {path}")
     else:
-        response = client.secrets().get(secret_info["id"])
         if not response.data:
             err_console.print("[red]Failed to get secret for deletion.[/red]")
             raise typer.Exit(1)
@@ -336,23 +757,29 @@ def delete(
             note=response.data.note,
             project_ids=project_ids,
         )
+        invalidate_caches()
         console.print(f"[red]Deleted:[/red] {path}")
 
 
 @app.command()
 def restore(
     path: str = typer.Argument(..., help="Secret path: PROJECT/[ENV/]NAME or @ORG/REPO/[ENV/]NAME"),
+    refresh: bool = typer.Option(False, "--refresh", help=REFRESH_HELP),
 ):
     """Restore a soft-deleted secret."""
+    from vaultuner.client import get_client
+    from vaultuner.config import get_settings
+    from vaultuner.models import mark_deleted
+
     settings = get_settings()
     client = get_client()
     deleted_key = mark_deleted(path)
-    secret_info = find_secret_by_key(client, deleted_key)
-    if not secret_info:
+    found = fetch_secret(client, deleted_key, refresh=refresh)
+    if not found:
         err_console.print(f"[red]Deleted secret not found:[/red] {path}")
         raise typer.Exit(1)
 
-    response = client.secrets().get(secret_info["id"])
+    secret_info, response = found
     if not response.data:
         err_console.print("[red]Failed to get secret for restoration.[/red]")
         raise typer.Exit(1)
@@ -366,29 +793,31 @@ def restore(
         note=response.data.note,
         project_ids=project_ids,
     )
+    invalidate_caches()
     console.print(f"[green]Restored:[/green] {path}")
 
 
 @app.command()
-def projects():
+def projects(
+    snapshot: Path | None = typer.Option(None, "--snapshot", help=SNAPSHOT_HELP),
+):
     """List all projects (derived from secret names)."""
-    settings = get_settings()
-    client = get_client()
-    response = client.secrets().list(settings.organization_id)
-    if not response.data or not response.data.data:
-        console.print("[dim]No projects found.[/dim]")
-        return
+    from rich.table import Table
 
-    project_names: builtins.set[str] = builtins.set()
-    for secret in response.data.data:
-        if is_deleted(secret.key):
-            continue
-        try:
-            path = SecretPath.parse(secret.key)
-        except ValueError:
-            continue
-        project_names.add(path.project)
+    from vaultuner.index import SecretIndex
 
+    if snapshot is not None:
+        secrets = read_snapshot_or_exit(snapshot)
+    else:
+        from vaultuner.agent import connect_agent
+        from vaultuner.client import get_client
+        from vaultuner.config import get_settings
+
+        settings = get_settings()
+        client = connect_agent() or get_client()
+        response = client.secrets().list(settings.organization_id)
+        secrets = response.data.data if response.data and response.data.data else []
+    project_names = SecretIndex(secrets).projects()
     if not project_names:
         console.print("[dim]No projects found.[/dim]")
         return
@@ -396,12 +825,167 @@ def projects():
     table = Table(show_header=True, header_style="bold")
     table.add_column("Project", style="cyan")
 
-    for name in sorted(project_names):
+    for name in project_names:
         table.add_row(name)
 
     console.print(table)
 
 
+@app.command()
+def migrate(
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Show which secrets would be moved and exit"
+    ),
+    concurrency: int = typer.Option(
+        1, "--concurrency", "-c", min=1, help="Number of secrets moved in parallel"
+    ),
+):
+    """Move secrets into the Bitwarden projects of the configured project mode."""
+    from vaultuner.client import (
+        bitwarden_project_name,
+        get_client,
+        get_or_create_project,
+        get_secrets_by_ids,
+        list_project_ids,
+    )
+    from vaultuner.config import get_settings
+    from vaultuner.index import SecretIndex
+
+    settings = get_settings()
+    client = get_client()
+    response = client.secrets().list(settings.organization_id)
+    index = SecretIndex(
+        response.data.data if response.data and response.data.data else []
+    )
+    project_ids = list_project_ids(client, refresh=True)
+
+    # Plan: every secret whose Bitwarden project differs from its target
+    moves: list[tuple[str, str, str]] = []
+    for entry in index.query(include_deleted=True):
+        target = bitwarden_project_name(entry.path.to_key(), settings.project_mode)
+        current = {str(project_id) for project_id in entry.secret.project_ids or []}
+        if current != {project_ids.get(target)}:
+            moves.append((str(entry.secret.id), entry.secret.key, target))
+
+    if not moves:
+        console.print(
+            f"[dim]All secrets already match project mode '{settings.project_mode}'.[/dim]"
+        )
+        return
+
+    console.print(f"[cyan]Plan: {len(moves)} to move[/cyan]")
+    for _, key, target in moves:
+        console.print(f"  {key} → [green]{target}[/green]")
+
+    if dry_run:
+        return
+
+    for target in dict.fromkeys(target for _, _, target in moves):
+        if target not in project_ids:
+            project_ids[target] = get_or_create_project(client, target)
+
+    secrets = get_secrets_by_ids(client, [secret_id for secret_id, _, _ in moves])
+
+    def move(item: tuple[str, str, str]) -> str | None:
+        """Move one secret, returning an error message on failure."""
+        secret_id, key, target = item
+        secret = secrets.get(secret_id)
+        if secret is None:
+            return "not found"
+        try:
+            client.secrets().update(
+                organization_id=settings.organization_id,
+                id=secret_id,
+                key=key,
+                value=secret.value,
+                note=secret.note,
+                project_ids=[project_ids[target]],
+            )
+        except Exception as e:
+            return str(e)
+        return None
+
+    errors = run_parallel(move, moves, concurrency)
+    invalidate_caches()
+    failed_count = 0
+    for (_, key, _), error in zip(moves, errors):
+        if error is not None:
+            failed_count += 1
+            err_console.print(f"[red]Failed:[/red] {key} ({error})")
+
+    summary = f"{len(moves) - failed_count} moved"
+    if failed_count:
+        summary += f", {failed_count} failed"
+    console.print(f"\n[green]Migration complete:[/green] {summary}")
+    if failed_count:
+        raise typer.Exit(1)
+
+
+@app.command()
+def snapshot(
+    output: Path = typer.Option(
+        Path("vaultuner.snapshot"),
+        "--output",
+        "-o",
+        help="Snapshot file path (default: vaultuner.snapshot)",
+    ),
+    include_values: bool = typer.Option(
+        False,
+        "--include-values",
+        help="Also store values, encrypted with a key derived from the access token",
+    ),
+    batch_size: int | None = typer.Option(
+        None,
+        "--batch-size",
+        min=1,
+        help="Number of secrets fetched per bulk request (default: 100)",
+    ),
+    concurrency: int = typer.Option(
+        1, "--concurrency", "-c", min=1, help="Number of fetch requests in parallel"
+    ),
+):
+    """Save the organization's secret metadata to a file for offline list and projects."""
+    from vaultuner.snapshot import take_snapshot
+
+    count = take_snapshot(
+        output,
+        include_values=include_values,
+        batch_size=batch_size,
+        concurrency=concurrency,
+    )
+    values = " with encrypted values" if include_values else ""
+    console.print(f"[green]Snapshot written to {output}:[/green] {count} secrets{values}")
+
+
+@app.command()
+def agent(
+    ttl: int = typer.Option(
+        DEFAULT_AGENT_TTL,
+        "--ttl",
+        min=1,
+        help="Seconds cached secrets are served before being refetched",
+    ),
+):
+    """Run a local agent that serves cached secrets to get, list and export."""
+    from vaultuner.agent import get_agent_socket_path, ping_agent, serve_agent
+    from vaultuner.client import get_client
+    from vaultuner.config import get_settings
+
+    if ping_agent():
+        err_console.print(
+            f"[red]Agent already running:[/red] {get_agent_socket_path()}"
+        )
+        raise typer.Exit(1)
+
+    settings = get_settings()
+    client = get_client()
+    console.print(
+        f"[green]Agent listening on[/green] {get_agent_socket_path()} "
+        "[dim](Ctrl-C to stop)[/dim]"
+    )
+    serve_agent(client, settings.organization_id, ttl)
+
+
 @app.command()
 def generate(
     length: int = typer.Option(24, "--length", "-l", help="Length of generated secret"),
@@ -441,12 +1025,41 @@ def export(
     output: Path = typer.Option(
         Path(".env"), "--output", "-o", help="Output file path (default: .env)"
     ),
+    batch_size: int | None = typer.Option(
+        None,
+        "--batch-size",
+        min=1,
+        help="Number of secrets fetched per bulk request (default: 100)",
+    ),
+    sync: bool = typer.Option(
+        False,
+        "--sync",
+        help="Rewrite changed values in place instead of only appending new ones",
+    ),
+    concurrency: int = typer.Option(
+        1, "--concurrency", "-c", min=1, help="Number of fetch requests in parallel"
+    ),
 ):
     """Export project secrets to a .env file."""
-    from vaultuner.export import export_secrets
+    from vaultuner.client import DEFAULT_BATCH_SIZE
+    from vaultuner.export import export_secrets, sync_secrets
 
     project_name = project or Path.cwd().name
-    added_count, skipped_count = export_secrets(project_name, output, env)
+    batch_size = batch_size or DEFAULT_BATCH_SIZE
+    if sync:
+        added_count, updated_count, unchanged_count, removed_count = sync_secrets(
+            project_name, output, env, batch_size=batch_size, concurrency=concurrency
+        )
+        console.print(
+            f"[green]Synced to {output}:[/green] {added_count} added, "
+            f"{updated_count} updated, {unchanged_count} unchanged, "
+            f"{removed_count} removed"
+        )
+        return
+
+    added_count, skipped_count = export_secrets(
+        project_name, output, env, batch_size=batch_size, concurrency=concurrency
+    )
 
     if added_count == 0 and skipped_count == 0:
         console.print(f"[dim]No secrets found for project '{project_name}'.[/dim]")
@@ -456,6 +1069,42 @@ def export(
         )
 
 
+@app.command()
+def run(
+    command: list[str] = typer.Argument(
+        ..., help="Command to run, with its arguments, after --"
+    ),
+    project: str | None = typer.Option(
+        None,
+        "--project",
+        "-p",
+        help="Project name (defaults to current directory name)",
+    ),
+    env: str | None = typer.Option(None, "--env", "-e", help="Filter by environment"),
+    batch_size: int | None = typer.Option(
+        None,
+        "--batch-size",
+        min=1,
+        help="Number of secrets fetched per bulk request (default: 100)",
+    ),
+):
+    """Run a command with project secrets in its environment."""
+    from vaultuner.client import DEFAULT_BATCH_SIZE
+    from vaultuner.export import project_env_vars
+
+    project_name = project or Path.cwd().name
+    env_vars = project_env_vars(
+        project_name, env, batch_size=batch_size or DEFAULT_BATCH_SIZE
+    )
+
+    # Secrets take precedence over variables inherited from the shell
+    try:
+        os.execvpe(command[0], command, {**os.environ, **env_vars})
+    except OSError as e:
+        err_console.print(f"[red]Cannot run {command[0]}:[/red] {e.strerror}")
+        raise typer.Exit(127 if isinstance(e, FileNotFoundError) else 126) from None
+
+
 @app.command("import")
 def import_env(
     project: str | None = typer.Option(
@@ -469,13 +1118,22 @@ def import_env(
         Path(".env"), "--input", "-i", help="Input file path (default: .env)"
     ),
     yes: bool = typer.Option(False, "--yes", "-y", help="Import all without prompting"),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Show which secrets would be created and exit"
+    ),
+    concurrency: int = typer.Option(
+        1, "--concurrency", "-c", min=1, help="Number of secrets created in parallel"
+    ),
 ):
     """Import secrets from a .env file to the secret store."""
-    from vaultuner.import_env import (
-        build_secret_path,
-        env_var_to_secret_name,
-        parse_env_entries,
+    from vaultuner.client import (
+        bitwarden_project_name,
+        get_client,
+        list_secret_keys,
+        with_project,
     )
+    from vaultuner.config import get_settings
+    from vaultuner.import_env import parse_env_entries, plan_import
 
     if not input_file.exists():
         err_console.print(f"[red]File not found:[/red] {input_file}")
@@ -491,21 +1149,34 @@ def import_env(
     settings = get_settings()
     client = get_client()
 
-    # Phase 1: Collect secrets to import
-    to_import: list[tuple[str, str]] = []
-    skipped_count = 0
+    # Phase 1: Plan against a single snapshot of existing keys
+    to_create, existing = plan_import(
+        entries, project_name, env, list_secret_keys(client)
+    )
+    try:
+        bitwarden_projects = {
+            secret_path: bitwarden_project_name(secret_path, settings.project_mode)
+            for _, secret_path, _ in to_create
+        }
+    except ValueError as e:
+        err_console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1) from None
 
-    for var_name, value in entries:
-        secret_name = env_var_to_secret_name(var_name)
-        secret_path = build_secret_path(project_name, env, secret_name)
+    for secret_path in existing:
+        console.print(f"[dim]Already exists:[/dim] {secret_path}")
 
-        # Check if secret already exists
-        existing = find_secret_by_key(client, secret_path)
-        if existing:
-            console.print(f"[dim]Already exists:[/dim] {secret_path}")
-            skipped_count += 1
-            continue
+    if to_create:
+        console.print(f"\n[cyan]Plan: {len(to_create)} to create[/cyan]")
+        for _, secret_path, _ in to_create:
+            console.print(f"  [green]+[/green] {secret_path}")
 
+    if dry_run:
+        return
+
+    to_import: list[tuple[str, str]] = []
+    skipped_count = len(existing)
+
+    for var_name, secret_path, value in to_create:
         if not yes:
             console.print(f"\n[cyan]{var_name}[/cyan] [dim]({len(value)} chars)[/dim]")
             console.print(f"  → [green]{secret_path}[/green]")
@@ -521,21 +1192,159 @@ def import_env(
 
     # Phase 2: Import all approved secrets
     console.print(f"\n[cyan]Importing {len(to_import)} secrets...[/cyan]")
-    project_id = get_or_create_project(client, DEFAULT_PROJECT_NAME)
+
+    def create(item: tuple[str, str]) -> str | None:
+        """Create one secret, returning an error message on failure."""
+        secret_path, value = item
+        try:
+            response = with_project(
+                client,
+                bitwarden_projects[secret_path],
+                lambda project_id: client.secrets().create(
+                    organization_id=settings.organization_id,
+                    key=secret_path,
+                    value=value,
+                    note=None,
+                    project_ids=[project_id],
+                ),
+            )
+        except Exception as e:
+            return str(e)
+        return None if response.data else "no data returned"
+
+    errors = run_parallel(create, to_import, concurrency)
+    invalidate_caches()
     created_count = 0
+    failed_count = 0
 
-    for secret_path, value in to_import:
-        response = client.secrets().create(
-            organization_id=settings.organization_id,
-            key=secret_path,
-            value=value,
-            note=None,
-            project_ids=[project_id],
-        )
-        if response.data:
+    for (secret_path, _), error in zip(to_import, errors):
+        if error is None:
             created_count += 1
             console.print(f"[green]Created:[/green] {secret_path}")
+        else:
+            failed_count += 1
+            err_console.print(f"[red]Failed:[/red] {secret_path} ({error})")
+
+    summary = f"{created_count} created, {skipped_count} skipped"
+    if failed_count:
+        summary += f", {failed_count} failed"
+    console.print(f"\n[green]Import complete:[/green] {summary}")
+    if failed_count:
+        raise typer.Exit(1)
+
 
+@app.command()
+def apply(
+    manifest: Path = typer.Argument(
+        ..., help="JSON or YAML file mapping secret paths to values"
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Show the plan and exit without writing"
+    ),
+    concurrency: int = typer.Option(
+        1, "--concurrency", "-c", min=1, help="Number of secrets written in parallel"
+    ),
+):
+    """Create or update many secrets from a manifest file."""
+    from vaultuner.apply import load_manifest, plan_apply
+    from vaultuner.client import (
+        bitwarden_project_name,
+        get_client,
+        get_secrets_by_keys,
+        with_project,
+    )
+    from vaultuner.config import get_settings
+
+    if not manifest.exists():
+        err_console.print(f"[red]File not found:[/red] {manifest}")
+        raise typer.Exit(1)
+
+    try:
+        entries = load_manifest(manifest)
+    except ValueError as e:
+        err_console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1) from None
+
+    if not entries:
+        console.print(f"[dim]No secrets found in {manifest}.[/dim]")
+        return
+
+    settings = get_settings()
+    client = get_client()
+
+    # Diff against a single snapshot of the secrets named in the manifest
+    existing = get_secrets_by_keys(client, [entry.path for entry in entries])
+    try:
+        writes, unchanged = plan_apply(entries, existing)
+    except ValueError as e:
+        err_console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1) from None
+
+    creates = sum(1 for write in writes if write.secret_id is None)
     console.print(
-        f"\n[green]Import complete:[/green] {created_count} created, {skipped_count} skipped"
+        f"[cyan]Plan: {creates} to create, {len(writes) - creates} to update, "
+        f"{len(unchanged)} unchanged[/cyan]"
+    )
+    for write in writes:
+        if write.secret_id is None:
+            console.print(f"  [green]+[/green] {write.path}")
+        else:
+            console.print(f"  [yellow]~[/yellow] {write.path}")
+
+    if dry_run or not writes:
+        return
+
+    def write_secret(write) -> str | None:
+        """Create or update one secret, returning an error message on failure."""
+        try:
+            if write.secret_id is None:
+                response = with_project(
+                    client,
+                    bitwarden_project_name(write.path, settings.project_mode),
+                    lambda project_id: client.secrets().create(
+                        organization_id=settings.organization_id,
+                        key=write.path,
+                        value=write.value,
+                        note=write.note,
+                        project_ids=[project_id],
+                    ),
+                )
+            else:
+                response = client.secrets().update(
+                    organization_id=settings.organization_id,
+                    id=write.secret_id,
+                    key=write.path,
+                    value=write.value,
+                    note=write.note,
+                    project_ids=None,
+                )
+        except Exception as e:
+            return str(e)
+        return None if response.data else "no data returned"
+
+    errors = run_parallel(write_secret, writes, concurrency)
+    invalidate_caches()
+    created_count = 0
+    updated_count = 0
+    failed_count = 0
+
+    for write, error in zip(writes, errors):
+        if error is not None:
+            failed_count += 1
+            err_console.print(f"[red]Failed:[/red] {write.path} ({error})")
+        elif write.secret_id is None:
+            created_count += 1
+            console.print(f"[green]Created:[/green] {write.path}")
+        else:
+            updated_count += 1
+            console.print(f"[yellow]Updated:[/yellow] {write.path}")
+
+    summary = (
+        f"{created_count} created, {updated_count} updated, "
+        f"{len(unchanged)} unchanged"
     )
+    if failed_count:
+        summary += f", {failed_count} failed"
+    console.print(f"\n[green]Apply complete:[/green] {summary}")
+    if failed_count:
+        raise typer.Exit(1)
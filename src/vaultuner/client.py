@@ -1,17 +1,162 @@
 # ABOUTME: Bitwarden Secrets Manager client wrapper.
 # ABOUTME: Handles authentication and provides helper functions for secrets/projects.
 
+import hashlib
 import tempfile
+import threading
+from collections.abc import Callable
 from pathlib import Path
+from typing import TypeVar
 
 from bitwarden_sdk import BitwardenClient, DeviceType, client_settings_from_dict
 
-from vaultuner.config import get_settings
+from vaultuner.cache import (
+    get_cache_dir,
+    load_key_index,
+    load_project_ids,
+    save_key_index,
+    save_project_ids,
+    write_private,
+)
+from vaultuner.config import DEFAULT_PROJECT_NAME, Settings, get_settings
+from vaultuner.models import SecretPath
+from vaultuner.parallel import RateLimiter, run_parallel
+from vaultuner.profile import span
+from vaultuner.retry import (
+    is_not_found_error,
+    is_transient_error,
+    is_unsent_error,
+    retry_stats,
+    with_retry,
+)
 
+T = TypeVar("T")
 
-def get_client() -> BitwardenClient:
-    """Create and authenticate a Bitwarden client."""
+DEFAULT_BATCH_SIZE = 100
+
+# Fraction by which retry delays are randomly shortened
+RETRY_JITTER = 0.5
+# Calls that would act twice if a first attempt the client saw fail had
+# reached the server; only retried when the request certainly did not
+NON_IDEMPOTENT_METHODS = frozenset({"create"})
+
+# Shared by every client in this process, created on first use
+_rate_limiter: RateLimiter | None = None
+_rate_limiter_lock = threading.Lock()
+
+# Project IDs resolved in this process, keyed by (organization ID, project name)
+_project_ids: dict[tuple[str, str], str] = {}
+_project_lock = threading.Lock()
+
+
+def session_state_path(settings: Settings) -> Path:
+    """Path of the persisted auth state for this organization and access token."""
+    token = settings.access_token.get_secret_value()
+    fingerprint = hashlib.sha256(
+        f"{settings.organization_id}:{token}".encode()
+    ).hexdigest()[:16]
+    return get_cache_dir() / f"session-{fingerprint}.json"
+
+
+class RetryingSection:
+    """Proxy for ``client.secrets()`` or ``client.projects()`` that retries calls.
+
+    Every call waits for the rate limiter, if any, on each attempt and is
+    retried on rate limits and transient errors. Creates are only retried
+    when throttled or refused, so a timed-out create that the server did
+    commit is not made twice. Calls are profiled as ``<section>.<method>``
+    spans.
+    """
+
+    def __init__(
+        self, section, name: str, limiter: RateLimiter | None, attempts: int
+    ):
+        self._section = section
+        self._name = name
+        self._limiter = limiter
+        self._attempts = attempts
+
+    def __getattr__(self, name: str):
+        method = getattr(self._section, name)
+        if not callable(method):
+            return method
+
+        retryable = (
+            is_unsent_error if name in NON_IDEMPOTENT_METHODS else is_transient_error
+        )
+
+        def call(*args, **kwargs):
+            def attempt():
+                if self._limiter is not None:
+                    self._limiter.acquire()
+                return method(*args, **kwargs)
+
+            with span(f"{self._name}.{name}", "sdk"):
+                return with_retry(
+                    attempt,
+                    self._attempts,
+                    jitter=RETRY_JITTER,
+                    stats=retry_stats,
+                    retryable=retryable,
+                )
+
+        return call
+
+
+class RetryingClient:
+    """BitwardenClient wrapper whose secrets and projects calls are retried."""
+
+    def __init__(
+        self,
+        client: BitwardenClient,
+        limiter: RateLimiter | None = None,
+        attempts: int = 3,
+    ):
+        self._client = client
+        self._limiter = limiter
+        self._attempts = attempts
+
+    def secrets(self) -> RetryingSection:
+        return RetryingSection(
+            self._client.secrets(), "secrets", self._limiter, self._attempts
+        )
+
+    def projects(self) -> RetryingSection:
+        return RetryingSection(
+            self._client.projects(), "projects", self._limiter, self._attempts
+        )
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+def get_rate_limiter(settings: Settings) -> RateLimiter | None:
+    """Process-wide limiter for SDK requests, or None when disabled."""
+    global _rate_limiter
+    if settings.rate_limit <= 0:
+        return None
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(settings.rate_limit, settings.rate_burst)
+        return _rate_limiter
+
+
+def get_client() -> RetryingClient:
+    """Create and authenticate a Bitwarden client.
+
+    Secrets and projects calls go through ``RetryingClient``, sharing one
+    rate limiter per process. With ``persist_session`` enabled, the SDK state
+    file is kept in the cache directory so the next invocation reuses the
+    session until it expires. Otherwise a throwaway state file is used and
+    removed after login.
+    """
     settings = get_settings()
+    with span("login"):
+        client = _login(settings)
+    return RetryingClient(client, get_rate_limiter(settings), settings.retry_attempts)
+
+
+def _login(settings: Settings) -> BitwardenClient:
     client = BitwardenClient(
         client_settings_from_dict(
             {
@@ -22,6 +167,17 @@ def get_client() -> BitwardenClient:
             }
         )
     )
+    if settings.persist_session:
+        state_path = session_state_path(settings)
+        if not state_path.exists():
+            write_private(state_path, b"")
+        client.auth().login_access_token(
+            settings.access_token.get_secret_value(), str(state_path)
+        )
+        # The SDK may have replaced the file; keep it private either way
+        state_path.chmod(0o600)
+        return client
+
     with tempfile.NamedTemporaryFile(
         mode="w", suffix=".json", delete=False, delete_on_close=False
     ) as f:
@@ -34,27 +190,207 @@ def get_client() -> BitwardenClient:
 
 
 def get_or_create_project(client: BitwardenClient, project_name: str) -> str:
-    """Get project ID by name, creating it if it doesn't exist."""
+    """Get project ID by name, creating it if it doesn't exist.
+
+    IDs are remembered for the rest of the process and in the on-disk project
+    cache, so projects are only listed on a miss. Call ``forget_project`` when
+    a remembered ID turns out to be gone.
+    """
     settings = get_settings()
+    cache_key = (settings.organization_id, project_name)
+    # Serialized so concurrent callers never create the same project twice
+    with _project_lock:
+        if cache_key in _project_ids:
+            return _project_ids[cache_key]
+
+        cached = load_project_ids(settings) or {}
+        project_id = cached.get(project_name)
+        if project_id is None:
+            project_ids = list_project_ids(client, refresh=True)
+            project_id = project_ids.get(project_name)
+            if project_id is None:
+                result = client.projects().create(settings.organization_id, project_name)
+                if not result.data:
+                    raise RuntimeError(f"Failed to create project: {project_name}")
+                project_id = str(result.data.id)
+                save_project_ids(settings, {**project_ids, project_name: project_id})
+
+        _project_ids[cache_key] = project_id
+        return project_id
+
+
+def forget_project(project_name: str) -> None:
+    """Drop a project's remembered ID, in-process and on disk."""
+    settings = get_settings()
+    with _project_lock:
+        _project_ids.pop((settings.organization_id, project_name), None)
+        cached = load_project_ids(settings)
+        if cached is not None and cached.pop(project_name, None) is not None:
+            save_project_ids(settings, cached)
+
+
+def with_project(
+    client: BitwardenClient, project_name: str, action: Callable[[str], T]
+) -> T:
+    """Call ``action`` with a project's ID, re-resolving it once if it is not found."""
+    project_id = get_or_create_project(client, project_name)
+    try:
+        return action(project_id)
+    except Exception as e:
+        if not is_not_found_error(e):
+            raise
+        forget_project(project_name)
+        return action(get_or_create_project(client, project_name))
+
+
+def bitwarden_project_name(key: str, mode: str) -> str:
+    """Name of the Bitwarden project that holds a secret key under a project mode.
+
+    Raises ValueError in the per-project modes if the key is not a valid path.
+    """
+    if mode not in ("project", "env"):
+        return DEFAULT_PROJECT_NAME
+    path = SecretPath.parse(key)
+    if mode == "env" and path.env:
+        return f"{path.project}/{path.env}"
+    return path.project
+
+
+def list_project_ids(client: BitwardenClient, refresh: bool = False) -> dict[str, str]:
+    """Return the organization's project name→ID mapping, cached like the key index."""
+    settings = get_settings()
+    if not refresh:
+        cached = load_project_ids(settings)
+        if cached is not None:
+            return cached
+
     response = client.projects().list(settings.organization_id)
+    project_ids: dict[str, str] = {}
     if response.data and response.data.data:
         for project in response.data.data:
-            if project.name == project_name:
-                return str(project.id)
-
-    result = client.projects().create(settings.organization_id, project_name)
-    if not result.data:
-        raise RuntimeError(f"Failed to create project: {project_name}")
-    return str(result.data.id)
+            project_ids.setdefault(project.name, str(project.id))
+    save_project_ids(settings, project_ids)
+    return project_ids
 
 
-def find_secret_by_key(client: BitwardenClient, key: str) -> dict | None:
-    """Find a secret by its key name."""
+def list_secret_keys(client: BitwardenClient) -> dict[str, str]:
+    """List the organization's secrets as a key→ID mapping and refresh the index."""
     settings = get_settings()
     response = client.secrets().list(settings.organization_id)
-    if not response.data or not response.data.data:
-        return None
-    for secret in response.data.data:
-        if secret.key == key:
-            return {"id": str(secret.id), "key": secret.key}
+    index: dict[str, str] = {}
+    if response.data and response.data.data:
+        for secret in response.data.data:
+            index.setdefault(secret.key, str(secret.id))
+    save_key_index(settings, index)
+    return index
+
+
+def find_secret_by_key(
+    client: BitwardenClient, key: str, refresh: bool = False
+) -> dict | None:
+    """Find a secret by its key name.
+
+    The local key index is consulted first; hits are marked as ``cached`` since
+    the ID may be stale. On a miss, or with ``refresh``, the organization is
+    listed again.
+    """
+    if not refresh:
+        index = load_key_index(get_settings())
+        if index is not None and key in index:
+            return {"id": index[key], "key": key, "cached": True}
+
+    index = list_secret_keys(client)
+    if key in index:
+        return {"id": index[key], "key": key}
     return None
+
+
+def get_secrets_by_ids(
+    client: BitwardenClient,
+    ids: list[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = 1,
+) -> dict:
+    """Fetch secrets in bulk, keyed by ID in the order of the given IDs.
+
+    IDs are requested in chunks of ``batch_size`` through ``get_by_ids``. If a
+    bulk request is rejected, typically because one ID is missing or not
+    accessible, the secrets in that chunk are fetched one by one instead, and
+    IDs that are not found are left out. Any other error, such as a machine
+    account without access, is raised. Transient errors that outlast the
+    client's retries are raised rather than multiplied into single gets. With ``concurrency`` above 1, up to that many requests run at once;
+    the client's rate limiter paces them.
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1")
+
+    def fetch_chunk(chunk: list[str]) -> list | None:
+        try:
+            response = client.secrets().get_by_ids(chunk)
+        except Exception as e:
+            if is_transient_error(e):
+                raise
+            return None
+        return response.data.data if response.data else None
+
+    def fetch_one(secret_id: str):
+        try:
+            return client.secrets().get(secret_id).data
+        except Exception as e:
+            if is_not_found_error(e):
+                return None
+            raise
+
+    chunks = [
+        ids[start : start + batch_size] for start in range(0, len(ids), batch_size)
+    ]
+    found = {}
+    failed: list[str] = []
+    for chunk, secrets in zip(
+        chunks, run_parallel(fetch_chunk, chunks, concurrency), strict=True
+    ):
+        if secrets is None:
+            failed.extend(chunk)
+            continue
+        for secret in secrets:
+            found[str(secret.id)] = secret
+
+    for secret_id, secret in zip(
+        failed, run_parallel(fetch_one, failed, concurrency), strict=True
+    ):
+        if secret:
+            found[secret_id] = secret
+
+    return {secret_id: found[secret_id] for secret_id in ids if secret_id in found}
+
+
+def get_secrets_by_keys(
+    client: BitwardenClient,
+    keys: list[str],
+    refresh: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict:
+    """Fetch several secrets by key, keyed by key in the order given.
+
+    Keys are resolved with the local index when it covers all of them, or
+    else with a single listing, and values are fetched in bulk. Keys that do
+    not exist are left out of the result.
+    """
+    index = None if refresh else load_key_index(get_settings())
+    cached = index is not None and all(key in index for key in keys)
+    if not cached:
+        index = list_secret_keys(client)
+
+    ids = {key: index[key] for key in keys if key in index}
+    fetched = get_secrets_by_ids(client, list(dict.fromkeys(ids.values())), batch_size)
+
+    found = {}
+    for key, secret_id in ids.items():
+        secret = fetched.get(secret_id)
+        if secret is None or secret.key != key:
+            if cached:
+                # The index is stale; resolve everything again from a fresh listing
+                return get_secrets_by_keys(client, keys, True, batch_size)
+            continue
+        found[key] = secret
+    return found
@@ -1,14 +1,23 @@
 # ABOUTME: Configuration settings for Bitwarden Secrets Manager.
 # ABOUTME: Loads credentials from keychain (preferred) or environment variables.
 
+import os
 import sys
+from typing import Literal, NamedTuple
 
-import keyring
-from pydantic import SecretStr
+from pydantic import Field, SecretStr, ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from vaultuner.profile import span
+
 SERVICE_NAME = "vaultuner"
 DEFAULT_PROJECT_NAME = "vaultuner"
+# Settings field → keychain entry for the credentials kept in the keychain
+KEYRING_KEYS = {
+    "access_token": "bws_access_token",
+    "organization_id": "bws_organization_id",
+}
+TRUTHY = {"1", "true", "yes", "on"}
 
 
 def _require_darwin() -> None:
@@ -24,6 +33,8 @@ def is_keyring_accessible() -> bool:
     """Check whether the system keychain can be reached."""
     if sys.platform != "darwin":
         return False
+    import keyring
+
     try:
         keyring.get_password(SERVICE_NAME, "__probe__")
         return True
@@ -35,6 +46,8 @@ def get_keyring_value(key: str) -> str | None:
     """Get a value from the system keychain. Returns None on non-darwin or if inaccessible."""
     if sys.platform != "darwin":
         return None
+    import keyring
+
     try:
         return keyring.get_password(SERVICE_NAME, key)
     except keyring.errors.KeyringError:
@@ -44,16 +57,79 @@ def get_keyring_value(key: str) -> str | None:
 def set_keyring_value(key: str, value: str) -> None:
     """Store a value in the system keychain."""
     _require_darwin()
+    import keyring
+
     keyring.set_password(SERVICE_NAME, key, value)
+    clear_keyring_credentials()
 
 
 def delete_keyring_value(key: str) -> None:
     """Delete a value from the system keychain."""
     _require_darwin()
+    import keyring
+
     try:
         keyring.delete_password(SERVICE_NAME, key)
     except keyring.errors.PasswordDeleteError:
         pass
+    clear_keyring_credentials()
+
+
+class KeyringCredentials(NamedTuple):
+    accessible: bool
+    # Settings field → value, for the credentials stored in the keychain
+    values: dict[str, str]
+
+
+_keyring_credentials: KeyringCredentials | None = None
+
+
+def load_keyring_credentials() -> KeyringCredentials:
+    """Read every stored credential from the keychain, once per process.
+
+    Each keychain access can be slow or prompt the user, so the result is
+    kept for later calls and the first error stops further lookups.
+    """
+    global _keyring_credentials
+    if _keyring_credentials is None:
+        with span("credentials.keyring", "config"):
+            _keyring_credentials = _read_keyring_credentials()
+    return _keyring_credentials
+
+
+def _read_keyring_credentials() -> KeyringCredentials:
+    if sys.platform != "darwin":
+        return KeyringCredentials(False, {})
+    import keyring
+
+    values = {}
+    for field, key in KEYRING_KEYS.items():
+        try:
+            value = keyring.get_password(SERVICE_NAME, key)
+        except keyring.errors.KeyringError:
+            return KeyringCredentials(False, values)
+        if value:
+            values[field] = value
+    return KeyringCredentials(True, values)
+
+
+def clear_keyring_credentials() -> None:
+    """Forget the loaded credentials so the next load reads the keychain again."""
+    global _keyring_credentials
+    _keyring_credentials = None
+
+
+def keyring_skipped() -> bool:
+    """Whether settings come from the environment without reading the keychain.
+
+    True when BWS_ACCESS_TOKEN is set and either BWS_PREFER_ENV is enabled or
+    the CI variable marks a non-interactive run.
+    """
+    if not os.environ.get("BWS_ACCESS_TOKEN"):
+        return False
+    return any(
+        os.environ.get(name, "").lower() in TRUTHY for name in ("BWS_PREFER_ENV", "CI")
+    )
 
 
 class Settings(BaseSettings):
@@ -63,6 +139,25 @@ class Settings(BaseSettings):
     organization_id: str
     api_url: str = "https://vault.bitwarden.com/api"
     identity_url: str = "https://vault.bitwarden.com/identity"
+    # Seconds the local key→ID index stays valid; 0 disables it
+    index_ttl: int = 300
+    # Keep the SDK auth state on disk so later invocations skip the login
+    persist_session: bool = False
+    # Bitwarden project new secrets go into: one shared project ("single"),
+    # one per vaultuner PROJECT ("project"), or one per PROJECT/ENV ("env")
+    project_mode: Literal["single", "project", "env"] = "single"
+    # SDK requests per second across the process, in bursts of up to
+    # rate_burst; 0 disables the limit
+    rate_limit: float = 20.0
+    rate_burst: int = Field(10, ge=1)
+    # Attempts per SDK call when rate limited or on transient server errors
+    retry_attempts: int = Field(3, ge=1)
+    # Seconds `get --value` serves a secret from the local value cache without
+    # contacting Bitwarden; 0 disables the cache
+    value_cache_ttl: int = 0
+    # Seconds past the TTL a cached value is still served while a background
+    # process fetches a fresh one
+    value_cache_stale: int = 0
 
     @classmethod
     def settings_customise_sources(
@@ -90,14 +185,9 @@ class KeyringSettingsSource:
         self.settings_cls = settings_cls
 
     def __call__(self):
-        values = {}
-        access_token = get_keyring_value("bws_access_token")
-        if access_token:
-            values["access_token"] = access_token
-        org_id = get_keyring_value("bws_organization_id")
-        if org_id:
-            values["organization_id"] = org_id
-        return values
+        if keyring_skipped():
+            return {}
+        return dict(load_keyring_credentials().values)
 
 
 _settings: Settings | None = None
@@ -108,7 +198,23 @@ def get_settings() -> Settings:
     global _settings
     if _settings is None:
         try:
-            _settings = Settings()
+            with span("settings", "config"):
+                _settings = Settings()
+        except ValidationError as e:
+            invalid = [error for error in e.errors() if error["type"] != "missing"]
+            if not invalid:
+                raise SystemExit(
+                    "Credentials not configured. Run:\n"
+                    "  vaultuner config set access-token <token>\n"
+                    "  vaultuner config set organization-id <org-id>"
+                ) from None
+            raise SystemExit(
+                "Invalid settings:\n"
+                + "\n".join(
+                    f"  BWS_{str(error['loc'][0]).upper()}: {error['msg']}"
+                    for error in invalid
+                )
+            ) from None
         except Exception:
             raise SystemExit(
                 "Credentials not configured. Run:\n"
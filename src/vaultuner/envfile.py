@@ -0,0 +1,177 @@
+# ABOUTME: Streaming tokenizer and writer for .env files, shared by export and import.
+# ABOUTME: Handles export prefixes, quoting, escapes, inline comments and in-place rewrites.
+
+import itertools
+import os
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+# Escape sequences understood inside double quotes; others are kept verbatim
+DOUBLE_QUOTE_ESCAPES = {
+    "\\": "\\",
+    '"': '"',
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "$": "$",
+}
+
+
+class EnvEntry(NamedTuple):
+    name: str
+    value: str
+    # Zero-based line span of the entry, end exclusive; quoted values may span lines
+    start_line: int
+    end_line: int
+    # Inline comment after the value, from its "#", or "" if there is none
+    comment: str = ""
+
+
+def format_env_line(env_var: str, value: str) -> str:
+    """Format a variable assignment with a double-quoted, escaped value.
+
+    Newlines are kept as is, so multi-line values stay readable; carriage
+    returns are escaped because text-mode reads would turn them into newlines.
+    """
+    escaped_value = (
+        value.replace("\\", "\\\\").replace('"', '\\"').replace("\r", "\\r")
+    )
+    return f'{env_var}="{escaped_value}"'
+
+
+def _parse_name(text: str) -> str:
+    parts = text.split(None, 1)
+    if len(parts) == 2 and parts[0] == "export":
+        return parts[1].strip()
+    return text.strip()
+
+
+def _split_inline_comment(value: str) -> tuple[str, str]:
+    """Split an unquoted value at a `` #`` comment into ``(value, comment)``."""
+    for i, char in enumerate(value):
+        if char == "#" and (i == 0 or value[i - 1] in " \t"):
+            return value[:i], value[i:].rstrip()
+    return value, ""
+
+
+def _read_quoted(
+    first: str, rest: Iterator[str], quote: str
+) -> tuple[str | None, list[str], str]:
+    """Read a quoted value starting after its opening quote.
+
+    Returns the unescaped value, or None if the quote is never closed, the
+    extra lines consumed from ``rest``, and the text after the closing quote.
+    """
+    chars: list[str] = []
+    consumed: list[str] = []
+    text = first
+    while True:
+        i = 0
+        while i < len(text):
+            char = text[i]
+            if char == quote:
+                return "".join(chars), consumed, text[i + 1 :]
+            if quote == '"' and char == "\\" and i + 1 < len(text):
+                following = text[i + 1]
+                if following in DOUBLE_QUOTE_ESCAPES:
+                    chars.append(DOUBLE_QUOTE_ESCAPES[following])
+                    i += 2
+                    continue
+            chars.append(char)
+            i += 1
+
+        line = next(rest, None)
+        if line is None:
+            return None, consumed, ""
+        consumed.append(line)
+        chars.append("\n")
+        text = line
+
+
+def iter_env_entries(lines: Iterable[str]) -> Iterator[EnvEntry]:
+    """Tokenize .env lines into entries, one pass and without buffering the input.
+
+    Accepts ``KEY=value`` lines with an optional ``export`` prefix. Unquoted
+    values end at an inline `` #`` comment; single-quoted values are literal;
+    double-quoted values understand backslash escapes. Quoted values may span
+    lines. A quote that is never closed is read as a plain value, and lines
+    without ``=`` are skipped.
+    """
+    numbered: Iterator[tuple[int, str]] = enumerate(
+        line.rstrip("\r\n") for line in lines
+    )
+    while (item := next(numbered, None)) is not None:
+        lineno, line = item
+        # Trailing whitespace may belong to a quoted value spanning lines
+        stripped = line.lstrip()
+        if not stripped or stripped.startswith("#") or "=" not in stripped:
+            continue
+
+        raw_name, _, raw_value = stripped.partition("=")
+        name = _parse_name(raw_name)
+        raw_value = raw_value.lstrip()
+
+        quote = raw_value[:1]
+        if quote in ('"', "'"):
+            rest = (text for _, text in numbered)
+            value, consumed, tail = _read_quoted(raw_value[1:], rest, quote)
+            if value is not None:
+                _, comment = _split_inline_comment(tail)
+                end = lineno + 1 + len(consumed)
+                yield EnvEntry(name, value, lineno, end, comment)
+                continue
+            # Unterminated quote: keep the line as is and re-read what followed
+            numbered = itertools.chain(enumerate(consumed, lineno + 1), numbered)
+            yield EnvEntry(name, raw_value.rstrip(), lineno, lineno + 1)
+            continue
+
+        value, comment = _split_inline_comment(raw_value)
+        yield EnvEntry(name, value.rstrip(), lineno, lineno + 1, comment)
+
+
+def read_env_entries(path: Path) -> Iterator[EnvEntry]:
+    """Stream the entries of a .env file; a missing file has none."""
+    if not path.exists():
+        return
+    with path.open() as f:
+        yield from iter_env_entries(f)
+
+
+def rewrite_env_file(
+    path: Path, replacements: Mapping[EnvEntry, str], appended: Sequence[str] = ()
+) -> None:
+    """Atomically rewrite a .env file, replacing entries and appending lines.
+
+    Each entry in ``replacements`` has its whole line span replaced by the
+    given line. The original is streamed into a temporary file in the same
+    directory, which is then renamed over it with the original permissions.
+    """
+    spans = {
+        entry.start_line: (entry.end_line, line) for entry, line in replacements.items()
+    }
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("w") as out:
+            ends_with_newline = True
+            if path.exists():
+                with path.open() as src:
+                    skip_until = 0
+                    for lineno, line in enumerate(src):
+                        if lineno < skip_until:
+                            continue
+                        if lineno in spans:
+                            skip_until, line = spans[lineno]
+                            line += "\n"
+                        out.write(line)
+                        ends_with_newline = line.endswith("\n")
+            if appended:
+                if not ends_with_newline:
+                    out.write("\n")
+                out.write("\n".join(appended) + "\n")
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -1,11 +1,25 @@
 # ABOUTME: Export project secrets to .env file format.
-# ABOUTME: Handles parsing existing .env files and appending new secrets.
+# ABOUTME: Appends new secrets, or syncs a .env file in place using the SDK's incremental sync.
 
+import hashlib
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from vaultuner.client import get_client
+from vaultuner.agent import connect_agent
+from vaultuner.cache import read_cache, write_cache
+from vaultuner.client import DEFAULT_BATCH_SIZE, get_client, get_secrets_by_ids
 from vaultuner.config import get_settings
-from vaultuner.models import SecretPath, is_deleted
+from vaultuner.envfile import (
+    EnvEntry,
+    format_env_line,
+    read_env_entries,
+    rewrite_env_file,
+)
+from vaultuner.index import SecretIndex
+from vaultuner.models import SecretPath
+
+# Sync checkpoints are moved back by this much so a skewed local clock cannot hide changes
+SYNC_CLOCK_SKEW = timedelta(minutes=1)
 
 
 def secret_name_to_env_var(name: str) -> str:
@@ -15,59 +29,76 @@ def secret_name_to_env_var(name: str) -> str:
 
 def parse_env_file(path: Path) -> set[str]:
     """Parse a .env file and return the set of defined variable names."""
-    defined_vars: set[str] = set()
-    if not path.exists():
-        return defined_vars
-
-    for line in path.read_text().splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if "=" in line:
-            var_name = line.split("=", 1)[0].strip()
-            defined_vars.add(var_name)
-    return defined_vars
+    return {entry.name for entry in read_env_entries(path)}
 
 
-def export_secrets(
+def fetch_project_secrets(
     project_name: str,
-    output: Path,
     env: str | None = None,
-) -> tuple[int, int]:
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = 1,
+) -> list[tuple[SecretPath, str]]:
     """
-    Export secrets for a project to a .env file.
+    Fetch the secrets of a project (and exactly the env, or no env).
 
-    Returns a tuple of (added_count, skipped_count).
+    Uses one listing and bulk fetches of the values, up to ``concurrency`` at
+    a time. Returns (path, value) pairs in listing order.
     """
     settings = get_settings()
-    client = get_client()
+    client = connect_agent() or get_client()
     response = client.secrets().list(settings.organization_id)
 
     if not response.data or not response.data.data:
-        return 0, 0
+        return []
 
-    # Find secrets matching the project (and optionally env)
-    matching_secrets: list[tuple[SecretPath, str]] = []
-    for secret in response.data.data:
-        key = secret.key
-        if is_deleted(key):
-            continue
+    # Find secrets matching the project (and exactly the env, or no env)
+    index = SecretIndex(response.data.data)
+    matching_paths: dict[str, SecretPath] = {
+        str(entry.secret.id): entry.path
+        for entry in index.query(project_name, env, exact_env=True)
+    }
 
-        try:
-            path = SecretPath.parse(key)
-        except ValueError:
-            continue
+    # Fetch the actual values in bulk
+    return [
+        (matching_paths[secret_id], data.value)
+        for secret_id, data in get_secrets_by_ids(
+            client, list(matching_paths), batch_size, concurrency
+        ).items()
+    ]
 
-        if path.project != project_name:
-            continue
-        if path.env != env:
-            continue
 
-        # Fetch the actual value
-        secret_response = client.secrets().get(secret.id)
-        if secret_response.data:
-            matching_secrets.append((path, secret_response.data.value))
+def project_env_vars(
+    project_name: str,
+    env: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, str]:
+    """
+    Map environment variable names to the values of a project's secrets.
+
+    When two secrets map to the same variable, the first one listed wins,
+    as in ``export_secrets``.
+    """
+    env_vars: dict[str, str] = {}
+    for path, value in fetch_project_secrets(project_name, env, batch_size):
+        env_vars.setdefault(secret_name_to_env_var(path.name), value)
+    return env_vars
+
+
+def export_secrets(
+    project_name: str,
+    output: Path,
+    env: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = 1,
+) -> tuple[int, int]:
+    """
+    Export secrets for a project to a .env file.
 
+    Returns a tuple of (added_count, skipped_count).
+    """
+    matching_secrets = fetch_project_secrets(
+        project_name, env, batch_size, concurrency
+    )
     if not matching_secrets:
         return 0, 0
 
@@ -81,8 +112,7 @@ def export_secrets(
 
     for path, value in matching_secrets:
         env_var = secret_name_to_env_var(path.name)
-        escaped_value = value.replace("\\", "\\\\").replace('"', '\\"')
-        env_line = f'{env_var}="{escaped_value}"'
+        env_line = format_env_line(env_var, value)
 
         if env_var in existing_vars:
             lines_to_append.append(f"# Already defined above, from {path}:")
@@ -103,3 +133,120 @@ def export_secrets(
             f.write("\n")
 
     return added_count, skipped_count
+
+
+def sync_state_name(output: Path, project_name: str, env: str | None) -> str:
+    """Cache entry name for the sync checkpoint of one output file and scope."""
+    scope = f"{output.resolve()}:{project_name}:{env or ''}"
+    return f"sync-{hashlib.sha256(scope.encode()).hexdigest()[:16]}"
+
+
+def sync_secrets(
+    project_name: str,
+    output: Path,
+    env: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = 1,
+) -> tuple[int, int, int, int]:
+    """
+    Bring the variables of a project in a .env file up to date with the vault.
+
+    Changed values are rewritten in place, keeping any inline comment, and new
+    secrets are appended, keeping comments, ordering and unrelated variables.
+    Variables whose secret was deleted or renamed since the previous sync are
+    commented out. After the first sync, the SDK's incremental sync is asked
+    whether anything changed since the previous run: nothing is fetched when
+    nothing changed. Otherwise only the project's secrets are fetched, and
+    only those revised since then are compared against the file.
+
+    Returns a tuple of (added_count, updated_count, unchanged_count,
+    removed_count).
+    """
+    settings = get_settings()
+    client = get_client()
+    state_name = sync_state_name(output, project_name, env)
+    started = datetime.now(timezone.utc) - SYNC_CLOCK_SKEW
+
+    # Later definitions win, like when the file is sourced
+    defined = {entry.name: entry for entry in read_env_entries(output)}
+    state = read_cache(state_name, settings) if output.exists() else None
+
+    last_synced: datetime | None = None
+    if state is not None:
+        last_synced = datetime.fromisoformat(state["last_synced"])
+        # Only asked whether anything changed: its secrets span the whole
+        # organization, values included, so they are never kept
+        response = client.secrets().sync(settings.organization_id, last_synced)
+        if not response.data:
+            raise RuntimeError("Failed to sync secrets")
+        has_changes = response.data.has_changes
+        del response
+
+        if not has_changes and all(var in defined for var in state["vars"]):
+            write_cache(
+                state_name,
+                settings,
+                {"last_synced": started.isoformat(), "vars": state["vars"]},
+            )
+            return 0, 0, len(state["vars"]), 0
+
+    response = client.secrets().list(settings.organization_id)
+    secrets = response.data.data if response.data and response.data.data else []
+    index = SecretIndex(secrets)
+    matching = {
+        str(entry.secret.id): secret_name_to_env_var(entry.path.name)
+        for entry in index.query(project_name, env, exact_env=True)
+    }
+    fetched = get_secrets_by_ids(client, list(matching), batch_size, concurrency)
+    project_vars = list(matching.values())
+
+    values: dict[str, str] = {}
+    skipped = 0
+    for secret_id, env_var in matching.items():
+        secret = fetched.get(secret_id)
+        if secret is None:
+            continue
+        # Local edits to secrets not revised since the last sync are kept
+        if (
+            last_synced is None
+            or env_var not in defined
+            or secret.revision_date >= last_synced
+        ):
+            values[env_var] = secret.value
+        else:
+            skipped += 1
+
+    replacements: dict[EnvEntry, str] = {}
+    appended: list[str] = []
+    unchanged_count = skipped
+    for env_var, value in values.items():
+        if env_var not in defined:
+            appended.append(format_env_line(env_var, value))
+        elif defined[env_var].value != value:
+            entry = defined[env_var]
+            line = format_env_line(env_var, value)
+            replacements[entry] = f"{line} {entry.comment}" if entry.comment else line
+        else:
+            unchanged_count += 1
+    updated_count = len(replacements)
+
+    # Variables synced before whose secret was since deleted or renamed
+    removed = set(state["vars"] if state else ()) - set(project_vars)
+    for env_var in sorted(removed):
+        if env_var in defined:
+            replacements[defined[env_var]] = f"# {env_var} was removed from the vault"
+
+    if replacements or appended:
+        rewrite_env_file(output, replacements, appended)
+
+    write_cache(
+        state_name,
+        settings,
+        {"last_synced": started.isoformat(), "vars": sorted(set(project_vars))},
+    )
+    return (
+        len(appended),
+        updated_count,
+        unchanged_count,
+        len(replacements) - updated_count,
+    )
@@ -1,8 +1,11 @@
 # ABOUTME: Import secrets from .env file to Bitwarden Secrets Manager.
 # ABOUTME: Parses .env files and interactively stores secrets.
 
+from collections.abc import Collection
 from pathlib import Path
 
+from vaultuner.envfile import read_env_entries
+
 
 def env_var_to_secret_name(var_name: str) -> str:
     """Convert an environment variable name to a secret name.
@@ -14,28 +17,7 @@ def env_var_to_secret_name(var_name: str) -> str:
 
 def parse_env_entries(path: Path) -> list[tuple[str, str]]:
     """Parse a .env file and return list of (name, value) tuples."""
-    entries: list[tuple[str, str]] = []
-    if not path.exists():
-        return entries
-
-    for line in path.read_text().splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if "=" not in line:
-            continue
-
-        var_name, _, value = line.partition("=")
-        var_name = var_name.strip()
-        value = value.strip()
-
-        # Remove surrounding quotes if present
-        if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
-            value = value[1:-1]
-
-        entries.append((var_name, value))
-
-    return entries
+    return [(entry.name, entry.value) for entry in read_env_entries(path)]
 
 
 def build_secret_path(project: str, env: str | None, name: str) -> str:
@@ -43,3 +25,30 @@ def build_secret_path(project: str, env: str | None, name: str) -> str:
     if env:
         return f"{project}/{env}/{name}"
     return f"{project}/{name}"
+
+
+def plan_import(
+    entries: list[tuple[str, str]],
+    project: str,
+    env: str | None,
+    existing_keys: Collection[str],
+) -> tuple[list[tuple[str, str, str]], list[str]]:
+    """Split .env entries into secrets to create and paths that already exist.
+
+    Returns ``(to_create, existing)`` where ``to_create`` holds
+    ``(var_name, secret_path, value)`` tuples in input order. Repeated
+    variables are only planned once.
+    """
+    to_create: list[tuple[str, str, str]] = []
+    existing: list[str] = []
+    planned: set[str] = set()
+
+    for var_name, value in entries:
+        secret_path = build_secret_path(project, env, env_var_to_secret_name(var_name))
+        if secret_path in existing_keys:
+            existing.append(secret_path)
+        elif secret_path not in planned:
+            planned.add(secret_path)
+            to_create.append((var_name, secret_path, value))
+
+    return to_create, existing
@@ -0,0 +1,118 @@
+# ABOUTME: In-memory index of listed secrets grouped by project and environment.
+# ABOUTME: Lets commands look up one project or env without re-filtering the whole organization.
+
+from collections.abc import Iterable, Iterator
+from typing import Any, NamedTuple
+
+from vaultuner.models import SecretPath, is_deleted, unmark_deleted
+
+
+def parse_listed_key(key: str) -> tuple[SecretPath, bool] | None:
+    """Parse a listed key into its path and deleted flag, or None if invalid."""
+    deleted = is_deleted(key)
+    try:
+        path = SecretPath.parse(unmark_deleted(key) if deleted else key)
+    except ValueError:
+        return None
+    return path, deleted
+
+
+def iter_listed_secrets(
+    secrets: Iterable, include_deleted: bool = False
+) -> Iterator[tuple[SecretPath, bool]]:
+    """Yield ``(path, is_deleted)`` for listed secrets as they are parsed.
+
+    For unfiltered listings, where building a SecretIndex would only delay
+    the first line of output.
+    """
+    for secret in secrets:
+        parsed = parse_listed_key(secret.key)
+        if parsed is not None and (include_deleted or not parsed[1]):
+            yield parsed
+
+
+class IndexedSecret(NamedTuple):
+    path: SecretPath
+    secret: Any
+    deleted: bool
+    # Position in the original listing, used to keep output order stable
+    position: int
+
+
+class SecretIndex:
+    """Secrets from an organization listing, keyed by project, then environment.
+
+    Keys are parsed once when added; ``_deleted_/`` keys are indexed under
+    their original path and flagged as deleted. Keys that are not valid
+    secret paths are ignored.
+    """
+
+    def __init__(self, secrets: Iterable = ()):
+        self._entries: list[IndexedSecret] = []
+        self._projects: dict[str, dict[str | None, list[IndexedSecret]]] = {}
+        for secret in secrets:
+            self.add(secret)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, secret) -> None:
+        """Index a listed secret (anything with a ``key`` attribute)."""
+        parsed = parse_listed_key(secret.key)
+        if parsed is None:
+            return
+
+        path, deleted = parsed
+        entry = IndexedSecret(path, secret, deleted, len(self._entries))
+        self._entries.append(entry)
+        envs = self._projects.setdefault(path.project, {})
+        envs.setdefault(path.env, []).append(entry)
+
+    def projects(self, include_deleted: bool = False) -> list[str]:
+        """Return the sorted names of projects with at least one matching secret."""
+        return sorted(
+            name
+            for name, envs in self._projects.items()
+            if any(
+                include_deleted or not entry.deleted
+                for entries in envs.values()
+                for entry in entries
+            )
+        )
+
+    def query(
+        self,
+        project: str | None = None,
+        env: str | None = None,
+        exact_env: bool = False,
+        include_deleted: bool = False,
+    ) -> Iterator[IndexedSecret]:
+        """Yield indexed secrets in listing order, filtered by project and env.
+
+        By default ``env=None`` matches every environment. With ``exact_env``
+        it matches only secrets that have no environment.
+        """
+        if project is None and env is None and not exact_env:
+            buckets: list[list[IndexedSecret]] = [self._entries]
+        else:
+            if project is None:
+                projects = list(self._projects.values())
+            else:
+                projects = [self._projects.get(project, {})]
+
+            if env is None and not exact_env:
+                buckets = [entries for envs in projects for entries in envs.values()]
+            else:
+                buckets = [envs[env] for envs in projects if env in envs]
+
+        if len(buckets) == 1:
+            entries: Iterable[IndexedSecret] = buckets[0]
+        else:
+            entries = sorted(
+                (entry for bucket in buckets for entry in bucket),
+                key=lambda entry: entry.position,
+            )
+
+        for entry in entries:
+            if include_deleted or not entry.deleted:
+                yield entry
@@ -1,6 +1,8 @@
 # ABOUTME: Data models for vaultuner.
 # ABOUTME: SecretPath (plain and @org/repo scoped), SecretMetadata, and note frontmatter parsing.
 
+from typing import NamedTuple
+
 from pydantic import BaseModel, ConfigDict
 
 import yaml
@@ -23,7 +25,9 @@ def unmark_deleted(key: str) -> str:
     return key.removeprefix(DELETED_PREFIX)
 
 
-class SecretPath(BaseModel):
+class SecretPath(NamedTuple):
+    # A plain tuple rather than a pydantic model: parse() runs once per secret
+    # in an organization listing, and the parsed parts need no validation
     project: str
     name: str
     env: str | None = None
@@ -33,7 +37,7 @@ class SecretPath(BaseModel):
         """Parse a path like 'project/env/name' or '@org/repo/env/name'."""
         parts = path.split("/")
 
-        if any(not part for part in parts):
+        if "" in parts:
             raise ValueError(
                 f"Invalid path format: {path}. Path segments cannot be empty."
             )
@@ -130,3 +134,11 @@ def render_note(metadata: SecretMetadata, body: str) -> str | None:
         parts.append(body)
 
     return "\n".join(parts)
+
+
+def is_unchanged(
+    current_value: str, current_note: str | None, value: str, note: str | None
+) -> bool:
+    """Check whether writing a value and rendered note would leave a secret as it is."""
+    # render_note() returns None for an empty note, which Bitwarden stores as ""
+    return value == current_value and note == (current_note or None)
@@ -0,0 +1,67 @@
+# ABOUTME: Bounded worker pool and token-bucket rate limiter for fanning out SDK calls.
+# ABOUTME: Results always come back in input order, regardless of completion order.
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` calls per second, in bursts of up to `burst`.
+
+    Safe to share between threads; callers that exceed the rate block in
+    ``acquire`` until their turn.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # Reserve the token now so waiting callers are served in order
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+def run_parallel(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    concurrency: int = 1,
+    limiter: RateLimiter | None = None,
+) -> list[R]:
+    """Apply func to every item with at most `concurrency` calls in flight.
+
+    With a limiter, each call first waits for a token from it.
+    """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+    if limiter is not None:
+        unlimited = func
+
+        def func(item: T) -> R:
+            limiter.acquire()
+            return unlimited(item)
+
+    if concurrency == 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(func, items))
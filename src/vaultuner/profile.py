@@ -0,0 +1,113 @@
+# ABOUTME: Opt-in timing spans for command phases, SDK calls and cache access.
+# ABOUTME: Summarizes spans per name or exports them as Chrome trace JSON for --profile.
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import NamedTuple
+
+
+class Span(NamedTuple):
+    name: str
+    category: str
+    # Seconds since profiling was enabled
+    start: float
+    duration: float
+    thread: int
+
+
+class SpanSummary(NamedTuple):
+    name: str
+    category: str
+    count: int
+    total: float
+    longest: float
+
+
+class Profiler:
+    """Records timed spans from any thread once enabled; a no-op until then."""
+
+    def __init__(self):
+        self.enabled = False
+        self.spans: list[Span] = []
+        self._origin = 0.0
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        """Start recording, discarding spans from an earlier run."""
+        with self._lock:
+            self.spans = []
+            self._origin = time.perf_counter()
+            self.enabled = True
+
+    def span(self, name: str, category: str = "phase") -> AbstractContextManager:
+        """Time the enclosed block under ``name``."""
+        if not self.enabled:
+            return nullcontext()
+        return self._record(name, category)
+
+    @contextmanager
+    def _record(self, name: str, category: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            span = Span(
+                name, category, start - self._origin, end - start, threading.get_ident()
+            )
+            with self._lock:
+                self.spans.append(span)
+
+    def summary(self) -> list[SpanSummary]:
+        """Aggregate spans by name, slowest total first."""
+        totals: dict[str, SpanSummary] = {}
+        for span in self.spans:
+            current = totals.get(span.name)
+            if current is None:
+                totals[span.name] = SpanSummary(
+                    span.name, span.category, 1, span.duration, span.duration
+                )
+            else:
+                totals[span.name] = current._replace(
+                    count=current.count + 1,
+                    total=current.total + span.duration,
+                    longest=max(current.longest, span.duration),
+                )
+        return sorted(totals.values(), key=lambda summary: summary.total, reverse=True)
+
+    def chrome_trace(self) -> dict:
+        """Spans in the Chrome trace event format, for chrome://tracing or Perfetto."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": round(span.start * 1_000_000),
+                    "dur": round(span.duration * 1_000_000),
+                    "pid": pid,
+                    "tid": span.thread,
+                }
+                for span in sorted(self.spans, key=lambda span: span.start)
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write_trace(self, path: Path) -> None:
+        """Write the recorded spans to a Chrome trace JSON file."""
+        path.write_text(json.dumps(self.chrome_trace()))
+
+
+# Shared by every module in this process
+profiler = Profiler()
+
+
+def span(name: str, category: str = "phase") -> AbstractContextManager:
+    """Time the enclosed block with the process-wide profiler."""
+    return profiler.span(name, category)
@@ -0,0 +1,120 @@
+# ABOUTME: Retry with exponential backoff and jitter for Bitwarden SDK calls.
+# ABOUTME: Classifies SDK errors as transient (rate limits, 5xx, network) or permanent.
+
+import random
+import re
+import threading
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 0.5
+# Longest wait between attempts, unless the server asks for more
+MAX_DELAY = 30.0
+
+# The SDK raises plain exceptions carrying the server's error message. Status
+# codes are matched as whole numbers, since messages also quote secret UUIDs.
+TRANSIENT_PATTERN = re.compile(
+    r"\b(?:429|500|502|503|504)\b|too many requests|internal server error"
+    r"|bad gateway|service unavailable|gateway timeout|timed out|timeout|connection",
+    re.IGNORECASE,
+)
+RATE_LIMIT_PATTERN = re.compile(r"\b429\b|too many requests", re.IGNORECASE)
+# Failures after which the server cannot have acted on the request
+NOT_SENT_PATTERN = re.compile(r"connection refused", re.IGNORECASE)
+NOT_FOUND_PATTERN = re.compile(r"\b404\b|not found", re.IGNORECASE)
+
+RETRY_AFTER_PATTERN = re.compile(r"retry[- ]after\W*(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Check whether an SDK error is worth retrying."""
+    return TRANSIENT_PATTERN.search(str(error)) is not None
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Check whether an SDK error means the server is throttling us."""
+    return RATE_LIMIT_PATTERN.search(str(error)) is not None
+
+
+def is_unsent_error(error: Exception) -> bool:
+    """Check whether a request certainly had no effect, so even a create can be retried.
+
+    Only throttled and refused requests qualify; after a timeout or a gateway
+    error the server may already have committed the first attempt.
+    """
+    return is_rate_limited(error) or NOT_SENT_PATTERN.search(str(error)) is not None
+
+
+def is_not_found_error(error: Exception) -> bool:
+    """Check whether an SDK error means the referenced resource does not exist."""
+    return NOT_FOUND_PATTERN.search(str(error)) is not None
+
+
+def retry_after(error: Exception) -> float | None:
+    """Seconds the server asked us to wait, if the error message says."""
+    match = RETRY_AFTER_PATTERN.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class RetryStats:
+    """Counters for calls made through ``with_retry``, shared across threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.retries = 0
+            self.throttles = 0
+            self.waited = 0.0
+
+    def record_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def record_retry(self, delay: float, throttled: bool) -> None:
+        with self._lock:
+            self.retries += 1
+            self.throttles += throttled
+            self.waited += delay
+
+
+# Counters for every SDK call made through the client wrapper in this process
+retry_stats = RetryStats()
+
+
+def with_retry(
+    func: Callable[[], T],
+    attempts: int = DEFAULT_ATTEMPTS,
+    base_delay: float = DEFAULT_BASE_DELAY,
+    jitter: float = 0.0,
+    stats: RetryStats | None = None,
+    retryable: Callable[[Exception], bool] = is_transient_error,
+) -> T:
+    """Call func, retrying errors ``retryable`` accepts with exponential backoff.
+
+    With ``jitter`` between 0 and 1, each delay is shortened by up to that
+    fraction at random so concurrent callers do not retry in lockstep. A
+    Retry-After hint in the error is honoured when it asks for longer.
+    """
+    for attempt in range(attempts):
+        if stats is not None:
+            stats.record_call()
+        try:
+            return func()
+        except Exception as e:
+            if attempt == attempts - 1 or not retryable(e):
+                raise
+            delay = min(base_delay * 2**attempt, MAX_DELAY)
+            delay *= 1 - jitter * random.random()
+            delay = max(delay, retry_after(e) or 0.0)
+            if stats is not None:
+                stats.record_retry(delay, is_rate_limited(e))
+            time.sleep(delay)
+    raise ValueError("Attempts must be at least 1")
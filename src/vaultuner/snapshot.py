@@ -0,0 +1,238 @@
+# ABOUTME: Dumps an organization's secret metadata to a local SQLite file.
+# ABOUTME: Lets list, projects and get answer offline; values are only stored encrypted, on request.
+
+import json
+import os
+import sqlite3
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+import yaml
+
+from vaultuner.models import mark_deleted, parse_note
+
+if TYPE_CHECKING:
+    from vaultuner.config import Settings
+
+# Bumped whenever the schema changes; older snapshots must be taken again
+SNAPSHOT_FORMAT = "1"
+
+SCHEMA = """
+CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE secrets (
+    id TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    project_id TEXT,
+    revision_date TEXT,
+    -- JSON note frontmatter, NULL when the note has none
+    metadata TEXT,
+    value BLOB
+);
+CREATE INDEX secrets_key ON secrets (key);
+"""
+
+
+class SnapshotError(Exception):
+    """The file is missing or is not a vaultuner snapshot."""
+
+
+class SnapshotSecret(NamedTuple):
+    id: str
+    key: str
+    # One-element list, matching the project_ids of an SDK listing
+    project_ids: list[str]
+    revision_date: str | None
+    metadata: dict
+
+
+class SnapshotValue(NamedTuple):
+    value: str
+    metadata: dict
+
+
+def _encode_metadata(note: str | None) -> str | None:
+    """Frontmatter of a note as compact JSON without unset fields, or None."""
+    if not note:
+        return None
+    try:
+        metadata, _ = parse_note(note)
+    except (yaml.YAMLError, ValueError):
+        return None
+    fields = metadata.model_dump(exclude_none=True)
+    return json.dumps(fields, separators=(",", ":")) if fields else None
+
+
+def write_snapshot(
+    path: Path, secrets, settings: "Settings", include_values: bool = False
+) -> int:
+    """Write full secrets (SDK ``SecretResponse`` objects) to a snapshot file.
+
+    Values are left out unless ``include_values`` is set, in which case each
+    one is encrypted with the same access-token-derived key as the local
+    cache. The file is built next to ``path``, readable only by the current
+    user, and renamed into place. Returns the number of secrets written.
+    """
+    from vaultuner.cache import get_fernet
+
+    fernet = get_fernet(settings) if include_values else None
+    rows = [
+        (
+            str(secret.id),
+            secret.key,
+            str(secret.project_id) if secret.project_id else None,
+            secret.revision_date.isoformat() if secret.revision_date else None,
+            _encode_metadata(secret.note),
+            fernet.encrypt(secret.value.encode()) if fernet else None,
+        )
+        for secret in secrets
+    ]
+    meta = {
+        "format": SNAPSHOT_FORMAT,
+        "organization_id": settings.organization_id,
+        "created": datetime.now(UTC).isoformat(),
+        "values": "encrypted" if include_values else "none",
+    }
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    os.close(fd)
+    try:
+        connection = sqlite3.connect(tmp_path)
+        try:
+            with connection:
+                connection.executescript(SCHEMA)
+                connection.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+                connection.executemany(
+                    "INSERT INTO secrets VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+        finally:
+            connection.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return len(rows)
+
+
+def take_snapshot(
+    path: Path,
+    include_values: bool = False,
+    batch_size: int | None = None,
+    concurrency: int = 1,
+) -> int:
+    """List the organization, fetch every secret in bulk and write a snapshot."""
+    from vaultuner.client import DEFAULT_BATCH_SIZE, get_client, get_secrets_by_ids
+    from vaultuner.config import get_settings
+
+    settings = get_settings()
+    client = get_client()
+    response = client.secrets().list(settings.organization_id)
+    listed = response.data.data if response.data and response.data.data else []
+    secrets = get_secrets_by_ids(
+        client,
+        [str(secret.id) for secret in listed],
+        batch_size=batch_size or DEFAULT_BATCH_SIZE,
+        concurrency=concurrency,
+    )
+    return write_snapshot(path, secrets.values(), settings, include_values)
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    if not path.is_file():
+        raise SnapshotError(f"Snapshot not found: {path}")
+    connection = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        row = connection.execute(
+            "SELECT value FROM meta WHERE name = 'format'"
+        ).fetchone()
+    except sqlite3.DatabaseError:
+        connection.close()
+        raise SnapshotError(f"Not a vaultuner snapshot: {path}") from None
+    if row is None or row[0] != SNAPSHOT_FORMAT:
+        connection.close()
+        raise SnapshotError(
+            f"Unsupported snapshot format in {path}; run vaultuner snapshot again"
+        )
+    return connection
+
+
+def load_snapshot(path: Path, project: str | None = None) -> list[SnapshotSecret]:
+    """Read a snapshot's secrets in their original listing order, without values.
+
+    With ``project``, only keys under that project (deleted or not) are read,
+    using the key index instead of scanning the whole organization.
+    """
+    query = "SELECT id, key, project_id, revision_date, metadata FROM secrets"
+    params: list[str] = []
+    if project is not None:
+        # "/" + 1 is "0", so each range holds exactly the keys under a prefix
+        query += " WHERE (key >= ? AND key < ?) OR (key >= ? AND key < ?)"
+        for prefix in (project, mark_deleted(project)):
+            params += [f"{prefix}/", f"{prefix}0"]
+    query += " ORDER BY rowid"
+
+    connection = _connect(path)
+    try:
+        return [
+            SnapshotSecret(
+                secret_id,
+                key,
+                [project_id] if project_id else [],
+                revision_date,
+                json.loads(metadata) if metadata else {},
+            )
+            for secret_id, key, project_id, revision_date, metadata in connection.execute(
+                query, params
+            )
+        ]
+    finally:
+        connection.close()
+
+
+def load_snapshot_values(
+    path: Path, keys: list[str], settings: "Settings"
+) -> dict[str, SnapshotValue]:
+    """Read and decrypt the values of ``keys`` from a snapshot.
+
+    Keys that are not in the snapshot are left out of the result. Raises
+    ``SnapshotError`` when the snapshot was taken without ``--include-values``
+    or its values were encrypted with a different access token.
+    """
+    from cryptography.fernet import InvalidToken
+
+    from vaultuner.cache import get_fernet
+
+    connection = _connect(path)
+    try:
+        row = connection.execute(
+            "SELECT value FROM meta WHERE name = 'values'"
+        ).fetchone()
+        if row is None or row[0] != "encrypted":
+            raise SnapshotError(
+                f"Snapshot {path} has no values; take it with --include-values"
+            )
+        rows = {}
+        for key in dict.fromkeys(keys):
+            # Keys are not unique; the first one listed wins, as in the SDK listing
+            found = connection.execute(
+                "SELECT value, metadata FROM secrets WHERE key = ? ORDER BY rowid LIMIT 1",
+                (key,),
+            ).fetchone()
+            if found is not None:
+                rows[key] = found
+    finally:
+        connection.close()
+
+    fernet = get_fernet(settings)
+    values = {}
+    for key, (token, metadata) in rows.items():
+        try:
+            value = fernet.decrypt(token).decode()
+        except InvalidToken:
+            raise SnapshotError(
+                f"Snapshot {path} was taken with a different access token"
+            ) from None
+        values[key] = SnapshotValue(value, json.loads(metadata) if metadata else {})
+    return values
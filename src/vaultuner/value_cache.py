@@ -0,0 +1,116 @@
+# ABOUTME: Opt-in encrypted cache of secret values for get --value, with a per-secret TTL.
+# ABOUTME: Stale values can be served while a detached process fetches a fresh copy.
+
+import hashlib
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from vaultuner.cache import get_cache_dir, read_cache, write_cache
+
+if TYPE_CHECKING:
+    from vaultuner.config import Settings
+
+VALUES_CACHE = "values"
+# A revalidation that has not finished by then is assumed to have died
+REVALIDATION_TIMEOUT = 60
+
+
+class CachedValue(NamedTuple):
+    value: str
+    # Seconds since the value was fetched from Bitwarden
+    age: float
+    # Within value_cache_ttl; a stale value is only served while revalidating
+    fresh: bool
+
+
+def lookup_value(settings: "Settings", key: str) -> CachedValue | None:
+    """Return the cached value of a secret if it is fresh or still servable stale."""
+    if settings.value_cache_ttl <= 0:
+        return None
+    entry = (read_cache(VALUES_CACHE, settings) or {}).get(key)
+    if entry is None:
+        return None
+    value, fetched_at = entry
+    age = max(time.time() - fetched_at, 0.0)
+    if age < settings.value_cache_ttl:
+        return CachedValue(value, age, True)
+    if age < settings.value_cache_ttl + settings.value_cache_stale:
+        return CachedValue(value, age, False)
+    return None
+
+
+def store_value(settings: "Settings", key: str, value: str) -> None:
+    """Remember a secret's value, dropping entries too old to be served."""
+    if settings.value_cache_ttl <= 0:
+        return
+    now = time.time()
+    max_age = settings.value_cache_ttl + settings.value_cache_stale
+    entries = {
+        cached_key: entry
+        for cached_key, entry in (read_cache(VALUES_CACHE, settings) or {}).items()
+        if now - entry[1] < max_age
+    }
+    entries[key] = [value, now]
+    try:
+        write_cache(VALUES_CACHE, settings, entries)
+    except OSError:
+        # The cache is only an optimization; never fail a command over it
+        pass
+
+
+def clear_values() -> int:
+    """Delete cached values for every organization. Returns the number of files removed."""
+    removed = 0
+    for path in get_cache_dir().glob(f"{VALUES_CACHE}-*.bin"):
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+def revalidation_lock_path(key: str) -> Path:
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return get_cache_dir() / f"revalidate-{digest}.lock"
+
+
+def claim_revalidation(key: str) -> bool:
+    """Take the lock for refreshing one secret, so concurrent readers start one refresh."""
+    path = revalidation_lock_path(key)
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    try:
+        if time.time() - path.stat().st_mtime > REVALIDATION_TIMEOUT:
+            path.unlink(missing_ok=True)
+    except OSError:
+        pass
+    try:
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+    except FileExistsError:
+        return False
+    return True
+
+
+def release_revalidation(key: str) -> None:
+    revalidation_lock_path(key).unlink(missing_ok=True)
+
+
+def start_revalidation(key: str) -> None:
+    """Fetch a secret again in a detached process that refreshes the cache.
+
+    Nothing happens if another process is already refreshing the same secret.
+    """
+    if not claim_revalidation(key):
+        return
+    code = "from vaultuner.cli import app; app()"
+    try:
+        subprocess.Popen(
+            [sys.executable, "-c", code, "get", key, "--value", "--revalidate"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        release_revalidation(key)
@@ -0,0 +1,57 @@
+# ABOUTME: Shared pytest fixtures.
+# ABOUTME: Isolates vaultuner's caches per test and provides the fake Bitwarden backend.
+
+import pytest
+
+# (command, organization size, seconds, SDK calls) for each benchmark run
+BENCHMARK_RESULTS: list[tuple[str, int, float, dict[str, int]]] = []
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("VAULTUNER_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_project_ids(monkeypatch):
+    monkeypatch.setattr("vaultuner.client._project_ids", {})
+
+
+@pytest.fixture(autouse=True)
+def isolated_keyring_credentials(monkeypatch):
+    monkeypatch.setattr("vaultuner.config._keyring_credentials", None)
+
+
+@pytest.fixture
+def fake_bitwarden(monkeypatch):
+    """Serve every command from an in-memory organization instead of Bitwarden."""
+    from tests.fake_bitwarden import ORGANIZATION_ID, FakeBitwarden
+    from vaultuner.config import Settings
+
+    backend = FakeBitwarden()
+    settings = Settings(
+        access_token="fake-token", organization_id=ORGANIZATION_ID, rate_limit=0
+    )
+    monkeypatch.setattr("vaultuner.config._settings", settings)
+    monkeypatch.setattr("vaultuner.client._login", lambda settings: backend)
+    return backend
+
+
+@pytest.fixture
+def benchmark_results():
+    """Collects benchmark timings for the end-of-run report."""
+    return BENCHMARK_RESULTS
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not BENCHMARK_RESULTS:
+        return
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'command':<14}{'secrets':>9}{'ms':>10}  SDK calls")
+    for command, size, elapsed, calls in sorted(BENCHMARK_RESULTS):
+        counts = ", ".join(f"{name}={count}" for name, count in sorted(calls.items()))
+        terminalreporter.write_line(
+            f"{command:<14}{size:>9}{elapsed * 1000:>10.1f}  {counts}"
+        )
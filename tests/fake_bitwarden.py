@@ -0,0 +1,205 @@
+# ABOUTME: In-memory stand-in for BitwardenClient with per-call latency and call counts.
+# ABOUTME: Returns real SDK response objects so commands run end to end without a server.
+
+import builtins
+import time
+import uuid
+from collections import Counter
+from datetime import UTC, datetime
+
+from bitwarden_sdk.schemas import (
+    ProjectResponse,
+    ProjectsResponse,
+    ResponseForProjectResponse,
+    ResponseForProjectsResponse,
+    ResponseForSecretIdentifiersResponse,
+    ResponseForSecretResponse,
+    ResponseForSecretsDeleteResponse,
+    ResponseForSecretsResponse,
+    ResponseForSecretsSyncResponse,
+    SecretDeleteResponse,
+    SecretIdentifierResponse,
+    SecretIdentifiersResponse,
+    SecretResponse,
+    SecretsDeleteResponse,
+    SecretsResponse,
+    SecretsSyncResponse,
+)
+
+ORGANIZATION_ID = "00000000-0000-4000-8000-000000000001"
+
+
+class FakeBitwarden:
+    """An organization's secrets and projects, served like ``BitwardenClient``.
+
+    Every SDK call sleeps for ``latency`` seconds and is counted in ``calls``
+    as ``"secrets.list"``, ``"projects.create"`` and so on. Missing IDs raise
+    the same kind of plain exception as the real SDK.
+    """
+
+    def __init__(self, organization_id: str = ORGANIZATION_ID, latency: float = 0.0):
+        self.organization_id = uuid.UUID(organization_id)
+        self.latency = latency
+        self.calls: Counter[str] = Counter()
+        self.secrets_by_id: dict[uuid.UUID, SecretResponse] = {}
+        self.projects_by_id: dict[uuid.UUID, ProjectResponse] = {}
+        # Permanent deletes leave no revision date behind, but sync still sees them
+        self.last_deleted: datetime | None = None
+
+    def auth(self) -> "FakeAuth":
+        return FakeAuth()
+
+    def secrets(self) -> "FakeSecrets":
+        return FakeSecrets(self)
+
+    def projects(self) -> "FakeProjects":
+        return FakeProjects(self)
+
+    def call(self, name: str) -> None:
+        self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def add_project(self, name: str) -> ProjectResponse:
+        now = datetime.now(UTC)
+        project = ProjectResponse(now, uuid.uuid4(), name, self.organization_id, now)
+        self.projects_by_id[project.id] = project
+        return project
+
+    def add_secret(
+        self,
+        key: str,
+        value: str,
+        note: str = "",
+        project_id: uuid.UUID | None = None,
+    ) -> SecretResponse:
+        now = datetime.now(UTC)
+        secret = SecretResponse(
+            now, uuid.uuid4(), key, note, self.organization_id, now, value, project_id
+        )
+        self.secrets_by_id[secret.id] = secret
+        return secret
+
+    def populate(self, keys, project_name: str = "vaultuner") -> None:
+        """Add a secret for every key, all in one project."""
+        project = self.add_project(project_name)
+        for key in keys:
+            self.add_secret(key, f"value-of-{key}", project_id=project.id)
+
+    def keys(self) -> set[str]:
+        return {secret.key for secret in self.secrets_by_id.values()}
+
+    def secret(self, secret_id) -> SecretResponse:
+        try:
+            return self.secrets_by_id[uuid.UUID(str(secret_id))]
+        except (KeyError, ValueError):
+            raise Exception(f"404 Not Found: secret {secret_id}") from None
+
+
+class FakeAuth:
+    def login_access_token(self, access_token: str, state_file: str | None = None):
+        return None
+
+
+class FakeSecrets:
+    def __init__(self, backend: FakeBitwarden):
+        self.backend = backend
+
+    def get(self, id: str) -> ResponseForSecretResponse:
+        self.backend.call("secrets.get")
+        return ResponseForSecretResponse(True, self.backend.secret(id))
+
+    def get_by_ids(self, ids: builtins.list) -> ResponseForSecretsResponse:
+        self.backend.call("secrets.get_by_ids")
+        secrets = [self.backend.secret(secret_id) for secret_id in ids]
+        return ResponseForSecretsResponse(True, SecretsResponse(secrets))
+
+    def list(self, organization_id: str) -> ResponseForSecretIdentifiersResponse:
+        self.backend.call("secrets.list")
+        identifiers = [
+            SecretIdentifierResponse(
+                secret.id,
+                secret.key,
+                secret.organization_id,
+                [secret.project_id] if secret.project_id else [],
+            )
+            for secret in self.backend.secrets_by_id.values()
+        ]
+        return ResponseForSecretIdentifiersResponse(
+            True, SecretIdentifiersResponse(identifiers)
+        )
+
+    def create(
+        self,
+        organization_id: str,
+        key: str,
+        value: str,
+        note: str | None,
+        project_ids: builtins.list | None = None,
+    ) -> ResponseForSecretResponse:
+        self.backend.call("secrets.create")
+        project_id = None
+        if project_ids:
+            project_id = uuid.UUID(str(project_ids[0]))
+            if project_id not in self.backend.projects_by_id:
+                raise Exception(f"404 Not Found: project {project_id}")
+        secret = self.backend.add_secret(key, value, note or "", project_id)
+        return ResponseForSecretResponse(True, secret)
+
+    def update(
+        self,
+        organization_id: str,
+        id: str,
+        key: str,
+        value: str,
+        note: str | None,
+        project_ids: builtins.list | None = None,
+    ) -> ResponseForSecretResponse:
+        self.backend.call("secrets.update")
+        secret = self.backend.secret(id)
+        secret.key = key
+        secret.value = value
+        secret.note = note or ""
+        if project_ids:
+            secret.project_id = uuid.UUID(str(project_ids[0]))
+        secret.revision_date = datetime.now(UTC)
+        return ResponseForSecretResponse(True, secret)
+
+    def delete(self, ids: builtins.list) -> ResponseForSecretsDeleteResponse:
+        self.backend.call("secrets.delete")
+        deleted = []
+        for secret_id in ids:
+            secret = self.backend.secret(secret_id)
+            del self.backend.secrets_by_id[secret.id]
+            deleted.append(SecretDeleteResponse(secret.id))
+        self.backend.last_deleted = datetime.now(UTC)
+        return ResponseForSecretsDeleteResponse(True, SecretsDeleteResponse(deleted))
+
+    def sync(
+        self, organization_id: str, last_synced_date: datetime | None
+    ) -> ResponseForSecretsSyncResponse:
+        self.backend.call("secrets.sync")
+        secrets = list(self.backend.secrets_by_id.values())
+        last_deleted = self.backend.last_deleted
+        has_changes = (
+            last_synced_date is None
+            or any(secret.revision_date > last_synced_date for secret in secrets)
+            or (last_deleted is not None and last_deleted > last_synced_date)
+        )
+        return ResponseForSecretsSyncResponse(
+            True, SecretsSyncResponse(has_changes, secrets if has_changes else None)
+        )
+
+
+class FakeProjects:
+    def __init__(self, backend: FakeBitwarden):
+        self.backend = backend
+
+    def list(self, organization_id: str) -> ResponseForProjectsResponse:
+        self.backend.call("projects.list")
+        projects = list(self.backend.projects_by_id.values())
+        return ResponseForProjectsResponse(True, ProjectsResponse(projects))
+
+    def create(self, organization_id: str, name: str) -> ResponseForProjectResponse:
+        self.backend.call("projects.create")
+        return ResponseForProjectResponse(True, self.backend.add_project(name))
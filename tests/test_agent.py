@@ -0,0 +1,294 @@
+# ABOUTME: Tests for the agent module.
+# ABOUTME: Tests the in-memory secret cache and the Unix socket protocol end to end.
+
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from bitwarden_sdk.schemas import (
+    ResponseForProjectsResponse,
+    ResponseForSecretIdentifiersResponse,
+    ResponseForSecretsResponse,
+)
+
+from vaultuner.agent import (
+    AgentServer,
+    SecretCache,
+    agent_request,
+    connect_agent,
+    invalidate_agent,
+    ping_agent,
+)
+
+ORG_ID = "3fa85f64-5717-4562-b3fc-2c963f66afa6"
+SECRETS = {
+    "11111111-1111-1111-1111-111111111111": ("myproject/api-key", "api-value"),
+    "22222222-2222-2222-2222-222222222222": ("myproject/prod/db-pass", "db-value"),
+}
+
+
+def make_client() -> MagicMock:
+    """A client returning real SDK response objects for SECRETS."""
+    client = MagicMock()
+    client.secrets().list.return_value = ResponseForSecretIdentifiersResponse.from_dict(
+        {
+            "success": True,
+            "data": {
+                "data": [
+                    {"id": i, "key": key, "organizationId": ORG_ID, "projectIds": []}
+                    for i, (key, _) in SECRETS.items()
+                ]
+            },
+        }
+    )
+
+    def get_by_ids(ids):
+        return ResponseForSecretsResponse.from_dict(
+            {
+                "success": True,
+                "data": {
+                    "data": [
+                        {
+                            "id": i,
+                            "key": SECRETS[i][0],
+                            "value": SECRETS[i][1],
+                            "note": "",
+                            "organizationId": ORG_ID,
+                            "creationDate": "2026-01-01T00:00:00+00:00",
+                            "revisionDate": "2026-01-01T00:00:00+00:00",
+                        }
+                        for i in ids
+                        if i in SECRETS
+                    ]
+                },
+            }
+        )
+
+    client.secrets().get_by_ids.side_effect = get_by_ids
+    client.projects().list.return_value = ResponseForProjectsResponse.from_dict(
+        {
+            "success": True,
+            "data": {
+                "data": [
+                    {
+                        "id": "44444444-4444-4444-4444-444444444444",
+                        "name": "myproject",
+                        "organizationId": ORG_ID,
+                        "creationDate": "2026-01-01T00:00:00+00:00",
+                        "revisionDate": "2026-01-01T00:00:00+00:00",
+                    }
+                ]
+            },
+        }
+    )
+    return client
+
+
+@pytest.fixture
+def socket_path(monkeypatch):
+    # Unix socket paths are length-limited, so keep this one short
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "agent.sock"
+        monkeypatch.setenv("VAULTUNER_AGENT_SOCKET", str(path))
+        yield path
+
+
+@pytest.fixture
+def running_agent(socket_path):
+    client = make_client()
+    server = AgentServer(socket_path, SecretCache(client, ORG_ID))
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield client
+    server.shutdown()
+    server.server_close()
+
+
+class TestSecretCache:
+    def test_caches_listing(self):
+        client = make_client()
+        cache = SecretCache(client, ORG_ID)
+
+        first = cache.list()
+        second = cache.list()
+
+        assert first == second
+        client.secrets().list.assert_called_once_with(ORG_ID)
+
+    def test_fetches_only_missing_secrets(self):
+        client = make_client()
+        cache = SecretCache(client, ORG_ID)
+        ids = list(SECRETS)
+
+        cache.get_by_ids(ids[:1])
+        result = cache.get_by_ids(ids)
+
+        assert [s["value"] for s in result] == ["api-value", "db-value"]
+        calls = [c.args[0] for c in client.secrets().get_by_ids.call_args_list]
+        assert calls == [ids[:1], ids[1:]]
+
+    def test_invalidate_refetches(self):
+        client = make_client()
+        cache = SecretCache(client, ORG_ID)
+
+        cache.list()
+        cache.invalidate()
+        cache.list()
+
+        assert client.secrets().list.call_count == 2
+
+    def test_expired_entries_are_refetched(self):
+        client = make_client()
+        cache = SecretCache(client, ORG_ID, ttl=60)
+
+        with patch("vaultuner.agent.time.monotonic", return_value=1000.0):
+            cache.list()
+        with patch("vaultuner.agent.time.monotonic", return_value=1061.0):
+            cache.list()
+
+        assert client.secrets().list.call_count == 2
+
+    @staticmethod
+    def block_listing(client) -> tuple[threading.Event, threading.Event]:
+        """Make the next listing wait; returns (started, release) events."""
+        started, release = threading.Event(), threading.Event()
+        listing = client.secrets().list.return_value
+
+        def slow_list(organization_id):
+            started.set()
+            release.wait(5)
+            return listing
+
+        client.secrets().list.side_effect = slow_list
+        return started, release
+
+    def test_cache_hits_do_not_wait_for_fetches(self):
+        client = make_client()
+        cache = SecretCache(client, ORG_ID)
+        ids = list(SECRETS)
+        cache.get_by_ids(ids)
+        started, release = self.block_listing(client)
+
+        results = []
+        listing = threading.Thread(target=cache.list)
+        listing.start()
+        assert started.wait(5)
+        hit = threading.Thread(target=lambda: results.append(cache.get_by_ids(ids)))
+        hit.start()
+        hit.join(1)
+        answered = not hit.is_alive()
+        release.set()
+        listing.join(5)
+        hit.join(5)
+
+        assert answered
+        assert [s["value"] for s in results[0]] == ["api-value", "db-value"]
+
+    def test_concurrent_misses_share_one_fetch(self):
+        client = make_client()
+        cache = SecretCache(client, ORG_ID)
+        started, release = self.block_listing(client)
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.list()))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        assert started.wait(5)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(results) == 4
+        assert client.secrets().list.call_count == 1
+
+    def test_failed_fetch_is_retried(self):
+        client = make_client()
+        cache = SecretCache(client, ORG_ID)
+        client.secrets().list.side_effect = Exception("500 Internal Server Error")
+
+        with pytest.raises(Exception, match="500"):
+            cache.list()
+        client.secrets().list.side_effect = None
+        assert cache.list() == cache.list()
+        assert client.secrets().list.call_count == 2
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    from vaultuner.config import Settings
+
+    settings = Settings(access_token="token", organization_id=ORG_ID)
+    monkeypatch.setattr("vaultuner.config._settings", settings)
+    return settings
+
+
+class TestAgentProtocol:
+    def test_no_agent(self, socket_path):
+        assert agent_request({"op": "ping"}) is None
+        assert connect_agent() is None
+
+    def test_stale_socket_file(self, socket_path):
+        socket_path.write_text("")
+        assert connect_agent() is None
+
+    def test_ping_reports_organization(self, running_agent):
+        response = ping_agent()
+        assert response["organization_id"] == ORG_ID
+        assert response["pid"] > 0
+
+    def test_other_organization_is_ignored(self, running_agent, monkeypatch):
+        from vaultuner.config import Settings
+
+        other = Settings(access_token="token", organization_id="other-org")
+        monkeypatch.setattr("vaultuner.config._settings", other)
+
+        assert ping_agent() is not None
+        assert connect_agent() is None
+
+    def test_list_and_get(self, running_agent):
+        client = connect_agent()
+        assert client is not None
+
+        listing = client.secrets().list(ORG_ID)
+        keys = [s.key for s in listing.data.data]
+        assert keys == ["myproject/api-key", "myproject/prod/db-pass"]
+
+        secret_id = str(listing.data.data[1].id)
+        response = client.secrets().get(secret_id)
+        assert response.data.key == "myproject/prod/db-pass"
+        assert response.data.value == "db-value"
+
+    def test_get_by_ids(self, running_agent):
+        client = connect_agent()
+        response = client.secrets().get_by_ids(list(SECRETS))
+        assert [s.value for s in response.data.data] == ["api-value", "db-value"]
+
+    def test_get_missing_secret_raises(self, running_agent):
+        client = connect_agent()
+        with pytest.raises(Exception, match="not found"):
+            client.secrets().get("33333333-3333-3333-3333-333333333333")
+
+    def test_list_projects(self, running_agent):
+        client = connect_agent()
+        client.projects().list(ORG_ID)
+        response = client.projects().list(ORG_ID)
+        assert [p.name for p in response.data.data] == ["myproject"]
+        assert running_agent.projects().list.call_count == 1
+
+    def test_invalidate(self, running_agent):
+        client = connect_agent()
+        client.secrets().list(ORG_ID)
+        invalidate_agent()
+        client.secrets().list(ORG_ID)
+        assert running_agent.secrets().list.call_count == 2
+
+    def test_unknown_operation(self, running_agent):
+        response = agent_request({"op": "nope"})
+        assert response == {"ok": False, "error": "Unknown operation: nope"}
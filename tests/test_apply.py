@@ -0,0 +1,148 @@
+# ABOUTME: Tests for the apply module.
+# ABOUTME: Tests manifest loading and diffing manifests against existing secrets.
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from vaultuner.apply import ManifestEntry, PlannedWrite, load_manifest, plan_apply
+
+
+class TestLoadManifest:
+    def test_yaml_values_and_specs(self, tmp_path):
+        manifest = tmp_path / "secrets.yaml"
+        manifest.write_text(
+            "myapp/api-key: abc\n"
+            "myapp/prod/db-url:\n"
+            "  value: postgres://x\n"
+            "  description: Primary database\n"
+            "  note: Rotated quarterly\n"
+            "myapp/port: 8080\n"
+        )
+
+        assert load_manifest(manifest) == [
+            ManifestEntry("myapp/api-key", "abc"),
+            ManifestEntry(
+                "myapp/prod/db-url", "postgres://x", "Primary database", "Rotated quarterly"
+            ),
+            ManifestEntry("myapp/port", "8080"),
+        ]
+
+    def test_json(self, tmp_path):
+        manifest = tmp_path / "secrets.json"
+        manifest.write_text('{"myapp/api-key": {"description": "Key"}}')
+
+        assert load_manifest(manifest) == [
+            ManifestEntry("myapp/api-key", None, "Key", None)
+        ]
+
+    def test_scalars_keep_their_text(self, tmp_path):
+        manifest = tmp_path / "secrets.yaml"
+        manifest.write_text(
+            "myapp/flag: yes\n"
+            "myapp/enabled: true\n"
+            "myapp/port: 0123\n"
+            "myapp/ratio: 1.50\n"
+            "myapp/hex: 0x1F\n"
+            "myapp/expires: 2026-01-01\n"
+            "myapp/rotated:\n"
+            "  value: abc\n"
+            "  description: 2025-12-31\n"
+        )
+
+        assert load_manifest(manifest) == [
+            ManifestEntry("myapp/flag", "yes"),
+            ManifestEntry("myapp/enabled", "true"),
+            ManifestEntry("myapp/port", "0123"),
+            ManifestEntry("myapp/ratio", "1.50"),
+            ManifestEntry("myapp/hex", "0x1F"),
+            ManifestEntry("myapp/expires", "2026-01-01"),
+            ManifestEntry("myapp/rotated", "abc", "2025-12-31"),
+        ]
+
+    def test_null_means_not_given(self, tmp_path):
+        manifest = tmp_path / "secrets.yaml"
+        manifest.write_text("myapp/api-key:\n  value: ~\n  description: Key\n")
+
+        assert load_manifest(manifest) == [
+            ManifestEntry("myapp/api-key", None, "Key", None)
+        ]
+
+    def test_rejects_non_string_values(self, tmp_path):
+        manifest = tmp_path / "secrets.yaml"
+        manifest.write_text("myapp/hosts: [a, b]\n")
+        with pytest.raises(ValueError, match="Invalid value for myapp/hosts"):
+            load_manifest(manifest)
+
+    def test_empty(self, tmp_path):
+        manifest = tmp_path / "secrets.yaml"
+        manifest.write_text("")
+        assert load_manifest(manifest) == []
+
+    def test_rejects_non_mapping(self, tmp_path):
+        manifest = tmp_path / "secrets.yaml"
+        manifest.write_text("- myapp/api-key\n")
+        with pytest.raises(ValueError, match="expected a mapping"):
+            load_manifest(manifest)
+
+    def test_rejects_invalid_path(self, tmp_path):
+        manifest = tmp_path / "secrets.yaml"
+        manifest.write_text("api-key: abc\n")
+        with pytest.raises(ValueError, match="Invalid path"):
+            load_manifest(manifest)
+
+    def test_rejects_unknown_fields(self, tmp_path):
+        manifest = tmp_path / "secrets.yaml"
+        manifest.write_text("myapp/api-key:\n  valeu: abc\n")
+        with pytest.raises(ValueError, match="Unknown fields for myapp/api-key: valeu"):
+            load_manifest(manifest)
+
+
+class TestPlanApply:
+    def test_creates_new_secrets_with_metadata(self):
+        writes, unchanged = plan_apply(
+            [ManifestEntry("myapp/api-key", "abc", "API key")], {}
+        )
+        assert writes == [
+            PlannedWrite("myapp/api-key", "abc", "---\ndescription: API key\n---")
+        ]
+        assert unchanged == []
+
+    def test_new_secret_requires_value(self):
+        with pytest.raises(ValueError, match="No value given for new secret"):
+            plan_apply([ManifestEntry("myapp/api-key", description="x")], {})
+
+    def test_updates_changed_value_and_keeps_note(self):
+        existing = {
+            "myapp/api-key": MagicMock(id="id-1", value="old", note="Rotated quarterly")
+        }
+        writes, _ = plan_apply([ManifestEntry("myapp/api-key", "new")], existing)
+        assert writes == [
+            PlannedWrite("myapp/api-key", "new", "Rotated quarterly", "id-1")
+        ]
+
+    def test_metadata_only_update_keeps_value(self):
+        existing = {"myapp/api-key": MagicMock(id="id-1", value="abc", note="")}
+        writes, _ = plan_apply(
+            [ManifestEntry("myapp/api-key", description="API key")], existing
+        )
+        assert writes == [
+            PlannedWrite("myapp/api-key", "abc", "---\ndescription: API key\n---", "id-1")
+        ]
+
+    def test_unchanged_secrets_are_skipped(self):
+        existing = {
+            "myapp/api-key": MagicMock(id="id-1", value="abc", note=""),
+            "myapp/token": MagicMock(
+                id="id-2", value="xyz", note="---\ndescription: Token\n---"
+            ),
+        }
+        writes, unchanged = plan_apply(
+            [
+                ManifestEntry("myapp/api-key", "abc"),
+                ManifestEntry("myapp/token", "xyz", "Token"),
+            ],
+            existing,
+        )
+        assert writes == []
+        assert unchanged == ["myapp/api-key", "myapp/token"]
@@ -0,0 +1,78 @@
+# ABOUTME: Benchmarks CLI commands end to end against fake organizations of growing size.
+# ABOUTME: Fails when a command makes more SDK calls than expected; large orgs are opt-in.
+
+import os
+import time
+
+import pytest
+from typer.testing import CliRunner
+
+from vaultuner.cli import app
+
+runner = CliRunner()
+
+# Organizations of 10k and 100k secrets take a while to list and render
+LARGE = pytest.mark.skipif(
+    not os.environ.get("VAULTUNER_BENCHMARK"),
+    reason="set VAULTUNER_BENCHMARK=1 to benchmark large organizations",
+)
+ORG_SIZES = [100, pytest.param(10_000, marks=LARGE), pytest.param(100_000, marks=LARGE)]
+
+# Secrets in myapp/prod; the rest of the organization is spread over other projects
+PROJECT_SIZE = 50
+
+
+def populate(backend, size: int) -> None:
+    filler = [f"app-{i // 100}/secret-{i}" for i in range(size - PROJECT_SIZE)]
+    backend.populate(filler + [f"myapp/prod/key-{i}" for i in range(PROJECT_SIZE)])
+
+
+def import_file(tmp_path):
+    path = tmp_path / "import.env"
+    path.write_text("".join(f"VAR_{i}=value-{i}\n" for i in range(20)))
+    return path
+
+
+# (command arguments, SDK calls it may make regardless of organization size)
+COMMANDS = {
+    "list": (["list"], {"secrets.list": 1}),
+    "list-project": (["list", "-p", "myapp"], {"secrets.list": 1}),
+    "list-tsv": (["list", "--format", "tsv"], {"secrets.list": 1}),
+    "projects": (["projects"], {"secrets.list": 1}),
+    "get": (["get", "myapp/prod/key-1", "-v"], {"secrets.list": 1, "secrets.get": 1}),
+    "set-create": (
+        ["set", "myapp/prod/new-key", "new-value"],
+        {"secrets.list": 1, "projects.list": 1, "secrets.create": 1},
+    ),
+    "set-update": (
+        ["set", "myapp/prod/key-2", "changed"],
+        {"secrets.list": 1, "secrets.get": 1, "secrets.update": 1},
+    ),
+    "export": (
+        ["export", "-p", "myapp", "-e", "prod", "-o", "{tmp}/.env"],
+        {"secrets.list": 1, "secrets.get_by_ids": 1},
+    ),
+    "import": (
+        ["import", "-p", "newapp", "-i", "{import}", "-y"],
+        {"secrets.list": 1, "projects.list": 1, "secrets.create": 20},
+    ),
+}
+
+
+@pytest.mark.parametrize("size", ORG_SIZES)
+@pytest.mark.parametrize("command", list(COMMANDS))
+def test_command(command, size, fake_bitwarden, benchmark_results, tmp_path):
+    args, expected_calls = COMMANDS[command]
+    args = [
+        arg.format(tmp=tmp_path, **{"import": import_file(tmp_path)}) for arg in args
+    ]
+    populate(fake_bitwarden, size)
+    fake_bitwarden.calls.clear()
+
+    start = time.perf_counter()
+    result = runner.invoke(app, args)
+    elapsed = time.perf_counter() - start
+
+    assert result.exit_code == 0, result.output
+    benchmark_results.append((command, size, elapsed, dict(fake_bitwarden.calls)))
+    assert dict(fake_bitwarden.calls) == expected_calls
@@ -0,0 +1,79 @@
+# ABOUTME: Tests for the cache module.
+# ABOUTME: Tests encrypted cache storage, expiry, and the key index.
+
+import stat
+import time
+from unittest.mock import patch
+
+from vaultuner.cache import (
+    cache_path,
+    get_cache_dir,
+    load_key_index,
+    read_cache,
+    save_key_index,
+    write_cache,
+)
+from vaultuner.config import Settings
+
+
+def make_settings(**overrides) -> Settings:
+    values = {"access_token": "token", "organization_id": "org-123"}
+    values.update(overrides)
+    return Settings(**values)
+
+
+class TestGetCacheDir:
+    def test_uses_override(self, isolated_cache_dir):
+        assert get_cache_dir() == isolated_cache_dir
+
+    def test_uses_xdg_cache_home(self, monkeypatch, tmp_path):
+        monkeypatch.delenv("VAULTUNER_CACHE_DIR")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert get_cache_dir() == tmp_path / "vaultuner"
+
+
+class TestReadWriteCache:
+    def test_round_trip(self):
+        settings = make_settings()
+        write_cache("test", settings, {"a": "1"})
+        assert read_cache("test", settings) == {"a": "1"}
+
+    def test_missing_entry(self):
+        assert read_cache("test", make_settings()) is None
+
+    def test_file_is_encrypted_and_private(self):
+        settings = make_settings()
+        write_cache("test", settings, {"myproject/api-key": "secret-id"})
+
+        path = cache_path("test", settings)
+        assert b"myproject/api-key" not in path.read_bytes()
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    def test_other_token_cannot_read(self):
+        write_cache("test", make_settings(), {"a": "1"})
+        assert read_cache("test", make_settings(access_token="other")) is None
+
+    def test_entries_are_per_organization(self):
+        write_cache("test", make_settings(), {"a": "1"})
+        assert read_cache("test", make_settings(organization_id="org-456")) is None
+
+    def test_expired_entry(self):
+        settings = make_settings()
+        write_cache("test", settings, {"a": "1"})
+
+        with patch("time.time", return_value=time.time() + 120):
+            assert read_cache("test", settings, max_age=60) is None
+            assert read_cache("test", settings, max_age=600) == {"a": "1"}
+
+
+class TestKeyIndex:
+    def test_round_trip(self):
+        settings = make_settings()
+        save_key_index(settings, {"myproject/api-key": "secret-id"})
+        assert load_key_index(settings) == {"myproject/api-key": "secret-id"}
+
+    def test_disabled_with_zero_ttl(self):
+        settings = make_settings(index_ttl=0)
+        save_key_index(settings, {"myproject/api-key": "secret-id"})
+        assert load_key_index(settings) is None
+        assert not cache_path("index", settings).exists()
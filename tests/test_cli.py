@@ -1,16 +1,16 @@
 # ABOUTME: Tests for the CLI module.
 # ABOUTME: Tests helper functions and CLI commands.
 
+import json
 from unittest.mock import MagicMock, patch
 
+import pytest
 from typer.testing import CliRunner
 
-from vaultuner.cli import (
-    app,
-    is_deleted,
-    mark_deleted,
-    unmark_deleted,
-)
+from vaultuner.cli import KEYRING_MAP, app, format_age
+from vaultuner.client import RetryingClient
+from vaultuner.config import KeyringCredentials
+from vaultuner.models import is_deleted, mark_deleted, unmark_deleted
 
 runner = CliRunner()
 
@@ -42,14 +42,14 @@ class TestUnmarkDeleted:
 
 
 class TestConfigSet:
-    @patch("vaultuner.cli.set_keyring_value")
+    @patch("vaultuner.config.set_keyring_value")
     def test_stores_access_token(self, mock_set):
         result = runner.invoke(app, ["config", "set", "access-token", "my-token"])
         assert result.exit_code == 0
         mock_set.assert_called_once_with("bws_access_token", "my-token")
         assert "Stored" in result.stdout
 
-    @patch("vaultuner.cli.set_keyring_value")
+    @patch("vaultuner.config.set_keyring_value")
     def test_stores_organization_id(self, mock_set):
         result = runner.invoke(app, ["config", "set", "organization-id", "org-123"])
         assert result.exit_code == 0
@@ -57,45 +57,44 @@ class TestConfigSet:
 
 
 class TestConfigShow:
-    @patch("vaultuner.cli.get_keyring_value")
-    def test_shows_configured(self, mock_get):
-        mock_get.side_effect = (
-            lambda key: "value" if key == "bws_access_token" else "org-123"
+    @patch("vaultuner.config.load_keyring_credentials")
+    def test_shows_configured(self, mock_load):
+        mock_load.return_value = KeyringCredentials(
+            True, {"access_token": "value", "organization_id": "org-123"}
         )
         result = runner.invoke(app, ["config", "show"])
         assert result.exit_code == 0
         assert "configured" in result.stdout
 
-    @patch("vaultuner.cli.get_keyring_value")
-    def test_shows_not_set(self, mock_get):
-        mock_get.return_value = None
+    @patch("vaultuner.config.load_keyring_credentials")
+    def test_shows_not_set(self, mock_load):
+        mock_load.return_value = KeyringCredentials(True, {})
         result = runner.invoke(app, ["config", "show"])
         assert result.exit_code == 0
         assert "not set" in result.stdout
 
-    @patch("vaultuner.cli.get_keyring_value")
+    @patch("vaultuner.config.sys.platform", "darwin")
+    @patch("keyring.get_password")
     def test_uses_correct_keyring_keys(self, mock_get):
         """Verify config show uses the same keyring keys as config set."""
         mock_get.return_value = None
         runner.invoke(app, ["config", "show"])
-        # Should use keys from KEYRING_MAP (bws_access_token, bws_organization_id)
-        called_keys = [call.args[0] for call in mock_get.call_args_list]
-        assert "bws_access_token" in called_keys
-        assert "bws_organization_id" in called_keys
+        called_keys = [call.args[1] for call in mock_get.call_args_list]
+        assert sorted(called_keys) == sorted(KEYRING_MAP.values())
 
-    @patch("vaultuner.cli.get_keyring_value")
-    def test_hides_org_id_value(self, mock_get):
+    @patch("vaultuner.config.load_keyring_credentials")
+    def test_hides_org_id_value(self, mock_load):
         """Org ID should show 'configured' not the actual value."""
-        mock_get.return_value = "some-org-uuid-12345"
+        mock_load.return_value = KeyringCredentials(
+            True, {"organization_id": "some-org-uuid-12345"}
+        )
         result = runner.invoke(app, ["config", "show"])
         assert "some-org-uuid-12345" not in result.stdout
         assert "configured" in result.stdout
 
-    @patch("vaultuner.cli.is_keyring_accessible")
-    @patch("vaultuner.cli.get_keyring_value")
-    def test_warns_when_keyring_inaccessible(self, mock_get, mock_accessible):
-        mock_accessible.return_value = False
-        mock_get.return_value = None
+    @patch("vaultuner.config.load_keyring_credentials")
+    def test_warns_when_keyring_inaccessible(self, mock_load):
+        mock_load.return_value = KeyringCredentials(False, {})
         result = runner.invoke(app, ["config", "show"])
         assert result.exit_code == 0
         assert "keychain is not accessible" in result.stdout.lower()
@@ -103,7 +102,7 @@ class TestConfigShow:
 
 
 class TestConfigDelete:
-    @patch("vaultuner.cli.delete_keyring_value")
+    @patch("vaultuner.config.delete_keyring_value")
     def test_deletes_key(self, mock_delete):
         result = runner.invoke(app, ["config", "delete", "access-token"])
         assert result.exit_code == 0
@@ -111,9 +110,67 @@ class TestConfigDelete:
         assert "Deleted" in result.stdout
 
 
+class TestFormatAge:
+    def test_seconds(self):
+        assert format_age(42.7) == "42s"
+
+    def test_minutes(self):
+        assert format_age(125) == "2m 5s"
+
+    def test_hours(self):
+        assert format_age(3 * 3600 + 120) == "3h 2m"
+
+    def test_days(self):
+        assert format_age(2 * 86400 + 3600) == "2d 1h"
+
+
+class TestAuth:
+    @patch("vaultuner.config.get_settings")
+    def test_status_without_session(self, mock_settings):
+        from vaultuner.config import Settings
+
+        mock_settings.return_value = Settings(
+            access_token="token", organization_id="org-123"
+        )
+
+        result = runner.invoke(app, ["auth", "status"])
+        assert result.exit_code == 0
+        assert "disabled" in result.stdout
+        assert "none" in result.stdout
+
+    @patch("vaultuner.config.get_settings")
+    def test_status_shows_session_age(self, mock_settings):
+        from vaultuner.client import session_state_path
+        from vaultuner.config import Settings
+
+        settings = Settings(
+            access_token="token", organization_id="org-123", persist_session=True
+        )
+        mock_settings.return_value = settings
+        state_path = session_state_path(settings)
+        state_path.parent.mkdir(parents=True)
+        state_path.write_text("{}")
+
+        result = runner.invoke(app, ["auth", "status"])
+        assert result.exit_code == 0
+        assert "enabled" in result.stdout
+        assert "age" in result.stdout
+
+    def test_clear_removes_sessions(self, isolated_cache_dir):
+        isolated_cache_dir.mkdir()
+        (isolated_cache_dir / "session-abc.json").write_text("{}")
+        (isolated_cache_dir / "index-abc.bin").write_text("")
+
+        result = runner.invoke(app, ["auth", "clear"])
+        assert result.exit_code == 0
+        assert "1 session" in result.stdout
+        assert not (isolated_cache_dir / "session-abc.json").exists()
+        assert (isolated_cache_dir / "index-abc.bin").exists()
+
+
 class TestListSecrets:
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_lists_secrets(self, mock_settings, mock_client):
         mock_settings.return_value = MagicMock(organization_id="org-123")
 
@@ -128,8 +185,8 @@ class TestListSecrets:
         assert "prod" in result.stdout
         assert "api-key" in result.stdout
 
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_filters_by_project(self, mock_settings, mock_client):
         mock_settings.return_value = MagicMock(organization_id="org-123")
 
@@ -146,8 +203,8 @@ class TestListSecrets:
         assert "myproject" in result.stdout
         assert "other" not in result.stdout
 
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_filters_by_scoped_project(self, mock_settings, mock_client):
         mock_settings.return_value = MagicMock(organization_id="org-123")
 
@@ -167,8 +224,8 @@ class TestListSecrets:
         assert "@dpoblador/vaultuner" in result.stdout
         assert "myproject" not in result.stdout
 
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_empty_response(self, mock_settings, mock_client):
         mock_settings.return_value = MagicMock(organization_id="org-123")
         client = MagicMock()
@@ -179,10 +236,110 @@ class TestListSecrets:
         assert result.exit_code == 0
         assert "No secrets found" in result.stdout
 
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_tsv_format(self, mock_settings, mock_client):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        secrets = [
+            MagicMock(key="myproject/prod/api-key"),
+            MagicMock(key="myproject/token"),
+            MagicMock(key="_deleted_/myproject/old"),
+            MagicMock(key="other/api-key"),
+        ]
+        client = MagicMock()
+        client.secrets().list.return_value = MagicMock(data=MagicMock(data=secrets))
+        mock_client.return_value = client
+
+        result = runner.invoke(app, ["list", "-p", "myproject", "--format", "tsv"])
+        assert result.exit_code == 0
+        assert result.stdout.splitlines() == [
+            "myproject\tprod\tapi-key",
+            "myproject\t-\ttoken",
+        ]
+
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_jsonl_format_with_deleted(self, mock_settings, mock_client):
+        import json
+
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        secrets = [
+            MagicMock(key="myproject/prod/api-key"),
+            MagicMock(key="_deleted_/myproject/old"),
+        ]
+        client = MagicMock()
+        client.secrets().list.return_value = MagicMock(data=MagicMock(data=secrets))
+        mock_client.return_value = client
+
+        result = runner.invoke(app, ["list", "-d", "--format", "jsonl"])
+        assert result.exit_code == 0
+        assert [json.loads(line) for line in result.stdout.splitlines()] == [
+            {
+                "key": "myproject/prod/api-key",
+                "project": "myproject",
+                "env": "prod",
+                "name": "api-key",
+                "deleted": False,
+            },
+            {
+                "key": "myproject/old",
+                "project": "myproject",
+                "env": None,
+                "name": "old",
+                "deleted": True,
+            },
+        ]
+
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_streaming_formats_print_nothing_when_empty(
+        self, mock_settings, mock_client
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        client = MagicMock()
+        client.secrets().list.return_value = MagicMock(data=None)
+        mock_client.return_value = client
+
+        result = runner.invoke(app, ["list", "--format", "jsonl"])
+        assert result.exit_code == 0
+        assert result.stdout == ""
+
+    def test_project_mode_keeps_unmigrated_secrets(
+        self, fake_bitwarden, monkeypatch, tmp_path
+    ):
+        from vaultuner import config
+
+        fake_bitwarden.populate(["myapp/prod/a", "myapp/prod/b"])
+        settings = config._settings.model_copy(update={"project_mode": "project"})
+        monkeypatch.setattr("vaultuner.config._settings", settings)
+
+        # Creates the "myapp" Bitwarden project, while a and b stay in "vaultuner"
+        result = runner.invoke(app, ["set", "myapp/prod/c", "cc"])
+        assert result.exit_code == 0, result.output
+
+        result = runner.invoke(app, ["list", "-p", "myapp", "--format", "tsv"])
+        assert result.exit_code == 0, result.output
+        assert [line.split("\t")[2] for line in result.stdout.splitlines()] == [
+            "a",
+            "b",
+            "c",
+        ]
+
+        env_file = tmp_path / ".env"
+        result = runner.invoke(
+            app, ["export", "-p", "myapp", "-e", "prod", "-o", str(env_file)]
+        )
+        assert result.exit_code == 0, result.output
+        assert {line.split("=")[0] for line in env_file.read_text().splitlines()} == {
+            "A",
+            "B",
+            "C",
+        }
+
 
 class TestGetSecret:
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.client.find_secret_by_key")
     def test_get_secret(self, mock_find, mock_client):
         mock_find.return_value = {"id": "secret-id", "key": "myproject/api-key"}
         client = MagicMock()
@@ -195,9 +352,15 @@ class TestGetSecret:
         assert result.exit_code == 0
         assert "secret-value" in result.stdout
 
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.find_secret_by_key")
-    def test_get_value_only(self, mock_find, mock_client):
+    @patch("vaultuner.config.get_settings")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.client.find_secret_by_key")
+    def test_get_value_only(self, mock_find, mock_client, mock_settings):
+        from vaultuner.config import Settings
+
+        mock_settings.return_value = Settings(
+            access_token="token", organization_id="org-123"
+        )
         mock_find.return_value = {"id": "secret-id", "key": "myproject/api-key"}
         client = MagicMock()
         client.secrets().get.return_value = MagicMock(
@@ -209,8 +372,8 @@ class TestGetSecret:
         assert result.exit_code == 0
         assert result.stdout.strip() == "secret-value"
 
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.client.find_secret_by_key")
     def test_get_not_found(self, mock_find, mock_client):
         mock_find.return_value = None
         mock_client.return_value = MagicMock()
@@ -219,12 +382,178 @@ class TestGetSecret:
         assert result.exit_code == 1
         assert "not found" in result.output
 
+    @patch("vaultuner.config.get_settings")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.client.find_secret_by_key")
+    def test_stale_index_entry_is_refreshed(
+        self, mock_find, mock_client, mock_settings
+    ):
+        from vaultuner.config import Settings
+
+        mock_settings.return_value = Settings(
+            access_token="token", organization_id="org-123"
+        )
+        mock_find.side_effect = [
+            {"id": "old-id", "key": "myproject/api-key", "cached": True},
+            {"id": "new-id", "key": "myproject/api-key"},
+        ]
+        client = MagicMock()
+        client.secrets().get.side_effect = lambda secret_id: MagicMock(
+            data=MagicMock(
+                key="_deleted_/myproject/api-key"
+                if secret_id == "old-id"
+                else "myproject/api-key",
+                value=f"value-{secret_id}",
+                note=None,
+            )
+        )
+        mock_client.return_value = client
+
+        result = runner.invoke(app, ["get", "myproject/api-key", "--value"])
+        assert result.exit_code == 0
+        assert result.stdout.strip() == "value-new-id"
+        assert mock_find.call_args_list[1].kwargs == {"refresh": True}
+
+    @patch("vaultuner.config.get_settings")
+    @patch("vaultuner.agent.connect_agent")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.client.find_secret_by_key")
+    def test_uses_running_agent(
+        self, mock_find, mock_client, mock_agent, mock_settings
+    ):
+        from vaultuner.config import Settings
+
+        mock_settings.return_value = Settings(
+            access_token="token", organization_id="org-123"
+        )
+        mock_find.return_value = {"id": "secret-id", "key": "myproject/api-key"}
+        agent_client = MagicMock()
+        agent_client.secrets().get.return_value = MagicMock(
+            data=MagicMock(key="myproject/api-key", value="from-agent", note=None)
+        )
+        mock_agent.return_value = agent_client
+
+        result = runner.invoke(app, ["get", "myproject/api-key", "--value"])
+        assert result.exit_code == 0
+        assert result.stdout.strip() == "from-agent"
+        mock_client.assert_not_called()
+
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.client.find_secret_by_key")
+    def test_refresh_option(self, mock_find, mock_client):
+        mock_find.return_value = {"id": "secret-id", "key": "myproject/api-key"}
+        client = MagicMock()
+        client.secrets().get.return_value = MagicMock(
+            data=MagicMock(key="myproject/api-key", value="secret-value", note=None)
+        )
+        mock_client.return_value = client
+
+        result = runner.invoke(app, ["get", "myproject/api-key", "--refresh"])
+        assert result.exit_code == 0
+        mock_find.assert_called_once_with(client, "myproject/api-key", refresh=True)
+
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.client.get_secrets_by_keys")
+    def test_get_several_as_json(self, mock_get_many, mock_client):
+        import json
+
+        mock_client.return_value = MagicMock()
+        mock_get_many.return_value = {
+            "myproject/api-key": MagicMock(value="abc"),
+            "myproject/prod/db-url": MagicMock(value="postgres://x"),
+        }
+
+        result = runner.invoke(
+            app, ["get", "myproject/api-key", "myproject/prod/db-url"]
+        )
+        assert result.exit_code == 0
+        assert json.loads(result.stdout) == {
+            "myproject/api-key": "abc",
+            "myproject/prod/db-url": "postgres://x",
+        }
+        mock_get_many.assert_called_once()
+        assert mock_get_many.call_args.args[1] == [
+            "myproject/api-key",
+            "myproject/prod/db-url",
+        ]
+
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.client.get_secrets_by_keys")
+    def test_get_several_as_env(self, mock_get_many, mock_client):
+        mock_client.return_value = MagicMock()
+        mock_get_many.return_value = {
+            "myproject/api-key": MagicMock(value="abc"),
+            "myproject/prod/db-url": MagicMock(value="it's $HOME"),
+        }
+
+        result = runner.invoke(
+            app,
+            ["get", "myproject/api-key", "myproject/prod/db-url", "--format", "env"],
+        )
+        assert result.exit_code == 0
+        assert result.stdout.splitlines() == [
+            "export API_KEY=abc",
+            "export DB_URL='it'\"'\"'s $HOME'",
+        ]
+
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.client.get_secrets_by_keys")
+    def test_get_from_file(self, mock_get_many, mock_client, tmp_path):
+        paths_file = tmp_path / "paths.txt"
+        paths_file.write_text("# needed by the app\nmyproject/api-key\n\nmyproject/token\n")
+        mock_client.return_value = MagicMock()
+        mock_get_many.return_value = {
+            "myproject/api-key": MagicMock(value="abc"),
+            "myproject/token": MagicMock(value="xyz"),
+        }
+
+        result = runner.invoke(
+            app, ["get", "--from-file", str(paths_file), "--format", "env"]
+        )
+        assert result.exit_code == 0
+        assert mock_get_many.call_args.args[1] == [
+            "myproject/api-key",
+            "myproject/token",
+        ]
+        assert "export TOKEN=xyz" in result.stdout
+
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.client.get_secrets_by_keys")
+    def test_get_several_reports_missing(self, mock_get_many, mock_client):
+        mock_client.return_value = MagicMock()
+        mock_get_many.return_value = {"myproject/api-key": MagicMock(value="abc")}
+
+        result = runner.invoke(app, ["get", "myproject/api-key", "myproject/missing"])
+        assert result.exit_code == 1
+        assert "myproject/missing" in result.output
+        assert "abc" not in result.stdout
+
+    def test_get_several_after_permanent_delete(self, fake_bitwarden):
+        fake_bitwarden.populate(["myapp/a", "myapp/b"])
+
+        result = runner.invoke(app, ["get", "myapp/a", "myapp/b"])
+        assert result.exit_code == 0, result.output
+        result = runner.invoke(app, ["delete", "myapp/b", "--permanent", "-f"])
+        assert result.exit_code == 0, result.output
+        fake_bitwarden.calls.clear()
+
+        # The cached index still points at the deleted secret
+        result = runner.invoke(app, ["get", "myapp/a", "myapp/b"])
+        assert result.exit_code == 1
+        assert "Secret not found: myapp/b" in result.stderr
+        assert fake_bitwarden.calls["secrets.list"] == 1
+
+    def test_get_requires_a_path(self):
+        result = runner.invoke(app, ["get"])
+        assert result.exit_code == 1
+        assert "--from-file" in result.output
+
 
 class TestSetSecret:
-    @patch("vaultuner.cli.get_or_create_project")
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_or_create_project")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_creates_secret(self, mock_settings, mock_client, mock_find, mock_project):
         mock_settings.return_value = MagicMock(organization_id="org-123")
         mock_find.return_value = None
@@ -237,9 +566,57 @@ class TestSetSecret:
         assert result.exit_code == 0
         assert "Created" in result.stdout
 
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_or_create_project")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_creates_secret_in_env_project(
+        self, mock_settings, mock_client, mock_find, mock_project
+    ):
+        mock_settings.return_value = MagicMock(
+            organization_id="org-123", project_mode="env"
+        )
+        mock_find.return_value = None
+        mock_project.return_value = "project-id"
+        client = MagicMock()
+        client.secrets().create.return_value = MagicMock(data=MagicMock())
+        mock_client.return_value = client
+
+        result = runner.invoke(app, ["set", "myproject/prod/api-key", "secret-value"])
+        assert result.exit_code == 0
+        mock_project.assert_called_once_with(client, "myproject/prod")
+        assert client.secrets().create.call_args.kwargs["project_ids"] == ["project-id"]
+
+    @patch("vaultuner.agent.invalidate_agent")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_skips_unchanged_update(
+        self, mock_settings, mock_client, mock_find, mock_invalidate
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_find.return_value = {"id": "secret-id", "key": "myproject/api-key"}
+        client = MagicMock()
+        client.secrets().get.return_value = MagicMock(
+            data=MagicMock(
+                key="myproject/api-key",
+                value="same-value",
+                note="---\ndescription: API key\n---",
+            )
+        )
+        mock_client.return_value = client
+
+        result = runner.invoke(
+            app, ["set", "myproject/api-key", "same-value", "-d", "API key"]
+        )
+        assert result.exit_code == 0
+        assert "Unchanged" in result.stdout
+        client.secrets().update.assert_not_called()
+        mock_invalidate.assert_not_called()
+
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_updates_existing(self, mock_settings, mock_client, mock_find):
         mock_settings.return_value = MagicMock(organization_id="org-123")
         mock_find.return_value = {"id": "secret-id", "key": "myproject/api-key"}
@@ -252,11 +629,29 @@ class TestSetSecret:
         assert "Updated" in result.stdout
 
 
+    @patch("vaultuner.agent.invalidate_agent")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_invalidates_agent_cache(
+        self, mock_settings, mock_client, mock_find, mock_invalidate
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_find.return_value = {"id": "secret-id", "key": "myproject/api-key"}
+        client = MagicMock()
+        client.secrets().update.return_value = MagicMock(data=MagicMock())
+        mock_client.return_value = client
+
+        result = runner.invoke(app, ["set", "myproject/api-key", "new-value"])
+        assert result.exit_code == 0
+        mock_invalidate.assert_called_once()
+
+
 class TestSetGenerate:
-    @patch("vaultuner.cli.get_or_create_project")
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_or_create_project")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_creates_with_generated_value(
         self, mock_settings, mock_client, mock_find, mock_project
     ):
@@ -272,10 +667,10 @@ class TestSetGenerate:
         assert "Created" in result.output
         assert "Generated value:" in result.output
 
-    @patch("vaultuner.cli.get_or_create_project")
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_or_create_project")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_generate_prints_value(
         self, mock_settings, mock_client, mock_find, mock_project
     ):
@@ -293,9 +688,9 @@ class TestSetGenerate:
         stored_value = call_args.kwargs.get("value") or call_args[1].get("value")
         assert stored_value in result.output
 
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_generate_updates_existing(self, mock_settings, mock_client, mock_find):
         mock_settings.return_value = MagicMock(organization_id="org-123")
         mock_find.return_value = {"id": "secret-id", "key": "myproject/api-key"}
@@ -324,10 +719,10 @@ class TestSetGenerate:
 
 
 class TestSetDescription:
-    @patch("vaultuner.cli.get_or_create_project")
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_or_create_project")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_creates_with_description(
         self, mock_settings, mock_client, mock_find, mock_project
     ):
@@ -348,9 +743,9 @@ class TestSetDescription:
         assert "description: My API key" in note
         assert "---" in note
 
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_updates_description_preserves_body(
         self, mock_settings, mock_client, mock_find
     ):
@@ -385,9 +780,9 @@ class TestSetDescription:
         assert "description: Added description" in note
         assert "Existing plain note." in note
 
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_metadata_only_update(self, mock_settings, mock_client, mock_find):
         """Update just metadata without changing the secret value."""
         mock_settings.return_value = MagicMock(organization_id="org-123")
@@ -415,9 +810,9 @@ class TestSetDescription:
         assert value == "keep-this-value"
         assert "description: Just adding metadata" in note
 
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_metadata_only_update_not_found(self, mock_settings, mock_client, mock_find):
         """Cannot update metadata on a secret that doesn't exist without providing a value."""
         mock_settings.return_value = MagicMock(organization_id="org-123")
@@ -432,8 +827,8 @@ class TestSetDescription:
 
 
 class TestGetDescription:
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.client.find_secret_by_key")
     def test_displays_description_and_note_body(self, mock_find, mock_client):
         mock_find.return_value = {"id": "secret-id", "key": "myproject/api-key"}
         client = MagicMock()
@@ -451,8 +846,8 @@ class TestGetDescription:
         assert "My API key" in result.stdout
         assert "Some extra note." in result.stdout
 
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.client.find_secret_by_key")
     def test_displays_plain_note_without_frontmatter(self, mock_find, mock_client):
         mock_find.return_value = {"id": "secret-id", "key": "myproject/api-key"}
         client = MagicMock()
@@ -471,9 +866,9 @@ class TestGetDescription:
 
 
 class TestDeleteSecret:
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_soft_deletes(self, mock_settings, mock_client, mock_find):
         mock_settings.return_value = MagicMock(organization_id="org-123")
         mock_find.return_value = {"id": "secret-id", "key": "myproject/api-key"}
@@ -489,9 +884,9 @@ class TestDeleteSecret:
         assert "Deleted" in result.stdout
         client.secrets().update.assert_called_once()
 
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_permanent_deletes(self, mock_settings, mock_client, mock_find):
         mock_settings.return_value = MagicMock(organization_id="org-123")
         mock_find.return_value = {"id": "secret-id", "key": "myproject/api-key"}
@@ -505,9 +900,9 @@ class TestDeleteSecret:
         assert "Permanently deleted" in result.stdout
         client.secrets().delete.assert_called_once()
 
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_not_found(self, mock_settings, mock_client, mock_find):
         mock_settings.return_value = MagicMock(organization_id="org-123")
         mock_find.return_value = None
@@ -519,9 +914,9 @@ class TestDeleteSecret:
 
 
 class TestRestoreSecret:
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_restores(self, mock_settings, mock_client, mock_find):
         mock_settings.return_value = MagicMock(organization_id="org-123")
         mock_find.return_value = {
@@ -539,9 +934,9 @@ class TestRestoreSecret:
         assert result.exit_code == 0
         assert "Restored" in result.stdout
 
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.find_secret_by_key")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_not_found(self, mock_settings, mock_client, mock_find):
         mock_settings.return_value = MagicMock(organization_id="org-123")
         mock_find.return_value = None
@@ -553,8 +948,8 @@ class TestRestoreSecret:
 
 
 class TestProjects:
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_lists_semantic_projects(self, mock_settings, mock_client):
         mock_settings.return_value = MagicMock(organization_id="org-123")
 
@@ -572,8 +967,8 @@ class TestProjects:
         assert "myproject" in result.output
         assert "other" in result.output
 
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_lists_scoped_projects(self, mock_settings, mock_client):
         mock_settings.return_value = MagicMock(organization_id="org-123")
 
@@ -591,8 +986,8 @@ class TestProjects:
         assert "@dpoblador/vaultuner" in result.output
         assert "myproject" in result.output
 
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_deduplicates_projects(self, mock_settings, mock_client):
         mock_settings.return_value = MagicMock(organization_id="org-123")
 
@@ -610,8 +1005,8 @@ class TestProjects:
         # Should appear once, not three times
         assert result.output.count("myproject") == 1
 
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_ignores_deleted_secrets(self, mock_settings, mock_client):
         mock_settings.return_value = MagicMock(organization_id="org-123")
 
@@ -628,8 +1023,8 @@ class TestProjects:
         assert "myproject" in result.output
         assert "oldproject" not in result.output
 
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_empty(self, mock_settings, mock_client):
         mock_settings.return_value = MagicMock(organization_id="org-123")
         client = MagicMock()
@@ -653,6 +1048,20 @@ class TestExportCommand:
         assert "3 added" in result.output
         assert "1 already present" in result.output
 
+    @patch("vaultuner.export.export_secrets")
+    def test_passes_concurrency(self, mock_export, tmp_path):
+        mock_export.return_value = (1, 0)
+        output = tmp_path / ".env"
+
+        result = runner.invoke(
+            app, ["export", "-p", "myproject", "-o", str(output), "-c", "8"]
+        )
+
+        assert result.exit_code == 0
+        mock_export.assert_called_once_with(
+            "myproject", output, None, batch_size=100, concurrency=8
+        )
+
     @patch("vaultuner.export.export_secrets")
     def test_no_secrets(self, mock_export):
         mock_export.return_value = (0, 0)
@@ -661,18 +1070,154 @@ class TestExportCommand:
         assert result.exit_code == 0
         assert "No secrets found" in result.output
 
+    def test_forbidden_secrets_fail_the_export(
+        self, fake_bitwarden, monkeypatch, tmp_path
+    ):
+        from tests.fake_bitwarden import FakeSecrets
+
+        def forbidden(self, *args):
+            raise Exception("403 Forbidden")
+
+        monkeypatch.setattr(FakeSecrets, "get_by_ids", forbidden)
+        monkeypatch.setattr(FakeSecrets, "get", forbidden)
+        fake_bitwarden.populate(["myapp/api-key"])
+        output = tmp_path / ".env"
+
+        result = runner.invoke(app, ["export", "-p", "myapp", "-o", str(output)])
+        assert result.exit_code != 0
+        assert "No secrets found" not in result.output
+        assert not output.exists()
+
+    @pytest.mark.parametrize("permanent", [False, True])
+    def test_sync_comments_out_deleted_secrets(
+        self, fake_bitwarden, tmp_path, permanent
+    ):
+        fake_bitwarden.populate(["myapp/prod/a", "myapp/prod/c"])
+        output = tmp_path / ".env"
+        sync = ["export", "-p", "myapp", "-e", "prod", "-o", str(output), "--sync"]
+
+        assert runner.invoke(app, sync).exit_code == 0
+        delete = ["delete", "myapp/prod/c", "-f"] + (["--permanent"] if permanent else [])
+        assert runner.invoke(app, delete).exit_code == 0
+
+        result = runner.invoke(app, sync)
+        assert result.exit_code == 0, result.output
+        assert "1 removed" in result.stdout
+        assert output.read_text() == (
+            'A="value-of-myapp/prod/a"\n# C was removed from the vault\n'
+        )
+
+
+class TestStatsOption:
+    @patch("vaultuner.export.export_secrets")
+    def test_prints_request_counters(self, mock_export, tmp_path):
+        mock_export.return_value = (0, 0)
+
+        result = runner.invoke(
+            app, ["--stats", "export", "-p", "myproject", "-o", str(tmp_path / ".env")]
+        )
+
+        assert result.exit_code == 0
+        assert "SDK requests:" in result.output
+        assert "throttled:" in result.output
+
+
+class TestProfileOption:
+    @pytest.fixture(autouse=True)
+    def fresh_profiler(self, monkeypatch):
+        import vaultuner.profile
+
+        monkeypatch.setattr(vaultuner.profile, "profiler", vaultuner.profile.Profiler())
+
+    @staticmethod
+    def make_client():
+        client = MagicMock()
+        client.secrets().list.return_value = MagicMock(
+            data=MagicMock(data=[MagicMock(key="myproject/api-key")])
+        )
+        return RetryingClient(client)
+
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_prints_summary(self, mock_settings, mock_client):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_client.return_value = self.make_client()
+
+        result = runner.invoke(app, ["--profile", "list"])
+
+        assert result.exit_code == 0
+        assert "Profile" in result.output
+        for name in ["command list", "secrets.list", "render"]:
+            assert name in result.output
+
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_writes_chrome_trace(self, mock_settings, mock_client, tmp_path):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_client.return_value = self.make_client()
+        trace_path = tmp_path / "trace.json"
+
+        result = runner.invoke(
+            app,
+            ["list"],
+            env={"VAULTUNER_PROFILE_OUTPUT": str(trace_path)},
+        )
+
+        assert result.exit_code == 0
+        events = json.loads(trace_path.read_text())["traceEvents"]
+        assert events[0]["name"] == "command list"
+        assert {"secrets.list", "render"} <= {event["name"] for event in events}
+        # Without --profile only the trace is written
+        assert "Total ms" not in result.output
+
+
+class TestRunCommand:
+    @patch("os.execvpe")
+    @patch("vaultuner.export.project_env_vars")
+    def test_execs_command_with_secrets(self, mock_vars, mock_exec, monkeypatch):
+        monkeypatch.setenv("API_KEY", "from-shell")
+        monkeypatch.setenv("HOME", "/home/me")
+        mock_vars.return_value = {"API_KEY": "secret", "DB_PASS": "pw"}
+
+        result = runner.invoke(
+            app, ["run", "-p", "myproject", "-e", "prod", "--", "ls", "-la", "/tmp"]
+        )
+
+        assert result.exit_code == 0
+        mock_vars.assert_called_once_with("myproject", "prod", batch_size=100)
+        file, args, environ = mock_exec.call_args.args
+        assert (file, args) == ("ls", ["ls", "-la", "/tmp"])
+        assert environ["API_KEY"] == "secret"
+        assert environ["DB_PASS"] == "pw"
+        assert environ["HOME"] == "/home/me"
+
+    @patch("os.execvpe")
+    @patch("vaultuner.export.project_env_vars")
+    def test_command_not_found(self, mock_vars, mock_exec):
+        mock_vars.return_value = {}
+        mock_exec.side_effect = FileNotFoundError(2, "No such file or directory")
+
+        result = runner.invoke(app, ["run", "-p", "myproject", "--", "missing-cmd"])
+
+        assert result.exit_code == 127
+        assert "Cannot run missing-cmd" in result.output
+
+    def test_requires_a_command(self):
+        result = runner.invoke(app, ["run", "-p", "myproject"])
+        assert result.exit_code != 0
+
 
 class TestImportCommand:
-    @patch("vaultuner.cli.get_or_create_project")
-    @patch("vaultuner.cli.find_secret_by_key")
-    @patch("vaultuner.cli.get_client")
-    @patch("vaultuner.cli.get_settings")
+    @patch("vaultuner.client.get_or_create_project")
+    @patch("vaultuner.client.list_secret_keys")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
     def test_preview_shows_length_not_value(
-        self, mock_settings, mock_client, mock_find, mock_project, tmp_path
+        self, mock_settings, mock_client, mock_keys, mock_project, tmp_path
     ):
         """Import preview should not leak partial secret values."""
         mock_settings.return_value = MagicMock(organization_id="org-123")
-        mock_find.return_value = None
+        mock_keys.return_value = {}
         mock_project.return_value = "project-id"
         client = MagicMock()
         client.secrets().create.return_value = MagicMock(data=MagicMock())
@@ -692,3 +1237,525 @@ class TestImportCommand:
         assert "supersecret" not in result.output
         # Length info should appear instead (value is 21 chars)
         assert "21 chars" in result.output
+
+    @patch("vaultuner.client.get_or_create_project")
+    @patch("vaultuner.client.list_secret_keys")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_lists_existing_keys_once(
+        self, mock_settings, mock_client, mock_keys, mock_project, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_keys.return_value = {"testproj/existing": "secret-id"}
+        mock_project.return_value = "project-id"
+        client = MagicMock()
+        client.secrets().create.return_value = MagicMock(data=MagicMock())
+        mock_client.return_value = client
+
+        env_file = tmp_path / ".env"
+        env_file.write_text("EXISTING=a\nFIRST=b\nSECOND=c\n")
+
+        result = runner.invoke(
+            app, ["import", "-i", str(env_file), "-p", "testproj", "-y"]
+        )
+        assert result.exit_code == 0
+        mock_keys.assert_called_once_with(client)
+        assert "Already exists: testproj/existing" in result.output
+        assert "Plan: 2 to create" in result.output
+        created = [c.kwargs["key"] for c in client.secrets().create.call_args_list]
+        assert created == ["testproj/first", "testproj/second"]
+        assert "2 created, 1 skipped" in result.output
+
+    @patch("vaultuner.client.get_or_create_project")
+    @patch("vaultuner.client.list_secret_keys")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_dry_run_creates_nothing(
+        self, mock_settings, mock_client, mock_keys, mock_project, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_keys.return_value = {}
+        client = MagicMock()
+        mock_client.return_value = client
+
+        env_file = tmp_path / ".env"
+        env_file.write_text("API_KEY=value\n")
+
+        result = runner.invoke(
+            app, ["import", "-i", str(env_file), "-p", "testproj", "--dry-run"]
+        )
+        assert result.exit_code == 0
+        assert "testproj/api-key" in result.output
+        client.secrets().create.assert_not_called()
+        mock_project.assert_not_called()
+
+    @patch("vaultuner.retry.time.sleep")
+    @patch("vaultuner.client.get_or_create_project")
+    @patch("vaultuner.client.list_secret_keys")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_concurrent_creates_report_in_input_order(
+        self, mock_settings, mock_client, mock_keys, mock_project, mock_sleep, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_keys.return_value = {}
+        mock_project.return_value = "project-id"
+
+        attempts: dict[str, int] = {}
+
+        def create(**kwargs):
+            key = kwargs["key"]
+            attempts[key] = attempts.get(key, 0) + 1
+            if key == "testproj/flaky" and attempts[key] == 1:
+                raise Exception("429 Too Many Requests")
+            if key == "testproj/broken":
+                raise Exception("400 Bad Request")
+            return MagicMock(data=MagicMock())
+
+        client = MagicMock()
+        client.secrets().create.side_effect = create
+        mock_client.return_value = RetryingClient(client)
+
+        env_file = tmp_path / ".env"
+        env_file.write_text("A=1\nFLAKY=2\nBROKEN=3\nD=4\n")
+
+        result = runner.invoke(
+            app,
+            ["import", "-i", str(env_file), "-p", "testproj", "-y", "-c", "4"],
+        )
+        assert result.exit_code == 1
+        assert attempts["testproj/flaky"] == 2
+        assert attempts["testproj/broken"] == 1
+        lines = [line for line in result.output.splitlines() if ": testproj/" in line]
+        assert lines == [
+            "Created: testproj/a",
+            "Created: testproj/flaky",
+            "Failed: testproj/broken (400 Bad Request)",
+            "Created: testproj/d",
+        ]
+        assert "3 created, 0 skipped, 1 failed" in result.output
+
+    @patch("vaultuner.client.get_or_create_project")
+    @patch("vaultuner.client.list_secret_keys")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_invalid_project_in_project_mode(
+        self, mock_settings, mock_client, mock_keys, mock_project, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(
+            organization_id="org-123", project_mode="project"
+        )
+        mock_keys.return_value = {}
+        client = MagicMock()
+        mock_client.return_value = client
+
+        env_file = tmp_path / ".env"
+        env_file.write_text("API_KEY=value\n")
+
+        result = runner.invoke(app, ["import", "-i", str(env_file), "-p", "@bad", "-y"])
+        assert result.exit_code == 1
+        assert "Error: Invalid path format: @bad/api-key" in result.output
+        assert "Importing" not in result.output
+        client.secrets().create.assert_not_called()
+        mock_project.assert_not_called()
+
+
+class TestMigrateCommand:
+    @staticmethod
+    def make_client():
+        client = MagicMock()
+        client.secrets().list.return_value = MagicMock(
+            data=MagicMock(
+                data=[
+                    MagicMock(id="s1", key="myapp/prod/api-key", project_ids=["shared"]),
+                    MagicMock(id="s2", key="myapp/token", project_ids=["p-myapp"]),
+                    MagicMock(id="s3", key="_deleted_/other/old", project_ids=["shared"]),
+                ]
+            )
+        )
+        client.secrets().get_by_ids.side_effect = lambda ids: MagicMock(
+            data=MagicMock(
+                data=[MagicMock(id=i, value=f"value-{i}", note=None) for i in ids]
+            )
+        )
+        return client
+
+    @patch("vaultuner.client.get_or_create_project")
+    @patch("vaultuner.client.list_project_ids")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_dry_run(self, mock_settings, mock_client, mock_ids, mock_project):
+        mock_settings.return_value = MagicMock(
+            organization_id="org-123", project_mode="project"
+        )
+        mock_ids.return_value = {"vaultuner": "shared", "myapp": "p-myapp"}
+        client = self.make_client()
+        mock_client.return_value = client
+
+        result = runner.invoke(app, ["migrate", "--dry-run"])
+        assert result.exit_code == 0
+        assert "2 to move" in result.stdout
+        assert "myapp/prod/api-key" in result.stdout
+        assert "_deleted_/other/old" in result.stdout
+        assert "myapp/token" not in result.stdout
+        mock_project.assert_not_called()
+        client.secrets().update.assert_not_called()
+
+    @patch("vaultuner.agent.invalidate_agent")
+    @patch("vaultuner.client.get_or_create_project")
+    @patch("vaultuner.client.list_project_ids")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_moves_secrets(
+        self, mock_settings, mock_client, mock_ids, mock_project, mock_invalidate
+    ):
+        mock_settings.return_value = MagicMock(
+            organization_id="org-123", project_mode="project"
+        )
+        mock_ids.return_value = {"vaultuner": "shared", "myapp": "p-myapp"}
+        mock_project.return_value = "p-other"
+        client = self.make_client()
+        mock_client.return_value = client
+
+        result = runner.invoke(app, ["migrate"])
+        assert result.exit_code == 0
+        assert "2 moved" in result.stdout
+        mock_project.assert_called_once_with(client, "other")
+        updates = {
+            c.kwargs["key"]: c.kwargs for c in client.secrets().update.call_args_list
+        }
+        assert updates["myapp/prod/api-key"]["project_ids"] == ["p-myapp"]
+        assert updates["myapp/prod/api-key"]["value"] == "value-s1"
+        assert updates["_deleted_/other/old"]["project_ids"] == ["p-other"]
+        mock_invalidate.assert_called_once()
+
+    @patch("vaultuner.client.list_project_ids")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_nothing_to_move(self, mock_settings, mock_client, mock_ids):
+        mock_settings.return_value = MagicMock(
+            organization_id="org-123", project_mode="single"
+        )
+        mock_ids.return_value = {"vaultuner": "shared"}
+        client = MagicMock()
+        client.secrets().list.return_value = MagicMock(
+            data=MagicMock(
+                data=[MagicMock(id="s1", key="myapp/api-key", project_ids=["shared"])]
+            )
+        )
+        mock_client.return_value = client
+
+        result = runner.invoke(app, ["migrate"])
+        assert result.exit_code == 0
+        assert "already match" in result.stdout
+
+
+class TestApplyCommand:
+    @staticmethod
+    def write_manifest(tmp_path):
+        manifest = tmp_path / "secrets.yaml"
+        manifest.write_text(
+            "myapp/api-key: new-key\n"
+            "myapp/token: same\n"
+            "myapp/prod/db-url:\n"
+            "  value: postgres://x\n"
+            "  description: Primary database\n"
+        )
+        return manifest
+
+    @staticmethod
+    def existing():
+        return {
+            "myapp/api-key": MagicMock(id="id-1", value="old-key", note=""),
+            "myapp/token": MagicMock(id="id-2", value="same", note=""),
+        }
+
+    @patch("vaultuner.client.get_secrets_by_keys")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_dry_run_prints_plan(self, mock_settings, mock_client, mock_get, tmp_path):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        client = MagicMock()
+        mock_client.return_value = client
+        mock_get.return_value = self.existing()
+
+        result = runner.invoke(app, ["apply", str(self.write_manifest(tmp_path)), "--dry-run"])
+        assert result.exit_code == 0
+        assert "1 to create, 1 to update, 1 unchanged" in result.stdout
+        assert "+ myapp/prod/db-url" in result.stdout
+        assert "~ myapp/api-key" in result.stdout
+        client.secrets().create.assert_not_called()
+        client.secrets().update.assert_not_called()
+
+    @patch("vaultuner.agent.invalidate_agent")
+    @patch("vaultuner.client.get_or_create_project")
+    @patch("vaultuner.client.get_secrets_by_keys")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_applies_only_necessary_writes(
+        self, mock_settings, mock_client, mock_get, mock_project, mock_invalidate, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        client = MagicMock()
+        mock_client.return_value = client
+        mock_get.return_value = self.existing()
+        mock_project.return_value = "project-id"
+
+        result = runner.invoke(
+            app, ["apply", str(self.write_manifest(tmp_path)), "-c", "4"]
+        )
+        assert result.exit_code == 0
+        assert "1 created, 1 updated, 1 unchanged" in result.stdout
+
+        mock_get.assert_called_once()
+        create = client.secrets().create.call_args.kwargs
+        assert create["key"] == "myapp/prod/db-url"
+        assert create["note"] == "---\ndescription: Primary database\n---"
+        assert create["project_ids"] == ["project-id"]
+        update = client.secrets().update.call_args.kwargs
+        assert update["id"] == "id-1"
+        assert update["value"] == "new-key"
+        assert client.secrets().update.call_count == 1
+        mock_invalidate.assert_called_once()
+
+    @patch("vaultuner.agent.invalidate_agent")
+    @patch("vaultuner.client.get_secrets_by_keys")
+    @patch("vaultuner.client.get_client")
+    @patch("vaultuner.config.get_settings")
+    def test_reports_failures(
+        self, mock_settings, mock_client, mock_get, mock_invalidate, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        client = MagicMock()
+        client.secrets().update.side_effect = Exception("Key is invalid")
+        mock_client.return_value = client
+        mock_get.return_value = self.existing()
+        manifest = tmp_path / "secrets.yaml"
+        manifest.write_text("myapp/api-key: new-key\n")
+
+        result = runner.invoke(app, ["apply", str(manifest)])
+        assert result.exit_code == 1
+        assert "Failed:" in result.output
+        assert "1 failed" in result.stdout
+
+    def test_invalid_manifest(self, tmp_path):
+        manifest = tmp_path / "secrets.yaml"
+        manifest.write_text("api-key: abc\n")
+
+        result = runner.invoke(app, ["apply", str(manifest)])
+        assert result.exit_code == 1
+        assert "Invalid path" in result.output
+
+    def test_missing_file(self, tmp_path):
+        result = runner.invoke(app, ["apply", str(tmp_path / "missing.yaml")])
+        assert result.exit_code == 1
+        assert "File not found" in result.output
+
+
+class TestSnapshot:
+    def write(self, path, include_values=False):
+        from tests.fake_bitwarden import FakeBitwarden
+        from vaultuner.config import Settings
+        from vaultuner.snapshot import write_snapshot
+
+        backend = FakeBitwarden()
+        for key in ["myapp/prod/db-pass", "myapp/dev/db-pass", "_deleted_/other/key"]:
+            backend.add_secret(key, f"{key.split('/')[1]}-value")
+        settings = Settings(access_token="token", organization_id="org-123")
+        write_snapshot(path, backend.secrets_by_id.values(), settings, include_values)
+        return settings
+
+    @patch("vaultuner.snapshot.take_snapshot")
+    def test_writes_snapshot(self, mock_take, tmp_path):
+        mock_take.return_value = 42
+        output = tmp_path / "org.snapshot"
+
+        result = runner.invoke(
+            app, ["snapshot", "-o", str(output), "--include-values", "-c", "4"]
+        )
+
+        assert result.exit_code == 0
+        assert "42 secrets with encrypted values" in " ".join(result.stdout.split())
+        mock_take.assert_called_once_with(
+            output, include_values=True, batch_size=None, concurrency=4
+        )
+
+    @patch("vaultuner.client.get_client")
+    def test_list_reads_snapshot_offline(self, mock_client, tmp_path):
+        path = tmp_path / "org.snapshot"
+        self.write(path)
+
+        result = runner.invoke(
+            app, ["list", "--snapshot", str(path), "-p", "myapp", "-f", "tsv"]
+        )
+
+        assert result.exit_code == 0
+        assert result.stdout == "myapp\tprod\tdb-pass\nmyapp\tdev\tdb-pass\n"
+        mock_client.assert_not_called()
+
+    @patch("vaultuner.client.get_client")
+    def test_list_deleted_from_snapshot(self, mock_client, tmp_path):
+        path = tmp_path / "org.snapshot"
+        self.write(path)
+
+        result = runner.invoke(
+            app, ["list", "--snapshot", str(path), "-d", "-p", "other", "-f", "tsv"]
+        )
+
+        assert result.stdout == "other\t-\tkey\tdeleted\n"
+
+    @patch("vaultuner.client.get_client")
+    def test_projects_reads_snapshot_offline(self, mock_client, tmp_path):
+        path = tmp_path / "org.snapshot"
+        self.write(path)
+
+        result = runner.invoke(app, ["projects", "--snapshot", str(path)])
+
+        assert result.exit_code == 0
+        assert "myapp" in result.stdout
+        assert "other" not in result.stdout
+        mock_client.assert_not_called()
+
+    def test_missing_snapshot(self, tmp_path):
+        result = runner.invoke(
+            app, ["list", "--snapshot", str(tmp_path / "missing.snapshot")]
+        )
+        assert result.exit_code == 1
+        assert "Snapshot not found" in result.output
+
+    @patch("vaultuner.client.get_client")
+    def test_get_reads_values_offline(self, mock_client, tmp_path, monkeypatch):
+        path = tmp_path / "org.snapshot"
+        settings = self.write(path, include_values=True)
+        monkeypatch.setattr("vaultuner.config._settings", settings)
+
+        result = runner.invoke(
+            app, ["get", "myapp/prod/db-pass", "-v", "--snapshot", str(path)]
+        )
+
+        assert result.exit_code == 0
+        assert result.stdout == "prod-value\n"
+        mock_client.assert_not_called()
+
+    def test_get_several_from_snapshot(self, tmp_path, monkeypatch):
+        path = tmp_path / "org.snapshot"
+        settings = self.write(path, include_values=True)
+        monkeypatch.setattr("vaultuner.config._settings", settings)
+
+        result = runner.invoke(
+            app,
+            ["get", "myapp/prod/db-pass", "myapp/dev/db-pass", "--snapshot", str(path)],
+        )
+
+        assert result.exit_code == 0
+        assert json.loads(result.stdout) == {
+            "myapp/prod/db-pass": "prod-value",
+            "myapp/dev/db-pass": "dev-value",
+        }
+
+    def test_get_missing_from_snapshot(self, tmp_path, monkeypatch):
+        path = tmp_path / "org.snapshot"
+        settings = self.write(path, include_values=True)
+        monkeypatch.setattr("vaultuner.config._settings", settings)
+
+        result = runner.invoke(app, ["get", "myapp/nope", "--snapshot", str(path)])
+
+        assert result.exit_code == 1
+        assert "Secret not found" in result.output
+
+    def test_get_needs_snapshot_values(self, tmp_path, monkeypatch):
+        path = tmp_path / "org.snapshot"
+        settings = self.write(path)
+        monkeypatch.setattr("vaultuner.config._settings", settings)
+
+        result = runner.invoke(
+            app, ["get", "myapp/prod/db-pass", "--snapshot", str(path)]
+        )
+
+        assert result.exit_code == 1
+        assert "--include-values" in result.output
+
+
+class TestValueCache:
+    @pytest.fixture
+    def backend(self, fake_bitwarden, monkeypatch):
+        from vaultuner import config
+
+        settings = config._settings.model_copy(
+            update={"value_cache_ttl": 60, "value_cache_stale": 300}
+        )
+        monkeypatch.setattr("vaultuner.config._settings", settings)
+        fake_bitwarden.populate(["myapp/api-key"])
+        return fake_bitwarden
+
+    def get_value(self, *args):
+        result = runner.invoke(app, ["get", "myapp/api-key", "--value", *args])
+        assert result.exit_code == 0, result.output
+        return result.stdout.strip()
+
+    def test_serves_fresh_value_without_bitwarden(self, backend):
+        assert self.get_value() == "value-of-myapp/api-key"
+        backend.calls.clear()
+
+        with patch("vaultuner.client._login") as mock_login:
+            assert self.get_value() == "value-of-myapp/api-key"
+        mock_login.assert_not_called()
+        assert backend.calls == {}
+
+    def test_writes_clear_cached_values(self, backend):
+        self.get_value()
+        result = runner.invoke(app, ["set", "myapp/api-key", "rotated"])
+        assert result.exit_code == 0, result.output
+
+        assert self.get_value() == "rotated"
+
+    @patch("vaultuner.value_cache.start_revalidation")
+    @patch("vaultuner.value_cache.time.time")
+    def test_serves_stale_value_while_revalidating(self, mock_time, mock_start, backend):
+        mock_time.return_value = 1000.0
+        self.get_value()
+        backend.calls.clear()
+
+        mock_time.return_value = 1100.0
+        assert self.get_value() == "value-of-myapp/api-key"
+        assert backend.calls == {}
+        mock_start.assert_called_once_with("myapp/api-key")
+
+    def test_refresh_skips_the_cache(self, backend):
+        self.get_value()
+        next(iter(backend.secrets_by_id.values())).value = "changed"
+
+        assert self.get_value() == "value-of-myapp/api-key"
+        assert self.get_value("--refresh") == "changed"
+        assert self.get_value() == "changed"
+
+    def test_revalidate_fetches_and_releases_claim(self, backend):
+        from vaultuner.value_cache import claim_revalidation
+
+        self.get_value()
+        next(iter(backend.secrets_by_id.values())).value = "changed"
+        claim_revalidation("myapp/api-key")
+
+        self.get_value("--revalidate")
+
+        assert self.get_value() == "changed"
+        assert claim_revalidation("myapp/api-key") is True
+
+    def test_several_paths_are_not_cached(self, backend):
+        self.get_value()
+        backend.calls.clear()
+
+        result = runner.invoke(app, ["get", "myapp/api-key", "--format", "env"])
+        assert result.exit_code == 0
+        assert backend.calls["secrets.get_by_ids"] == 1
+
+    def test_cache_clear(self, backend):
+        self.get_value()
+
+        result = runner.invoke(app, ["cache", "clear"])
+        assert result.exit_code == 0
+        assert "Cleared:" in result.stdout
+        backend.calls.clear()
+
+        self.get_value()
+        assert backend.calls["secrets.list"] == 1
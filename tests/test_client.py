@@ -1,6 +1,7 @@
 # ABOUTME: Tests for the client module.
 # ABOUTME: Tests Bitwarden SDK wrapper functions.
 
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -13,12 +14,15 @@ class TestGetClient:
     def test_creates_authenticated_client(
         self, mock_settings, mock_client_settings, mock_client_class
     ):
-        from vaultuner.client import get_client
+        from vaultuner.client import RetryingClient, get_client
 
         settings = MagicMock()
         settings.api_url = "https://api.example.com"
         settings.identity_url = "https://identity.example.com"
         settings.access_token.get_secret_value.return_value = "test-token"
+        settings.persist_session = False
+        settings.rate_limit = 0
+        settings.retry_attempts = 3
         mock_settings.return_value = settings
 
         client = MagicMock()
@@ -26,7 +30,8 @@ class TestGetClient:
 
         result = get_client()
 
-        assert result == client
+        assert isinstance(result, RetryingClient)
+        assert result.auth() is client.auth()
         client.auth().login_access_token.assert_called_once()
 
     @patch("vaultuner.client.BitwardenClient")
@@ -44,6 +49,9 @@ class TestGetClient:
         settings.api_url = "https://api.example.com"
         settings.identity_url = "https://identity.example.com"
         settings.access_token.get_secret_value.return_value = "test-token"
+        settings.persist_session = False
+        settings.rate_limit = 0
+        settings.retry_attempts = 3
         mock_settings.return_value = settings
 
         client = MagicMock()
@@ -65,13 +73,66 @@ class TestGetClient:
         assert captured_path is not None
         assert not captured_path.exists()
 
+    @patch("vaultuner.client.BitwardenClient")
+    @patch("vaultuner.client.client_settings_from_dict")
+    @patch("vaultuner.client.get_settings")
+    def test_persists_private_state_file(
+        self, mock_settings, mock_client_settings, mock_client_class
+    ):
+        import stat
+        from pathlib import Path
+
+        from vaultuner.client import get_client, session_state_path
+        from vaultuner.config import Settings
+
+        settings = Settings(
+            access_token="test-token", organization_id="org-123", persist_session=True
+        )
+        mock_settings.return_value = settings
+
+        client = MagicMock()
+        mock_client_class.return_value = client
+
+        used_paths = []
+
+        def capture_login(token, path):
+            used_paths.append(Path(path))
+            Path(path).write_text("{}")
+
+        client.auth().login_access_token.side_effect = capture_login
+
+        get_client()
+        get_client()
+
+        state_path = session_state_path(settings)
+        assert used_paths == [state_path, state_path]
+        assert state_path.exists()
+        assert stat.S_IMODE(state_path.stat().st_mode) == 0o600
+
+
+class TestSessionStatePath:
+    def test_depends_on_org_and_token(self):
+        from vaultuner.client import session_state_path
+        from vaultuner.config import Settings
+
+        base = session_state_path(Settings(access_token="a", organization_id="org-1"))
+        other_token = session_state_path(
+            Settings(access_token="b", organization_id="org-1")
+        )
+        other_org = session_state_path(
+            Settings(access_token="a", organization_id="org-2")
+        )
+
+        assert len({base, other_token, other_org}) == 3
+        assert "org-1" not in base.name
+
 
 class TestGetOrCreateProject:
     @patch("vaultuner.client.get_settings")
     def test_returns_existing_project(self, mock_settings):
         from vaultuner.client import get_or_create_project
 
-        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_settings.return_value = MagicMock(organization_id="org-123", index_ttl=0)
 
         project = MagicMock()
         project.id = "project-id-123"
@@ -88,7 +149,7 @@ class TestGetOrCreateProject:
     def test_creates_project_when_not_found(self, mock_settings):
         from vaultuner.client import get_or_create_project
 
-        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_settings.return_value = MagicMock(organization_id="org-123", index_ttl=0)
 
         client = MagicMock()
         client.projects().list.return_value = MagicMock(data=MagicMock(data=[]))
@@ -105,7 +166,7 @@ class TestGetOrCreateProject:
     def test_raises_on_create_failure(self, mock_settings):
         from vaultuner.client import get_or_create_project
 
-        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_settings.return_value = MagicMock(organization_id="org-123", index_ttl=0)
 
         client = MagicMock()
         client.projects().list.return_value = MagicMock(data=MagicMock(data=[]))
@@ -114,13 +175,97 @@ class TestGetOrCreateProject:
         with pytest.raises(RuntimeError, match="Failed to create project"):
             get_or_create_project(client, "newproject")
 
+    @patch("vaultuner.client.get_settings")
+    def test_remembers_project_id_in_process(self, mock_settings):
+        from vaultuner.client import get_or_create_project
+
+        mock_settings.return_value = MagicMock(organization_id="org-123", index_ttl=0)
+        project = MagicMock(id="project-id-123")
+        project.name = "myproject"
+        client = MagicMock()
+        client.projects().list.return_value = MagicMock(data=MagicMock(data=[project]))
+
+        assert get_or_create_project(client, "myproject") == "project-id-123"
+        assert get_or_create_project(client, "myproject") == "project-id-123"
+        assert client.projects().list.call_count == 1
+
+    @patch("vaultuner.client.get_settings")
+    def test_uses_disk_cache_across_processes(self, mock_settings):
+        from pydantic import SecretStr
+
+        from vaultuner import client as client_module
+        from vaultuner.client import get_or_create_project
+        from vaultuner.config import Settings
+
+        mock_settings.return_value = Settings(
+            access_token=SecretStr("token"), organization_id="org-123"
+        )
+        client = MagicMock()
+        client.projects().list.return_value = MagicMock(data=MagicMock(data=[]))
+        client.projects().create.return_value = MagicMock(data=MagicMock(id="new-id"))
+
+        assert get_or_create_project(client, "myproject") == "new-id"
+        client_module._project_ids.clear()
+        assert get_or_create_project(client, "myproject") == "new-id"
+        assert client.projects().list.call_count == 1
+        client.projects().create.assert_called_once()
+
+    @patch("vaultuner.client.get_settings")
+    def test_forget_project(self, mock_settings):
+        from vaultuner.client import forget_project, get_or_create_project
+
+        mock_settings.return_value = MagicMock(organization_id="org-123", index_ttl=0)
+        project = MagicMock(id="project-id-123")
+        project.name = "myproject"
+        client = MagicMock()
+        client.projects().list.return_value = MagicMock(data=MagicMock(data=[project]))
+
+        get_or_create_project(client, "myproject")
+        forget_project("myproject")
+        get_or_create_project(client, "myproject")
+        assert client.projects().list.call_count == 2
+
+
+class TestWithProject:
+    @patch("vaultuner.client.forget_project")
+    @patch("vaultuner.client.get_or_create_project")
+    def test_reresolves_project_once_on_not_found(self, mock_project, mock_forget):
+        from vaultuner.client import with_project
+
+        mock_project.side_effect = ["stale-id", "fresh-id"]
+        calls = []
+
+        def action(project_id):
+            calls.append(project_id)
+            if project_id == "stale-id":
+                raise Exception("404 Not Found")
+            return "created"
+
+        assert with_project(MagicMock(), "myproject", action) == "created"
+        assert calls == ["stale-id", "fresh-id"]
+        mock_forget.assert_called_once_with("myproject")
+
+    @patch("vaultuner.client.forget_project")
+    @patch("vaultuner.client.get_or_create_project")
+    def test_other_errors_propagate(self, mock_project, mock_forget):
+        from vaultuner.client import with_project
+
+        mock_project.return_value = "project-id"
+
+        def action(project_id):
+            raise Exception("Key is required")
+
+        with pytest.raises(Exception, match="Key is required"):
+            with_project(MagicMock(), "myproject", action)
+        mock_forget.assert_not_called()
+
 
 class TestFindSecretByKey:
     @patch("vaultuner.client.get_settings")
     def test_finds_secret(self, mock_settings):
         from vaultuner.client import find_secret_by_key
 
-        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_settings.return_value = MagicMock(organization_id="org-123", index_ttl=0)
 
         secret = MagicMock()
         secret.id = "secret-id-123"
@@ -136,7 +281,7 @@ class TestFindSecretByKey:
     def test_returns_none_when_not_found(self, mock_settings):
         from vaultuner.client import find_secret_by_key
 
-        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_settings.return_value = MagicMock(organization_id="org-123", index_ttl=0)
 
         client = MagicMock()
         client.secrets().list.return_value = MagicMock(data=MagicMock(data=[]))
@@ -148,10 +293,400 @@ class TestFindSecretByKey:
     def test_returns_none_when_no_data(self, mock_settings):
         from vaultuner.client import find_secret_by_key
 
-        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_settings.return_value = MagicMock(organization_id="org-123", index_ttl=0)
 
         client = MagicMock()
         client.secrets().list.return_value = MagicMock(data=None)
 
         result = find_secret_by_key(client, "myproject/api-key")
         assert result is None
+
+    @patch("vaultuner.client.get_settings")
+    def test_uses_cached_index(self, mock_settings):
+        from vaultuner.client import find_secret_by_key
+        from vaultuner.config import Settings
+
+        mock_settings.return_value = Settings(
+            access_token="token", organization_id="org-123"
+        )
+
+        secret = MagicMock(id="secret-id-123", key="myproject/api-key")
+        client = MagicMock()
+        client.secrets().list.return_value = MagicMock(data=MagicMock(data=[secret]))
+
+        first = find_secret_by_key(client, "myproject/api-key")
+        second = find_secret_by_key(client, "myproject/api-key")
+
+        assert first == {"id": "secret-id-123", "key": "myproject/api-key"}
+        assert second == {
+            "id": "secret-id-123",
+            "key": "myproject/api-key",
+            "cached": True,
+        }
+        client.secrets().list.assert_called_once()
+
+    @patch("vaultuner.client.get_settings")
+    def test_refresh_bypasses_index(self, mock_settings):
+        from vaultuner.client import find_secret_by_key
+        from vaultuner.config import Settings
+
+        mock_settings.return_value = Settings(
+            access_token="token", organization_id="org-123"
+        )
+
+        secret = MagicMock(id="secret-id-123", key="myproject/api-key")
+        client = MagicMock()
+        client.secrets().list.return_value = MagicMock(data=MagicMock(data=[secret]))
+
+        find_secret_by_key(client, "myproject/api-key")
+        result = find_secret_by_key(client, "myproject/api-key", refresh=True)
+
+        assert "cached" not in result
+        assert client.secrets().list.call_count == 2
+
+    @patch("vaultuner.client.get_settings")
+    def test_index_miss_lists_again(self, mock_settings):
+        from vaultuner.client import find_secret_by_key
+        from vaultuner.config import Settings
+
+        mock_settings.return_value = Settings(
+            access_token="token", organization_id="org-123"
+        )
+
+        client = MagicMock()
+        client.secrets().list.return_value = MagicMock(data=MagicMock(data=[]))
+
+        assert find_secret_by_key(client, "myproject/api-key") is None
+        assert find_secret_by_key(client, "myproject/api-key") is None
+        assert client.secrets().list.call_count == 2
+
+
+class TestRetryingClient:
+    @patch("vaultuner.retry.time.sleep")
+    def test_retries_transient_errors(self, mock_sleep):
+        from vaultuner.client import RetryingClient
+
+        client = MagicMock()
+        client.secrets().update.side_effect = [Exception("503"), "updated"]
+
+        result = RetryingClient(client).secrets().update(key="a", value="b")
+
+        assert result == "updated"
+        assert client.secrets().update.call_count == 2
+        client.secrets().update.assert_called_with(key="a", value="b")
+
+    @patch("vaultuner.retry.time.sleep")
+    def test_create_is_not_retried_after_ambiguous_failures(self, mock_sleep):
+        from vaultuner.client import RetryingClient
+
+        client = MagicMock()
+        client.secrets().create.side_effect = Exception("504 Gateway Timeout")
+
+        with pytest.raises(Exception, match="504"):
+            RetryingClient(client).secrets().create(key="a", value="b")
+        client.secrets().create.assert_called_once()
+
+    @patch("vaultuner.retry.time.sleep")
+    def test_create_is_retried_when_throttled_or_refused(self, mock_sleep):
+        from vaultuner.client import RetryingClient
+
+        client = MagicMock()
+        client.projects().create.side_effect = [
+            Exception("429 Too Many Requests"),
+            Exception("error sending request: Connection refused"),
+            "created",
+        ]
+
+        assert RetryingClient(client).projects().create("org", "myapp") == "created"
+        assert client.projects().create.call_count == 3
+
+    @patch("vaultuner.retry.time.sleep")
+    def test_waits_for_limiter_on_every_attempt(self, mock_sleep):
+        from vaultuner.client import RetryingClient
+
+        client = MagicMock()
+        client.projects().list.side_effect = [Exception("429"), "projects"]
+        limiter = MagicMock()
+
+        assert RetryingClient(client, limiter).projects().list("org") == "projects"
+        assert limiter.acquire.call_count == 2
+
+    def test_permanent_errors_are_raised(self):
+        from vaultuner.client import RetryingClient
+
+        client = MagicMock()
+        client.secrets().get.side_effect = Exception("404 Not Found")
+
+        with pytest.raises(Exception, match="404"):
+            RetryingClient(client).secrets().get("id")
+        client.secrets().get.assert_called_once()
+
+    def test_counts_requests(self):
+        from vaultuner.client import RetryingClient
+        from vaultuner.retry import retry_stats
+
+        before = retry_stats.calls
+        RetryingClient(MagicMock()).secrets().list("org")
+        assert retry_stats.calls == before + 1
+
+
+class TestGetRateLimiter:
+    def test_disabled(self):
+        from vaultuner.client import get_rate_limiter
+
+        assert get_rate_limiter(MagicMock(rate_limit=0)) is None
+
+    def test_shared_across_clients(self, monkeypatch):
+        import vaultuner.client
+        from vaultuner.client import get_rate_limiter
+
+        monkeypatch.setattr(vaultuner.client, "_rate_limiter", None)
+        settings = MagicMock(rate_limit=5.0, rate_burst=2)
+
+        limiter = get_rate_limiter(settings)
+        assert (limiter.rate, limiter.burst) == (5.0, 2)
+        assert get_rate_limiter(settings) is limiter
+
+
+class TestGetSecretsByIds:
+    def test_fetches_in_chunks(self):
+        from vaultuner.client import get_secrets_by_ids
+
+        client = MagicMock()
+        client.secrets().get_by_ids.side_effect = lambda ids: MagicMock(
+            data=MagicMock(data=[MagicMock(id=i, value=f"value-{i}") for i in ids])
+        )
+
+        result = get_secrets_by_ids(client, ["a", "b", "c"], batch_size=2)
+
+        assert [s.value for s in result.values()] == ["value-a", "value-b", "value-c"]
+        calls = [c.args[0] for c in client.secrets().get_by_ids.call_args_list]
+        assert calls == [["a", "b"], ["c"]]
+        client.secrets().get.assert_not_called()
+
+    def test_preserves_requested_order(self):
+        from vaultuner.client import get_secrets_by_ids
+
+        client = MagicMock()
+        client.secrets().get_by_ids.return_value = MagicMock(
+            data=MagicMock(data=[MagicMock(id="b"), MagicMock(id="a")])
+        )
+
+        result = get_secrets_by_ids(client, ["a", "b"])
+        assert list(result) == ["a", "b"]
+
+    def test_falls_back_to_single_gets_when_bulk_fails(self):
+        from vaultuner.client import get_secrets_by_ids
+
+        client = MagicMock()
+        client.secrets().get_by_ids.side_effect = Exception("bulk unavailable")
+        client.secrets().get.side_effect = lambda secret_id: MagicMock(
+            data=MagicMock(value=f"value-{secret_id}")
+        )
+
+        result = get_secrets_by_ids(client, ["a", "b"])
+
+        assert {k: v.value for k, v in result.items()} == {
+            "a": "value-a",
+            "b": "value-b",
+        }
+        assert client.secrets().get.call_count == 2
+
+    def test_concurrent_fetches_keep_requested_order(self):
+        from vaultuner.client import get_secrets_by_ids
+
+        def get_by_ids(ids):
+            # Later chunks finish first
+            time.sleep(0.02 if "a" in ids else 0)
+            return MagicMock(data=MagicMock(data=[MagicMock(id=i) for i in ids]))
+
+        client = MagicMock()
+        client.secrets().get_by_ids.side_effect = get_by_ids
+        ids = list("abcdefgh")
+
+        result = get_secrets_by_ids(client, ids, batch_size=2, concurrency=4)
+
+        assert list(result) == ids
+        assert client.secrets().get_by_ids.call_count == 4
+
+    def test_concurrent_fallback_only_for_failed_chunks(self):
+        from vaultuner.client import get_secrets_by_ids
+
+        def get_by_ids(ids):
+            if "c" in ids:
+                raise Exception("bulk unavailable")
+            return MagicMock(data=MagicMock(data=[MagicMock(id=i) for i in ids]))
+
+        client = MagicMock()
+        client.secrets().get_by_ids.side_effect = get_by_ids
+        client.secrets().get.side_effect = lambda secret_id: MagicMock(
+            data=MagicMock(id=secret_id)
+        )
+
+        result = get_secrets_by_ids(client, list("abcd"), batch_size=2, concurrency=2)
+
+        assert list(result) == list("abcd")
+        fetched = sorted(c.args[0] for c in client.secrets().get.call_args_list)
+        assert fetched == ["c", "d"]
+
+    def test_fallback_skips_missing_ids(self):
+        from vaultuner.client import get_secrets_by_ids
+
+        def get(secret_id):
+            if secret_id == "gone":
+                raise Exception(f"404 Not Found: secret {secret_id}")
+            return MagicMock(data=MagicMock(id=secret_id))
+
+        client = MagicMock()
+        client.secrets().get_by_ids.side_effect = Exception("404 Not Found")
+        client.secrets().get.side_effect = get
+
+        result = get_secrets_by_ids(client, ["a", "gone", "b"])
+
+        assert list(result) == ["a", "b"]
+
+    @pytest.mark.parametrize("error", ["403 Forbidden", "400 Bad Request"])
+    def test_fallback_raises_other_errors(self, error):
+        from vaultuner.client import get_secrets_by_ids
+
+        client = MagicMock()
+        client.secrets().get_by_ids.side_effect = Exception(error)
+        client.secrets().get.side_effect = Exception(error)
+
+        with pytest.raises(Exception, match=error):
+            get_secrets_by_ids(client, ["a"])
+
+    def test_transient_bulk_failure_is_not_fanned_out(self):
+        from vaultuner.client import get_secrets_by_ids
+
+        client = MagicMock()
+        client.secrets().get_by_ids.side_effect = Exception("429 Too Many Requests")
+
+        with pytest.raises(Exception, match="429"):
+            get_secrets_by_ids(client, ["a", "b"])
+        client.secrets().get.assert_not_called()
+
+    def test_empty_bulk_response_is_not_a_failure(self):
+        from vaultuner.client import get_secrets_by_ids
+
+        client = MagicMock()
+        client.secrets().get_by_ids.return_value = MagicMock(data=MagicMock(data=[]))
+
+        assert get_secrets_by_ids(client, ["gone"]) == {}
+        client.secrets().get.assert_not_called()
+
+    def test_rejects_invalid_batch_size(self):
+        from vaultuner.client import get_secrets_by_ids
+
+        with pytest.raises(ValueError, match="Batch size"):
+            get_secrets_by_ids(MagicMock(), ["a"], batch_size=0)
+
+
+class TestGetSecretsByKeys:
+    @staticmethod
+    def make_client(secrets):
+        client = MagicMock()
+        client.secrets().list.return_value = MagicMock(
+            data=MagicMock(data=[MagicMock(id=s.id, key=s.key) for s in secrets])
+        )
+        by_id = {s.id: s for s in secrets}
+        client.secrets().get_by_ids.side_effect = lambda ids: MagicMock(
+            data=MagicMock(data=[by_id[i] for i in ids if i in by_id])
+        )
+        return client
+
+    @patch("vaultuner.client.get_settings")
+    def test_lists_once_and_fetches_in_bulk(self, mock_settings):
+        from vaultuner.client import get_secrets_by_keys
+
+        mock_settings.return_value = MagicMock(organization_id="org-123", index_ttl=0)
+        secrets = [
+            MagicMock(id="id-1", key="app/a", value="1"),
+            MagicMock(id="id-2", key="app/b", value="2"),
+        ]
+        client = self.make_client(secrets)
+
+        result = get_secrets_by_keys(client, ["app/b", "app/a", "app/missing"])
+
+        assert {k: v.value for k, v in result.items()} == {"app/b": "2", "app/a": "1"}
+        client.secrets().list.assert_called_once()
+        client.secrets().get_by_ids.assert_called_once_with(["id-2", "id-1"])
+
+    @patch("vaultuner.client.load_key_index")
+    @patch("vaultuner.client.get_settings")
+    def test_uses_index_when_it_covers_all_keys(self, mock_settings, mock_index):
+        from vaultuner.client import get_secrets_by_keys
+
+        mock_settings.return_value = MagicMock(organization_id="org-123", index_ttl=0)
+        mock_index.return_value = {"app/a": "id-1"}
+        client = self.make_client([MagicMock(id="id-1", key="app/a", value="1")])
+
+        result = get_secrets_by_keys(client, ["app/a"])
+
+        assert result["app/a"].value == "1"
+        client.secrets().list.assert_not_called()
+
+    @patch("vaultuner.client.load_key_index")
+    @patch("vaultuner.client.get_settings")
+    def test_stale_index_is_refreshed(self, mock_settings, mock_index):
+        from vaultuner.client import get_secrets_by_keys
+
+        mock_settings.return_value = MagicMock(organization_id="org-123", index_ttl=0)
+        mock_index.return_value = {"app/a": "old-id"}
+        client = self.make_client([MagicMock(id="new-id", key="app/a", value="1")])
+
+        result = get_secrets_by_keys(client, ["app/a"])
+
+        assert result["app/a"].value == "1"
+        client.secrets().list.assert_called_once()
+
+
+class TestBitwardenProjectName:
+    def test_single_mode_uses_default_project(self):
+        from vaultuner.client import bitwarden_project_name
+
+        assert bitwarden_project_name("myapp/prod/key", "single") == "vaultuner"
+        assert bitwarden_project_name("not a path", "single") == "vaultuner"
+
+    def test_project_mode(self):
+        from vaultuner.client import bitwarden_project_name
+
+        assert bitwarden_project_name("myapp/prod/key", "project") == "myapp"
+        assert bitwarden_project_name("@acme/web/key", "project") == "@acme/web"
+
+    def test_env_mode(self):
+        from vaultuner.client import bitwarden_project_name
+
+        assert bitwarden_project_name("myapp/prod/key", "env") == "myapp/prod"
+        assert bitwarden_project_name("myapp/key", "env") == "myapp"
+        assert bitwarden_project_name("@acme/web/prod/key", "env") == "@acme/web/prod"
+
+    def test_invalid_path_in_project_mode(self):
+        from vaultuner.client import bitwarden_project_name
+
+        with pytest.raises(ValueError, match="Invalid path"):
+            bitwarden_project_name("nope", "project")
+
+
+class TestListProjectIds:
+    @patch("vaultuner.client.get_settings")
+    def test_lists_and_caches(self, mock_settings):
+        from pydantic import SecretStr
+
+        from vaultuner.client import list_project_ids
+        from vaultuner.config import Settings
+
+        mock_settings.return_value = Settings(
+            access_token=SecretStr("token"), organization_id="org-123"
+        )
+        project = MagicMock(id="p-1")
+        project.name = "myapp"
+        client = MagicMock()
+        client.projects().list.return_value = MagicMock(data=MagicMock(data=[project]))
+
+        assert list_project_ids(client) == {"myapp": "p-1"}
+        assert list_project_ids(client) == {"myapp": "p-1"}
+        assert client.projects().list.call_count == 1
+
+        list_project_ids(client, refresh=True)
+        assert client.projects().list.call_count == 2
@@ -1,34 +1,43 @@
 # ABOUTME: Tests for the config module.
-# ABOUTME: Tests keyring operations and settings loading.
+# ABOUTME: Tests keyring operations, batched credential loading and settings sources.
 
+import os
+import subprocess
+import sys
 from unittest.mock import patch
 
 import pytest
 
 from vaultuner.config import (
     SERVICE_NAME,
+    KeyringCredentials,
+    Settings,
+    clear_keyring_credentials,
     delete_keyring_value,
     get_keyring_value,
+    get_settings,
     is_keyring_accessible,
+    keyring_skipped,
+    load_keyring_credentials,
     set_keyring_value,
 )
 
 
 class TestGetKeyringValue:
-    @patch("vaultuner.config.keyring.get_password")
+    @patch("keyring.get_password")
     def test_returns_value(self, mock_get):
         mock_get.return_value = "secret-value"
         result = get_keyring_value("test_key")
         assert result == "secret-value"
         mock_get.assert_called_once_with(SERVICE_NAME, "test_key")
 
-    @patch("vaultuner.config.keyring.get_password")
+    @patch("keyring.get_password")
     def test_returns_none_when_missing(self, mock_get):
         mock_get.return_value = None
         result = get_keyring_value("missing_key")
         assert result is None
 
-    @patch("vaultuner.config.keyring.get_password")
+    @patch("keyring.get_password")
     def test_returns_none_when_keyring_inaccessible(self, mock_get):
         import keyring.errors
 
@@ -38,19 +47,19 @@ class TestGetKeyringValue:
 
 
 class TestSetKeyringValue:
-    @patch("vaultuner.config.keyring.set_password")
+    @patch("keyring.set_password")
     def test_stores_value(self, mock_set):
         set_keyring_value("test_key", "test_value")
         mock_set.assert_called_once_with(SERVICE_NAME, "test_key", "test_value")
 
 
 class TestDeleteKeyringValue:
-    @patch("vaultuner.config.keyring.delete_password")
+    @patch("keyring.delete_password")
     def test_deletes_value(self, mock_delete):
         delete_keyring_value("test_key")
         mock_delete.assert_called_once_with(SERVICE_NAME, "test_key")
 
-    @patch("vaultuner.config.keyring.delete_password")
+    @patch("keyring.delete_password")
     def test_ignores_missing_key(self, mock_delete):
         import keyring.errors
 
@@ -59,12 +68,12 @@ class TestDeleteKeyringValue:
 
 
 class TestIsKeyringAccessible:
-    @patch("vaultuner.config.keyring.get_password")
+    @patch("keyring.get_password")
     def test_returns_true_when_accessible(self, mock_get):
         mock_get.return_value = None
         assert is_keyring_accessible() is True
 
-    @patch("vaultuner.config.keyring.get_password")
+    @patch("keyring.get_password")
     def test_returns_false_when_keyring_error(self, mock_get):
         import keyring.errors
 
@@ -99,10 +108,143 @@ class TestPlatformCheck:
             delete_keyring_value("test_key")
 
     @patch("vaultuner.config.sys.platform", "darwin")
-    @patch("vaultuner.config.keyring.get_password")
+    @patch("keyring.get_password")
     def test_get_keyring_works_on_darwin(self, mock_get):
         from vaultuner.config import get_keyring_value
 
         mock_get.return_value = "value"
         result = get_keyring_value("test_key")
         assert result == "value"
+
+
+class TestLoadKeyringCredentials:
+    @patch("vaultuner.config.sys.platform", "darwin")
+    @patch("keyring.get_password")
+    def test_reads_each_credential_once(self, mock_get):
+        mock_get.side_effect = lambda service, key: f"{key}-value"
+
+        first = load_keyring_credentials()
+        second = load_keyring_credentials()
+
+        assert first is second
+        assert first == KeyringCredentials(
+            True,
+            {
+                "access_token": "bws_access_token-value",
+                "organization_id": "bws_organization_id-value",
+            },
+        )
+        assert mock_get.call_count == 2
+
+    @patch("vaultuner.config.sys.platform", "darwin")
+    @patch("keyring.get_password")
+    def test_stops_at_first_keyring_error(self, mock_get):
+        import keyring.errors
+
+        mock_get.side_effect = keyring.errors.KeyringError("(-25308, 'Unknown Error')")
+        assert load_keyring_credentials() == KeyringCredentials(False, {})
+        assert mock_get.call_count == 1
+
+    @patch("vaultuner.config.sys.platform", "darwin")
+    @patch("keyring.get_password")
+    def test_skips_missing_values(self, mock_get):
+        mock_get.side_effect = lambda service, key: (
+            "token" if key == "bws_access_token" else None
+        )
+        assert load_keyring_credentials().values == {"access_token": "token"}
+
+    @patch("vaultuner.config.sys.platform", "linux")
+    @patch("keyring.get_password")
+    def test_inaccessible_on_non_darwin(self, mock_get):
+        assert load_keyring_credentials() == KeyringCredentials(False, {})
+        mock_get.assert_not_called()
+
+    @patch("vaultuner.config.sys.platform", "darwin")
+    @patch("keyring.get_password")
+    def test_clear_reads_again(self, mock_get):
+        mock_get.return_value = None
+        load_keyring_credentials()
+        clear_keyring_credentials()
+        load_keyring_credentials()
+        assert mock_get.call_count == 4
+
+
+class TestKeyringSkipped:
+    @pytest.mark.parametrize(
+        ("env", "skipped"),
+        [
+            ({}, False),
+            ({"BWS_ACCESS_TOKEN": "token"}, False),
+            ({"BWS_ACCESS_TOKEN": "token", "BWS_PREFER_ENV": "true"}, True),
+            ({"BWS_ACCESS_TOKEN": "token", "BWS_PREFER_ENV": "0"}, False),
+            ({"BWS_ACCESS_TOKEN": "token", "CI": "1"}, True),
+            ({"BWS_PREFER_ENV": "1", "CI": "true"}, False),
+        ],
+    )
+    def test_requires_token_and_preference(self, monkeypatch, env, skipped):
+        for name in ("BWS_ACCESS_TOKEN", "BWS_PREFER_ENV", "CI"):
+            monkeypatch.delenv(name, raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        assert keyring_skipped() is skipped
+
+
+class TestSettingsSources:
+    @patch("vaultuner.config.load_keyring_credentials")
+    def test_keyring_values_take_precedence(self, mock_load, monkeypatch):
+        monkeypatch.setenv("BWS_ACCESS_TOKEN", "env-token")
+        monkeypatch.setenv("BWS_ORGANIZATION_ID", "env-org")
+        monkeypatch.delenv("BWS_PREFER_ENV", raising=False)
+        monkeypatch.delenv("CI", raising=False)
+        mock_load.return_value = KeyringCredentials(True, {"access_token": "kc-token"})
+
+        settings = Settings()
+
+        assert settings.access_token.get_secret_value() == "kc-token"
+        assert settings.organization_id == "env-org"
+
+    @patch("vaultuner.config.load_keyring_credentials")
+    def test_prefer_env_skips_keyring(self, mock_load, monkeypatch):
+        monkeypatch.setenv("BWS_ACCESS_TOKEN", "env-token")
+        monkeypatch.setenv("BWS_ORGANIZATION_ID", "env-org")
+        monkeypatch.setenv("BWS_PREFER_ENV", "1")
+
+        settings = Settings()
+
+        assert settings.access_token.get_secret_value() == "env-token"
+        mock_load.assert_not_called()
+
+    def test_ci_run_never_imports_keyring(self):
+        code = (
+            "import sys; from vaultuner.config import get_settings; get_settings(); "
+            "assert 'keyring' not in sys.modules"
+        )
+        env = {
+            **os.environ,
+            "BWS_ACCESS_TOKEN": "token",
+            "BWS_ORGANIZATION_ID": "org",
+            "CI": "true",
+        }
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+
+class TestGetSettings:
+    @pytest.fixture(autouse=True)
+    def env(self, monkeypatch):
+        monkeypatch.setattr("vaultuner.config._settings", None)
+        monkeypatch.setenv("BWS_ACCESS_TOKEN", "token")
+        monkeypatch.setenv("BWS_ORGANIZATION_ID", "org")
+        monkeypatch.setenv("CI", "true")
+
+    @pytest.mark.parametrize("name", ["BWS_RETRY_ATTEMPTS", "BWS_RATE_BURST"])
+    def test_rejects_values_below_one(self, monkeypatch, name):
+        monkeypatch.setenv(name, "0")
+
+        with pytest.raises(SystemExit, match=f"Invalid settings:\n  {name}: "):
+            get_settings()
+
+    def test_missing_credentials(self, monkeypatch):
+        monkeypatch.delenv("BWS_ORGANIZATION_ID")
+
+        with pytest.raises(SystemExit, match="Credentials not configured"):
+            get_settings()
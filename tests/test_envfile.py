@@ -0,0 +1,179 @@
+# ABOUTME: Tests for the envfile module.
+# ABOUTME: Tests tokenizing, quoting, line spans, in-place rewrites and the export/import round trip.
+
+import random
+from unittest.mock import MagicMock, patch
+
+from vaultuner.envfile import (
+    EnvEntry,
+    format_env_line,
+    iter_env_entries,
+    read_env_entries,
+    rewrite_env_file,
+)
+from vaultuner.export import export_secrets
+from vaultuner.import_env import parse_env_entries
+
+
+def parse(text: str) -> list[tuple[str, str]]:
+    return [(e.name, e.value) for e in iter_env_entries(text.splitlines(True))]
+
+
+class TestIterEnvEntries:
+    def test_skips_comments_blank_lines_and_lines_without_equals(self):
+        assert parse("# comment\n\nNOT AN ENTRY\nA=1\n") == [("A", "1")]
+
+    def test_export_prefix(self):
+        assert parse("export API_KEY=abc\nexport\tTOKEN='x'\n") == [
+            ("API_KEY", "abc"),
+            ("TOKEN", "x"),
+        ]
+
+    def test_variable_named_export(self):
+        assert parse("export=1\n") == [("export", "1")]
+
+    def test_inline_comments(self):
+        assert parse("A=value # note\nB=a#b\nC='x' # quoted\nD=# empty\n") == [
+            ("A", "value"),
+            ("B", "a#b"),
+            ("C", "x"),
+            ("D", ""),
+        ]
+
+    def test_inline_comments_are_kept_on_entries(self):
+        entries = iter_env_entries(
+            [
+                "A=value # note\n",
+                'B="x" #quoted\n',
+                "C=a#b\n",
+                'D="multi\n',
+                'line" # end\n',
+            ]
+        )
+        assert [entry.comment for entry in entries] == [
+            "# note",
+            "#quoted",
+            "",
+            "# end",
+        ]
+
+    def test_double_quote_escapes(self):
+        assert parse(r'A="say \"hi\" \\ \n\t\$HOME \q"') == [
+            ("A", 'say "hi" \\ \n\t$HOME \\q')
+        ]
+
+    def test_single_quotes_are_literal(self):
+        assert parse(r"A='no \n escapes # here'") == [("A", r"no \n escapes # here")]
+
+    def test_multi_line_quoted_value(self):
+        entries = list(
+            iter_env_entries('A=1\nKEY="line one\nline two\n"\nB=2\n'.splitlines(True))
+        )
+        assert entries == [
+            EnvEntry("A", "1", 0, 1),
+            EnvEntry("KEY", "line one\nline two\n", 1, 4),
+            EnvEntry("B", "2", 4, 5),
+        ]
+
+    def test_unterminated_quote_is_read_as_plain_value(self):
+        entries = list(iter_env_entries('A="open\nB=2\n'.splitlines(True)))
+        assert entries == [EnvEntry("A", '"open', 0, 1), EnvEntry("B", "2", 1, 2)]
+
+    def test_handles_crlf_line_endings(self):
+        assert parse("A=1\r\nB='2'\r\n") == [("A", "1"), ("B", "2")]
+
+    def test_streams_lines_lazily(self):
+        def lines():
+            yield "A=1\n"
+            raise AssertionError("read past the first entry")
+
+        assert next(iter_env_entries(lines())) == EnvEntry("A", "1", 0, 1)
+
+
+class TestReadEnvEntries:
+    def test_missing_file(self, tmp_path):
+        assert list(read_env_entries(tmp_path / ".env")) == []
+
+    def test_large_file(self, tmp_path):
+        path = tmp_path / ".env"
+        with path.open("w") as f:
+            for i in range(50_000):
+                f.write(f'VAR_{i}="value {i}"  # generated\n')
+
+        count = 0
+        for count, entry in enumerate(read_env_entries(path), 1):
+            pass
+        assert count == 50_000
+        assert entry == EnvEntry(
+            "VAR_49999", "value 49999", 49_999, 50_000, "# generated"
+        )
+
+
+class TestRewriteEnvFile:
+    def test_replaces_whole_entries_and_appends(self, tmp_path):
+        path = tmp_path / ".env"
+        path.write_text('# top\nA=1\nKEY="multi\nline"\nB=2')
+        entries = {e.name: e for e in read_env_entries(path)}
+
+        rewrite_env_file(
+            path, {entries["KEY"]: 'KEY="single"', entries["B"]: "B=3"}, ["C=4"]
+        )
+
+        assert path.read_text() == '# top\nA=1\nKEY="single"\nB=3\nC=4\n'
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_creates_missing_file(self, tmp_path):
+        path = tmp_path / ".env"
+        rewrite_env_file(path, {}, ["A=1"])
+        assert path.read_text() == "A=1\n"
+
+
+class TestRoundTrip:
+    ALPHABET = 'abcXYZ019 =#$\'"\\\n\r\t-_/.é✓'
+
+    def random_values(self, count: int) -> list[str]:
+        rng = random.Random(17)
+        values = ["", " padded ", "#", "a # b", "trailing\\", '"', "'"]
+        while len(values) < count:
+            length = rng.randint(0, 40)
+            values.append("".join(rng.choice(self.ALPHABET) for _ in range(length)))
+        return values
+
+    def test_format_then_parse(self):
+        values = self.random_values(500)
+        text = "\n".join(
+            format_env_line(f"VAR_{i}", value) for i, value in enumerate(values)
+        )
+        assert parse(text) == [(f"VAR_{i}", value) for i, value in enumerate(values)]
+
+    @patch("vaultuner.export.get_client")
+    @patch("vaultuner.export.get_settings")
+    def test_export_then_import(self, mock_settings, mock_client, tmp_path):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        values = self.random_values(200)
+
+        client = MagicMock()
+        client.secrets().list.return_value = MagicMock(
+            data=MagicMock(
+                data=[
+                    MagicMock(id=str(i), key=f"myproject/var-{i}")
+                    for i in range(len(values))
+                ]
+            )
+        )
+        client.secrets().get_by_ids.return_value = MagicMock(
+            data=MagicMock(
+                data=[
+                    MagicMock(id=str(i), value=value) for i, value in enumerate(values)
+                ]
+            )
+        )
+        mock_client.return_value = client
+
+        output = tmp_path / ".env"
+        output.write_text("# existing\nexport OTHER='kept' # inline\n")
+        export_secrets("myproject", output)
+
+        assert parse_env_entries(output) == [("OTHER", "kept")] + [
+            (f"VAR_{i}", value) for i, value in enumerate(values)
+        ]
@@ -1,13 +1,15 @@
 # ABOUTME: Tests for the export module.
-# ABOUTME: Tests env file parsing, variable naming, and secret export.
+# ABOUTME: Tests env file parsing, variable naming, secret export and incremental sync.
 
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
-
 from vaultuner.export import (
     export_secrets,
     parse_env_file,
+    project_env_vars,
     secret_name_to_env_var,
+    sync_secrets,
 )
 from vaultuner.models import is_deleted
 
@@ -115,8 +117,8 @@ class TestExportSecrets:
         client.secrets().list.return_value = MagicMock(
             data=MagicMock(data=[secret1, secret2])
         )
-        client.secrets().get.return_value = MagicMock(
-            data=MagicMock(value="secret-value")
+        client.secrets().get_by_ids.return_value = MagicMock(
+            data=MagicMock(data=[MagicMock(id="1", value="secret-value")])
         )
         mock_client.return_value = client
 
@@ -139,8 +141,8 @@ class TestExportSecrets:
         client.secrets().list.return_value = MagicMock(
             data=MagicMock(data=[secret1, secret2])
         )
-        client.secrets().get.return_value = MagicMock(
-            data=MagicMock(value="prod-secret")
+        client.secrets().get_by_ids.return_value = MagicMock(
+            data=MagicMock(data=[MagicMock(id="1", value="prod-secret")])
         )
         mock_client.return_value = client
 
@@ -162,7 +164,9 @@ class TestExportSecrets:
         client.secrets().list.return_value = MagicMock(
             data=MagicMock(data=[secret1, secret2])
         )
-        client.secrets().get.return_value = MagicMock(data=MagicMock(value="value"))
+        client.secrets().get_by_ids.return_value = MagicMock(
+            data=MagicMock(data=[MagicMock(id="2", value="value")])
+        )
         mock_client.return_value = client
 
         output = tmp_path / ".env"
@@ -181,7 +185,9 @@ class TestExportSecrets:
 
         client = MagicMock()
         client.secrets().list.return_value = MagicMock(data=MagicMock(data=[secret]))
-        client.secrets().get.return_value = MagicMock(data=MagicMock(value="new-value"))
+        client.secrets().get_by_ids.return_value = MagicMock(
+            data=MagicMock(data=[MagicMock(id="1", value="new-value")])
+        )
         mock_client.return_value = client
 
         output = tmp_path / ".env"
@@ -204,7 +210,9 @@ class TestExportSecrets:
 
         client = MagicMock()
         client.secrets().list.return_value = MagicMock(data=MagicMock(data=[secret]))
-        client.secrets().get.return_value = MagicMock(data=MagicMock(value="new-value"))
+        client.secrets().get_by_ids.return_value = MagicMock(
+            data=MagicMock(data=[MagicMock(id="1", value="new-value")])
+        )
         mock_client.return_value = client
 
         output = tmp_path / ".env"
@@ -227,8 +235,8 @@ class TestExportSecrets:
 
         client = MagicMock()
         client.secrets().list.return_value = MagicMock(data=MagicMock(data=[secret]))
-        client.secrets().get.return_value = MagicMock(
-            data=MagicMock(value='value with "quotes" inside')
+        client.secrets().get_by_ids.return_value = MagicMock(
+            data=MagicMock(data=[MagicMock(id="1", value='value with "quotes" inside')])
         )
         mock_client.return_value = client
 
@@ -252,8 +260,8 @@ class TestExportSecrets:
         client.secrets().list.return_value = MagicMock(
             data=MagicMock(data=[secret1, secret2])
         )
-        client.secrets().get.return_value = MagicMock(
-            data=MagicMock(value="scoped-secret")
+        client.secrets().get_by_ids.return_value = MagicMock(
+            data=MagicMock(data=[MagicMock(id="1", value="scoped-secret")])
         )
         mock_client.return_value = client
 
@@ -263,3 +271,272 @@ class TestExportSecrets:
         assert added == 1
         assert skipped == 0
         assert 'API_KEY="scoped-secret"' in output.read_text()
+
+    @patch("vaultuner.export.get_client")
+    @patch("vaultuner.export.get_settings")
+    def test_fetches_values_in_one_bulk_request(
+        self, mock_settings, mock_client, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+
+        secrets = [
+            MagicMock(id="1", key="myproject/api-key"),
+            MagicMock(id="2", key="otherproject/api-key"),
+            MagicMock(id="3", key="myproject/db-pass"),
+        ]
+
+        client = MagicMock()
+        client.secrets().list.return_value = MagicMock(data=MagicMock(data=secrets))
+        client.secrets().get_by_ids.return_value = MagicMock(
+            data=MagicMock(
+                data=[
+                    MagicMock(id="3", value="db-value"),
+                    MagicMock(id="1", value="api-value"),
+                ]
+            )
+        )
+        mock_client.return_value = client
+
+        output = tmp_path / ".env"
+        added, skipped = export_secrets("myproject", output)
+
+        assert added == 2
+        client.secrets().get_by_ids.assert_called_once_with(["1", "3"])
+        client.secrets().get.assert_not_called()
+        # Output follows the listing order, not the bulk response order
+        assert output.read_text() == 'API_KEY="api-value"\nDB_PASS="db-value"\n'
+
+
+class TestProjectEnvVars:
+    @patch("vaultuner.export.get_client")
+    @patch("vaultuner.export.get_settings")
+    def test_maps_project_secrets_to_variables(
+        self, mock_settings, mock_client, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        secrets = [
+            MagicMock(id="1", key="myproject/prod/api-key"),
+            MagicMock(id="2", key="myproject/api-key"),
+            MagicMock(id="3", key="myproject/prod/API_KEY"),
+            MagicMock(id="4", key="myproject/prod/db-pass"),
+        ]
+        client = MagicMock()
+        client.secrets().list.return_value = MagicMock(data=MagicMock(data=secrets))
+        client.secrets().get_by_ids.return_value = MagicMock(
+            data=MagicMock(
+                data=[
+                    MagicMock(id="1", value="first"),
+                    MagicMock(id="3", value="second"),
+                    MagicMock(id="4", value="pw"),
+                ]
+            )
+        )
+        mock_client.return_value = client
+
+        assert project_env_vars("myproject", "prod") == {
+            "API_KEY": "first",
+            "DB_PASS": "pw",
+        }
+        client.secrets().get_by_ids.assert_called_once_with(["1", "3", "4"])
+        assert list(tmp_path.iterdir()) == []
+
+
+def bulk_response(values, revised=()):
+    """A get_by_ids response; IDs in ``revised`` were changed just now."""
+    now = datetime.now(timezone.utc)
+    return MagicMock(
+        data=MagicMock(
+            data=[
+                MagicMock(
+                    id=id,
+                    value=value,
+                    revision_date=now + timedelta(minutes=5)
+                    if id in revised
+                    else now - timedelta(days=1),
+                )
+                for id, value in values.items()
+            ]
+        )
+    )
+
+
+def make_sync_client(secrets, values):
+    client = MagicMock()
+    client.secrets().list.return_value = MagicMock(data=MagicMock(data=secrets))
+    client.secrets().get_by_ids.return_value = bulk_response(values)
+    return client
+
+
+class TestSyncSecrets:
+    @patch("vaultuner.export.get_client")
+    @patch("vaultuner.export.get_settings")
+    def test_first_sync_rewrites_changed_values_in_place(
+        self, mock_settings, mock_client, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_client.return_value = make_sync_client(
+            [
+                MagicMock(id="1", key="myproject/api-key"),
+                MagicMock(id="2", key="myproject/db-pass"),
+                MagicMock(id="3", key="myproject/new-key"),
+            ],
+            {"1": "new-api", "2": "db-value", "3": "fresh"},
+        )
+
+        output = tmp_path / ".env"
+        output.write_text(
+            '# App config\nAPI_KEY="old-api"\nDEBUG=1\nDB_PASS="db-value"\n'
+        )
+        output.chmod(0o600)
+
+        assert sync_secrets("myproject", output) == (1, 1, 1, 0)
+        assert output.read_text() == (
+            '# App config\nAPI_KEY="new-api"\nDEBUG=1\nDB_PASS="db-value"\n'
+            'NEW_KEY="fresh"\n'
+        )
+        assert output.stat().st_mode & 0o777 == 0o600
+        assert list(tmp_path.glob("*.tmp")) == []
+
+    @patch("vaultuner.export.get_client")
+    @patch("vaultuner.export.get_settings")
+    def test_unchanged_file_is_not_rewritten(
+        self, mock_settings, mock_client, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_client.return_value = make_sync_client(
+            [MagicMock(id="1", key="myproject/api-key")], {"1": "value"}
+        )
+
+        output = tmp_path / ".env"
+        output.write_text('API_KEY="value"\n')
+
+        with patch("vaultuner.export.rewrite_env_file") as mock_write:
+            assert sync_secrets("myproject", output) == (0, 0, 1, 0)
+        mock_write.assert_not_called()
+
+    @patch("vaultuner.export.get_client")
+    @patch("vaultuner.export.get_settings")
+    def test_skips_fetch_when_nothing_changed(
+        self, mock_settings, mock_client, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        client = make_sync_client(
+            [MagicMock(id="1", key="myproject/api-key")], {"1": "value"}
+        )
+        mock_client.return_value = client
+        output = tmp_path / ".env"
+        sync_secrets("myproject", output)
+
+        client.secrets().list.reset_mock()
+        client.secrets().get_by_ids.reset_mock()
+        client.secrets().sync.return_value = MagicMock(
+            data=MagicMock(has_changes=False)
+        )
+
+        assert sync_secrets("myproject", output) == (0, 0, 1, 0)
+        client.secrets().list.assert_not_called()
+        client.secrets().get_by_ids.assert_not_called()
+        since = client.secrets().sync.call_args.args[1]
+        assert since < datetime.now(timezone.utc)
+
+    @patch("vaultuner.export.get_client")
+    @patch("vaultuner.export.get_settings")
+    def test_only_revised_secrets_are_applied(
+        self, mock_settings, mock_client, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        client = make_sync_client(
+            [
+                MagicMock(id="1", key="myproject/api-key"),
+                MagicMock(id="2", key="myproject/db-pass"),
+            ],
+            {"1": "api", "2": "db"},
+        )
+        mock_client.return_value = client
+        output = tmp_path / ".env"
+        sync_secrets("myproject", output)
+        # A local edit to an unrevised secret is left alone
+        output.write_text('API_KEY="api"\nDB_PASS="local"\n')
+
+        client.secrets().sync.return_value = MagicMock(
+            data=MagicMock(has_changes=True)
+        )
+        client.secrets().get_by_ids.return_value = bulk_response(
+            {"1": "rotated", "2": "db"}, revised={"1"}
+        )
+
+        assert sync_secrets("myproject", output) == (0, 1, 1, 0)
+        assert output.read_text() == 'API_KEY="rotated"\nDB_PASS="local"\n'
+        # Only the project's secrets were fetched
+        assert client.secrets().get_by_ids.call_args.args[0] == ["1", "2"]
+
+    @patch("vaultuner.export.get_client")
+    @patch("vaultuner.export.get_settings")
+    def test_full_sync_when_file_was_removed(
+        self, mock_settings, mock_client, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        client = make_sync_client(
+            [MagicMock(id="1", key="myproject/api-key")], {"1": "value"}
+        )
+        mock_client.return_value = client
+        output = tmp_path / ".env"
+        sync_secrets("myproject", output)
+        output.unlink()
+
+        assert sync_secrets("myproject", output) == (1, 0, 0, 0)
+        client.secrets().sync.assert_not_called()
+        assert output.read_text() == 'API_KEY="value"\n'
+
+    @patch("vaultuner.export.get_client")
+    @patch("vaultuner.export.get_settings")
+    def test_keeps_inline_comment_of_rewritten_entry(
+        self, mock_settings, mock_client, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        mock_client.return_value = make_sync_client(
+            [MagicMock(id="1", key="myproject/api-key")], {"1": "new-api"}
+        )
+        output = tmp_path / ".env"
+        output.write_text("API_KEY=old # rotated monthly\n")
+
+        assert sync_secrets("myproject", output) == (0, 1, 0, 0)
+        assert output.read_text() == 'API_KEY="new-api" # rotated monthly\n'
+
+    @patch("vaultuner.export.get_client")
+    @patch("vaultuner.export.get_settings")
+    def test_comments_out_secrets_that_left_the_project(
+        self, mock_settings, mock_client, tmp_path
+    ):
+        mock_settings.return_value = MagicMock(organization_id="org-123")
+        client = make_sync_client(
+            [
+                MagicMock(id="1", key="myproject/api-key"),
+                MagicMock(id="2", key="myproject/db-pass"),
+            ],
+            {"1": "api", "2": "db"},
+        )
+        mock_client.return_value = client
+        output = tmp_path / ".env"
+        output.write_text("DEBUG=1\n")
+        sync_secrets("myproject", output)
+
+        client.secrets().sync.return_value = MagicMock(
+            data=MagicMock(has_changes=True)
+        )
+        client.secrets().list.return_value = MagicMock(
+            data=MagicMock(
+                data=[
+                    MagicMock(id="1", key="myproject/api-key"),
+                    MagicMock(id="2", key="_deleted_/myproject/db-pass"),
+                ]
+            )
+        )
+        client.secrets().get_by_ids.return_value = bulk_response({"1": "api"})
+
+        assert sync_secrets("myproject", output) == (0, 0, 1, 1)
+        assert output.read_text() == (
+            'DEBUG=1\nAPI_KEY="api"\n# DB_PASS was removed from the vault\n'
+        )
+        # Already commented out, so the next sync leaves it alone
+        assert sync_secrets("myproject", output) == (0, 0, 1, 0)
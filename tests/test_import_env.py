@@ -6,6 +6,7 @@ from vaultuner.import_env import (
     build_secret_path,
     env_var_to_secret_name,
     parse_env_entries,
+    plan_import,
 )
 
 
@@ -110,3 +111,27 @@ class TestBuildSecretPath:
             build_secret_path("@dpoblador/vaultuner", None, "api-key")
             == "@dpoblador/vaultuner/api-key"
         )
+
+
+class TestPlanImport:
+    def test_splits_new_and_existing(self):
+        entries = [("API_KEY", "a"), ("DB_PASS", "b")]
+        to_create, existing = plan_import(
+            entries, "myproject", "prod", {"myproject/prod/api-key": "id-1"}
+        )
+        assert to_create == [("DB_PASS", "myproject/prod/db-pass", "b")]
+        assert existing == ["myproject/prod/api-key"]
+
+    def test_preserves_input_order(self):
+        entries = [("C", "3"), ("A", "1"), ("B", "2")]
+        to_create, _ = plan_import(entries, "myproject", None, set())
+        assert [path for _, path, _ in to_create] == [
+            "myproject/c",
+            "myproject/a",
+            "myproject/b",
+        ]
+
+    def test_plans_repeated_variable_once(self):
+        entries = [("API_KEY", "first"), ("API_KEY", "second")]
+        to_create, _ = plan_import(entries, "myproject", None, set())
+        assert to_create == [("API_KEY", "myproject/api-key", "first")]
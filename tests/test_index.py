@@ -0,0 +1,103 @@
+# ABOUTME: Tests for the index module.
+# ABOUTME: Tests grouping by project/env, deleted keys, scoped paths and listing order.
+
+from unittest.mock import MagicMock
+
+from vaultuner.index import SecretIndex, iter_listed_secrets
+from vaultuner.models import SecretPath
+
+KEYS = [
+    "myapp/prod/api-key",
+    "other/token",
+    "myapp/db-url",
+    "_deleted_/myapp/prod/old-key",
+    "@acme/web/prod/api-key",
+    "not-a-path",
+    "myapp/dev/api-key",
+]
+
+
+def make_index() -> SecretIndex:
+    return SecretIndex(MagicMock(key=key) for key in KEYS)
+
+
+def keys(entries) -> list[str]:
+    return [entry.secret.key for entry in entries]
+
+
+class TestSecretIndex:
+    def test_ignores_invalid_paths(self):
+        assert len(make_index()) == 6
+
+    def test_query_everything_keeps_listing_order(self):
+        assert keys(make_index().query()) == [
+            "myapp/prod/api-key",
+            "other/token",
+            "myapp/db-url",
+            "@acme/web/prod/api-key",
+            "myapp/dev/api-key",
+        ]
+
+    def test_query_project_spans_all_envs(self):
+        assert keys(make_index().query("myapp")) == [
+            "myapp/prod/api-key",
+            "myapp/db-url",
+            "myapp/dev/api-key",
+        ]
+
+    def test_query_env_across_projects(self):
+        assert keys(make_index().query(env="prod")) == [
+            "myapp/prod/api-key",
+            "@acme/web/prod/api-key",
+        ]
+
+    def test_exact_env_none_matches_only_env_less_secrets(self):
+        assert keys(make_index().query("myapp", exact_env=True)) == ["myapp/db-url"]
+
+    def test_scoped_project(self):
+        entries = list(make_index().query("@acme/web", "prod"))
+        assert [entry.path for entry in entries] == [
+            SecretPath(project="@acme/web", env="prod", name="api-key")
+        ]
+
+    def test_deleted_secrets_are_indexed_under_original_path(self):
+        entries = list(make_index().query("myapp", "prod", include_deleted=True))
+        assert [(str(e.path), e.deleted) for e in entries] == [
+            ("myapp/prod/api-key", False),
+            ("myapp/prod/old-key", True),
+        ]
+
+    def test_unknown_project_or_env(self):
+        index = make_index()
+        assert list(index.query("missing")) == []
+        assert list(index.query("myapp", "staging")) == []
+
+    def test_projects(self):
+        index = SecretIndex(
+            MagicMock(key=key) for key in ["b/one", "a/two", "_deleted_/c/three"]
+        )
+        assert index.projects() == ["a", "b"]
+        assert index.projects(include_deleted=True) == ["a", "b", "c"]
+
+
+class TestIterListedSecrets:
+    def test_matches_unfiltered_query(self):
+        secrets = [MagicMock(key=key) for key in KEYS]
+        expected = [
+            (entry.path, entry.deleted)
+            for entry in SecretIndex(secrets).query(include_deleted=True)
+        ]
+        assert list(iter_listed_secrets(secrets, include_deleted=True)) == expected
+
+    def test_skips_deleted_by_default(self):
+        rows = iter_listed_secrets(MagicMock(key=key) for key in KEYS)
+        assert all(not deleted for _, deleted in rows)
+
+    def test_yields_before_the_listing_is_consumed(self):
+        def listing():
+            yield MagicMock(key="myapp/api-key")
+            raise AssertionError("read past the first secret")
+
+        path, deleted = next(iter_listed_secrets(listing()))
+        assert path.to_key() == "myapp/api-key"
+        assert deleted is False
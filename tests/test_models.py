@@ -1,9 +1,17 @@
 # ABOUTME: Tests for the models module.
 # ABOUTME: Tests SecretPath parsing, key generation, and note metadata.
 
+import os
+
 import pytest
 
-from vaultuner.models import SecretMetadata, SecretPath, parse_note, render_note
+from vaultuner.models import (
+    SecretMetadata,
+    SecretPath,
+    is_unchanged,
+    parse_note,
+    render_note,
+)
 
 
 class TestSecretPathParse:
@@ -283,3 +291,60 @@ class TestRenderNote:
         meta.description = "Now with metadata"
         result = render_note(meta, body)
         assert result == "---\ndescription: Now with metadata\n---\nThis was the original note."
+
+
+class TestIsUnchanged:
+    def test_same_value_and_note(self):
+        assert is_unchanged("abc", "note", "abc", "note")
+
+    def test_empty_note_matches_no_note(self):
+        assert is_unchanged("abc", "", "abc", None)
+        assert is_unchanged("abc", None, "abc", None)
+
+    def test_changed_value(self):
+        assert not is_unchanged("abc", "", "xyz", None)
+
+    def test_changed_note(self):
+        assert not is_unchanged("abc", "old", "abc", "new")
+        assert not is_unchanged("abc", "", "abc", "new")
+
+
+@pytest.mark.skipif(
+    not os.environ.get("VAULTUNER_BENCHMARK"),
+    reason="set VAULTUNER_BENCHMARK=1 to benchmark parsing",
+)
+class TestSecretPathParseThroughput:
+    def test_parse_beats_pydantic_model_per_key(self):
+        import timeit
+
+        from pydantic import BaseModel
+
+        # The pydantic model SecretPath used to be, fed by the same parse logic
+        class ModelPath(BaseModel):
+            project: str
+            name: str
+            env: str | None = None
+
+        parse = SecretPath.parse.__func__
+        # Scoped, environment and project-level keys, so every branch is timed
+        keys = []
+        for i in range(25_000):
+            keys += [
+                f"project-{i % 50}/env-{i % 3}/name-{i}",
+                f"project-{i % 50}/name-{i}",
+                f"@org/repo-{i % 50}/env-{i % 3}/name-{i}",
+                f"@org/repo-{i % 50}/name-{i}",
+            ]
+
+        parse_elapsed = min(
+            timeit.repeat(lambda: [parse(SecretPath, k) for k in keys], number=1, repeat=3)
+        )
+        model_elapsed = min(
+            timeit.repeat(lambda: [parse(ModelPath, k) for k in keys], number=1, repeat=3)
+        )
+
+        for key in keys[:4]:
+            assert tuple(parse(ModelPath, key).model_dump().values()) == parse(
+                SecretPath, key
+            )
+        assert parse_elapsed < model_elapsed
@@ -0,0 +1,76 @@
+# ABOUTME: Tests for the parallel module.
+# ABOUTME: Tests bounded fan-out, result ordering and rate limiting.
+
+import threading
+import time
+
+import pytest
+
+from unittest.mock import MagicMock
+
+from vaultuner.parallel import RateLimiter, run_parallel
+
+
+class TestRunParallel:
+    def test_sequential(self):
+        assert run_parallel(lambda x: x * 2, [1, 2, 3]) == [2, 4, 6]
+
+    def test_preserves_input_order(self):
+        def slow_first(x):
+            time.sleep(0.05 if x == 0 else 0)
+            return x
+
+        assert run_parallel(slow_first, range(5), concurrency=5) == [0, 1, 2, 3, 4]
+
+    def test_bounds_in_flight_calls(self):
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def work(_):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+
+        run_parallel(work, range(20), concurrency=3)
+        assert 1 < peak <= 3
+
+    def test_rejects_invalid_concurrency(self):
+        with pytest.raises(ValueError, match="Concurrency"):
+            run_parallel(lambda x: x, [1], concurrency=0)
+
+    def test_acquires_from_limiter_for_every_call(self):
+        limiter = MagicMock()
+        assert run_parallel(lambda x: x, range(4), 2, limiter) == [0, 1, 2, 3]
+        assert limiter.acquire.call_count == 4
+
+
+class TestRateLimiter:
+    def test_burst_is_immediate(self):
+        limiter = RateLimiter(rate=1, burst=3)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+        assert time.monotonic() - start < 0.5
+
+    def test_paces_calls_beyond_burst(self):
+        limiter = RateLimiter(rate=50, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        # The first call is free, the next five wait 20ms each
+        assert time.monotonic() - start >= 0.09
+
+    def test_shared_between_threads(self):
+        limiter = RateLimiter(rate=100, burst=2)
+        start = time.monotonic()
+        run_parallel(lambda _: limiter.acquire(), range(12), concurrency=4)
+        assert time.monotonic() - start >= 0.09
+
+    def test_rejects_invalid_rate(self):
+        with pytest.raises(ValueError, match="Rate"):
+            RateLimiter(rate=0)
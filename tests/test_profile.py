@@ -0,0 +1,91 @@
+# ABOUTME: Tests for the profile module.
+# ABOUTME: Tests span recording, per-name summaries and Chrome trace output.
+
+import json
+import threading
+
+from vaultuner.parallel import run_parallel
+from vaultuner.profile import Profiler
+
+
+class TestProfiler:
+    def test_disabled_records_nothing(self):
+        profiler = Profiler()
+        with profiler.span("login"):
+            pass
+        assert profiler.spans == []
+
+    def test_records_spans(self):
+        profiler = Profiler()
+        profiler.enable()
+        with profiler.span("secrets.list", "sdk"):
+            pass
+
+        [span] = profiler.spans
+        assert (span.name, span.category) == ("secrets.list", "sdk")
+        assert span.start >= 0
+        assert span.duration >= 0
+        assert span.thread == threading.get_ident()
+
+    def test_records_span_when_block_raises(self):
+        profiler = Profiler()
+        profiler.enable()
+        try:
+            with profiler.span("login"):
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        assert [span.name for span in profiler.spans] == ["login"]
+
+    def test_enable_discards_earlier_spans(self):
+        profiler = Profiler()
+        profiler.enable()
+        with profiler.span("old"):
+            pass
+        profiler.enable()
+        assert profiler.spans == []
+
+    def test_records_from_threads(self):
+        profiler = Profiler()
+        profiler.enable()
+
+        def work(_):
+            with profiler.span("secrets.get", "sdk"):
+                pass
+
+        run_parallel(work, range(20), concurrency=4)
+        assert len(profiler.spans) == 20
+
+    def test_summary_aggregates_by_name(self):
+        profiler = Profiler()
+        profiler.enable()
+        for _ in range(3):
+            with profiler.span("secrets.get", "sdk"):
+                pass
+        with profiler.span("login"):
+            pass
+
+        summary = {s.name: s for s in profiler.summary()}
+        assert summary["secrets.get"].count == 3
+        assert summary["secrets.get"].category == "sdk"
+        assert summary["secrets.get"].longest <= summary["secrets.get"].total
+        assert summary["login"].count == 1
+        totals = [s.total for s in profiler.summary()]
+        assert totals == sorted(totals, reverse=True)
+
+    def test_chrome_trace(self, tmp_path):
+        profiler = Profiler()
+        profiler.enable()
+        with profiler.span("command list", "command"):
+            with profiler.span("secrets.list", "sdk"):
+                pass
+
+        path = tmp_path / "trace.json"
+        profiler.write_trace(path)
+        events = json.loads(path.read_text())["traceEvents"]
+
+        assert [e["name"] for e in events] == ["command list", "secrets.list"]
+        assert all(e["ph"] == "X" for e in events)
+        outer, inner = events
+        assert outer["ts"] <= inner["ts"]
+        assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"] + 1
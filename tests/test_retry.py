@@ -0,0 +1,140 @@
+# ABOUTME: Tests for the retry module.
+# ABOUTME: Tests error classification, exponential backoff, jitter, Retry-After and counters.
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from vaultuner.retry import (
+    RetryStats,
+    is_not_found_error,
+    is_rate_limited,
+    is_transient_error,
+    is_unsent_error,
+    retry_after,
+    with_retry,
+)
+
+
+class TestIsTransientError:
+    def test_rate_limited(self):
+        assert is_transient_error(Exception("429 Too Many Requests"))
+
+    def test_server_unavailable(self):
+        assert is_transient_error(Exception("503 Service Unavailable"))
+
+    def test_network_error(self):
+        assert is_transient_error(Exception("error sending request: connection reset"))
+
+    def test_not_found_is_permanent(self):
+        assert not is_transient_error(Exception("404 Not Found"))
+
+    def test_validation_error_is_permanent(self):
+        assert not is_transient_error(Exception("Key is required"))
+
+    def test_status_codes_inside_ids_are_ignored(self):
+        error = Exception("404 Not Found: secret 9d2e5029-4290-4a50-8502-a50350429abc")
+        assert not is_transient_error(error)
+        assert not is_rate_limited(error)
+
+
+class TestIsNotFoundError:
+    def test_not_found(self):
+        assert is_not_found_error(Exception("404 Not Found"))
+        assert is_not_found_error(Exception("Resource not found."))
+
+    def test_other_errors(self):
+        assert not is_not_found_error(Exception("503 Service Unavailable"))
+
+    def test_status_codes_inside_ids_are_ignored(self):
+        error = Exception("400 Bad Request: project 7c1f4041-a404-4404-b404-40400404abcd")
+        assert not is_not_found_error(error)
+
+
+class TestIsUnsentError:
+    def test_throttled_and_refused(self):
+        assert is_unsent_error(Exception("429 Too Many Requests"))
+        assert is_unsent_error(Exception("tcp connect error: Connection refused"))
+
+    def test_ambiguous_failures(self):
+        assert not is_unsent_error(Exception("504 Gateway Timeout"))
+        assert not is_unsent_error(Exception("operation timed out"))
+        assert not is_unsent_error(Exception("connection reset by peer"))
+
+
+class TestIsRateLimited:
+    def test_rate_limited(self):
+        assert is_rate_limited(Exception("429 Too Many Requests"))
+
+    def test_server_error_is_not_throttling(self):
+        assert not is_rate_limited(Exception("503 Service Unavailable"))
+
+
+class TestRetryAfter:
+    def test_header_style(self):
+        assert retry_after(Exception("429 Too Many Requests; Retry-After: 7")) == 7.0
+
+    def test_prose_style(self):
+        assert retry_after(Exception("rate limited, retry after 1.5 seconds")) == 1.5
+
+    def test_missing(self):
+        assert retry_after(Exception("429 Too Many Requests")) is None
+
+
+class TestWithRetry:
+    @patch("vaultuner.retry.time.sleep")
+    def test_returns_first_success(self, mock_sleep):
+        func = MagicMock(return_value="ok")
+        assert with_retry(func) == "ok"
+        func.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch("vaultuner.retry.time.sleep")
+    def test_retries_transient_errors_with_backoff(self, mock_sleep):
+        func = MagicMock(side_effect=[Exception("429"), Exception("503"), "ok"])
+        assert with_retry(func, attempts=3, base_delay=1.0) == "ok"
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1.0, 2.0]
+
+    @patch("vaultuner.retry.time.sleep")
+    def test_gives_up_after_attempts(self, mock_sleep):
+        func = MagicMock(side_effect=Exception("429"))
+        with pytest.raises(Exception, match="429"):
+            with_retry(func, attempts=2)
+        assert func.call_count == 2
+
+    @patch("vaultuner.retry.time.sleep")
+    def test_does_not_retry_permanent_errors(self, mock_sleep):
+        func = MagicMock(side_effect=Exception("404 Not Found"))
+        with pytest.raises(Exception, match="404"):
+            with_retry(func)
+        func.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch("vaultuner.retry.random.random", return_value=1.0)
+    @patch("vaultuner.retry.time.sleep")
+    def test_jitter_shortens_delays(self, mock_sleep, mock_random):
+        func = MagicMock(side_effect=[Exception("503"), Exception("503"), "ok"])
+        assert with_retry(func, base_delay=1.0, jitter=0.5) == "ok"
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 1.0]
+
+    @patch("vaultuner.retry.time.sleep")
+    def test_honours_retry_after(self, mock_sleep):
+        func = MagicMock(side_effect=[Exception("429 Retry-After: 4"), "ok"])
+        assert with_retry(func, base_delay=1.0) == "ok"
+        mock_sleep.assert_called_once_with(4.0)
+
+    @patch("vaultuner.retry.time.sleep")
+    def test_caps_backoff(self, mock_sleep):
+        func = MagicMock(side_effect=[Exception("503")] * 9 + ["ok"])
+        assert with_retry(func, attempts=10, base_delay=1.0) == "ok"
+        assert mock_sleep.call_args_list[-1].args[0] == 30.0
+
+    @patch("vaultuner.retry.time.sleep")
+    def test_records_stats(self, mock_sleep):
+        stats = RetryStats()
+        func = MagicMock(side_effect=[Exception("429"), Exception("503"), "ok"])
+        with_retry(func, base_delay=1.0, stats=stats)
+        with_retry(lambda: "ok", stats=stats)
+
+        assert (stats.calls, stats.retries, stats.throttles) == (4, 2, 1)
+        assert stats.waited == 3.0
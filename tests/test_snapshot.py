@@ -0,0 +1,198 @@
+# ABOUTME: Tests for the snapshot module.
+# ABOUTME: Tests writing, reading and encrypting snapshots, and taking one from the fake backend.
+
+import sqlite3
+import stat
+
+import pytest
+from cryptography.fernet import InvalidToken
+
+from vaultuner.cache import get_fernet
+from vaultuner.config import Settings
+from vaultuner.snapshot import (
+    SnapshotError,
+    SnapshotSecret,
+    SnapshotValue,
+    load_snapshot,
+    load_snapshot_values,
+    take_snapshot,
+    write_snapshot,
+)
+
+NOTE = "---\ndescription: Primary database\n---\nRotated monthly"
+
+
+def stored_values(path) -> list:
+    with sqlite3.connect(path) as connection:
+        return [
+            value
+            for (value,) in connection.execute(
+                "SELECT value FROM secrets ORDER BY rowid"
+            )
+        ]
+
+
+@pytest.fixture
+def settings():
+    return Settings(access_token="token", organization_id="org-123", rate_limit=0)
+
+
+@pytest.fixture
+def secrets():
+    from tests.fake_bitwarden import FakeBitwarden
+
+    backend = FakeBitwarden()
+    project = backend.add_project("vaultuner")
+    return [
+        backend.add_secret("myapp/prod/db-password", "hunter2", NOTE, project.id),
+        backend.add_secret("myapp/api-key", "abc", "", None),
+        backend.add_secret("_deleted_/old/token", "gone", "---\n: [\n---", None),
+    ]
+
+
+class TestWriteSnapshot:
+    def test_round_trip_without_values(self, tmp_path, settings, secrets):
+        path = tmp_path / "org.snapshot"
+
+        assert write_snapshot(path, secrets, settings) == 3
+
+        loaded = load_snapshot(path)
+        assert [secret.key for secret in loaded] == [secret.key for secret in secrets]
+        assert loaded[0] == SnapshotSecret(
+            str(secrets[0].id),
+            "myapp/prod/db-password",
+            [str(secrets[0].project_id)],
+            secrets[0].revision_date.isoformat(),
+            {"description": "Primary database"},
+        )
+        assert loaded[1].project_ids == []
+        # Malformed frontmatter is stored as no metadata
+        assert loaded[2].metadata == {}
+
+    def test_values_are_left_out_by_default(self, tmp_path, settings, secrets):
+        path = tmp_path / "org.snapshot"
+        write_snapshot(path, secrets, settings)
+
+        assert stored_values(path) == [None, None, None]
+
+    def test_values_are_encrypted(self, tmp_path, settings, secrets):
+        path = tmp_path / "org.snapshot"
+        write_snapshot(path, secrets, settings, include_values=True)
+
+        assert b"hunter2" not in path.read_bytes()
+        fernet = get_fernet(settings)
+        assert [fernet.decrypt(value).decode() for value in stored_values(path)] == [
+            "hunter2",
+            "abc",
+            "gone",
+        ]
+
+    def test_values_need_the_same_access_token(self, tmp_path, settings, secrets):
+        path = tmp_path / "org.snapshot"
+        write_snapshot(path, secrets, settings, include_values=True)
+        other = Settings(access_token="other", organization_id="org-123")
+
+        with pytest.raises(InvalidToken):
+            get_fernet(other).decrypt(stored_values(path)[0])
+
+    def test_file_is_private_and_replaced(self, tmp_path, settings, secrets):
+        path = tmp_path / "org.snapshot"
+        write_snapshot(path, secrets, settings)
+        write_snapshot(path, secrets[:1], settings)
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+        assert len(load_snapshot(path)) == 1
+        assert list(tmp_path.glob(".*.tmp")) == []
+
+
+class TestLoadSnapshot:
+    def test_reads_one_project(self, tmp_path, settings):
+        from tests.fake_bitwarden import FakeBitwarden
+
+        backend = FakeBitwarden()
+        keys = [
+            "myapp/prod/a",
+            "myapp2/prod/b",
+            "_deleted_/myapp/c",
+            "my/app/d",
+            "myapp/e",
+            "@org/myapp/f",
+        ]
+        for key in keys:
+            backend.add_secret(key, "value")
+        path = tmp_path / "org.snapshot"
+        write_snapshot(path, backend.secrets_by_id.values(), settings)
+
+        assert [s.key for s in load_snapshot(path, "myapp")] == [
+            "myapp/prod/a",
+            "_deleted_/myapp/c",
+            "myapp/e",
+        ]
+        assert [s.key for s in load_snapshot(path, "@org/myapp")] == ["@org/myapp/f"]
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(SnapshotError, match="not found"):
+            load_snapshot(tmp_path / "missing.snapshot")
+
+    def test_not_a_database(self, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_text("not sqlite at all, just some text " * 10)
+        with pytest.raises(SnapshotError, match="Not a vaultuner snapshot"):
+            load_snapshot(path)
+
+    def test_other_database(self, tmp_path):
+        path = tmp_path / "other.db"
+        with sqlite3.connect(path) as connection:
+            connection.execute("CREATE TABLE things (id)")
+        with pytest.raises(SnapshotError, match="Not a vaultuner snapshot"):
+            load_snapshot(path)
+
+    def test_unsupported_format(self, tmp_path, settings, secrets):
+        path = tmp_path / "org.snapshot"
+        write_snapshot(path, secrets, settings)
+        with sqlite3.connect(path) as connection:
+            connection.execute("UPDATE meta SET value = '0' WHERE name = 'format'")
+        with pytest.raises(SnapshotError, match="Unsupported snapshot format"):
+            load_snapshot(path)
+
+
+class TestLoadSnapshotValues:
+    def test_decrypts_requested_values(self, tmp_path, settings, secrets):
+        path = tmp_path / "org.snapshot"
+        write_snapshot(path, secrets, settings, include_values=True)
+
+        values = load_snapshot_values(
+            path, ["myapp/prod/db-password", "myapp/missing"], settings
+        )
+
+        assert values == {
+            "myapp/prod/db-password": SnapshotValue(
+                "hunter2", {"description": "Primary database"}
+            )
+        }
+
+    def test_snapshot_without_values(self, tmp_path, settings, secrets):
+        path = tmp_path / "org.snapshot"
+        write_snapshot(path, secrets, settings)
+
+        with pytest.raises(SnapshotError, match="--include-values"):
+            load_snapshot_values(path, ["myapp/api-key"], settings)
+
+    def test_other_access_token(self, tmp_path, settings, secrets):
+        path = tmp_path / "org.snapshot"
+        write_snapshot(path, secrets, settings, include_values=True)
+        other = Settings(access_token="other", organization_id="org-123")
+
+        with pytest.raises(SnapshotError, match="different access token"):
+            load_snapshot_values(path, ["myapp/api-key"], other)
+
+
+class TestTakeSnapshot:
+    def test_fetches_every_secret_in_bulk(self, tmp_path, fake_bitwarden):
+        fake_bitwarden.populate([f"myapp/prod/secret-{i}" for i in range(250)])
+        path = tmp_path / "org.snapshot"
+
+        assert take_snapshot(path, batch_size=100) == 250
+
+        assert fake_bitwarden.calls == {"secrets.list": 1, "secrets.get_by_ids": 3}
+        assert {secret.key for secret in load_snapshot(path)} == fake_bitwarden.keys()
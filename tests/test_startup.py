@@ -0,0 +1,58 @@
+# ABOUTME: Startup benchmark for the CLI, based on python -X importtime.
+# ABOUTME: Fails if heavy dependencies leak into cold start or the import budget is exceeded.
+
+import subprocess
+import sys
+
+import pytest
+
+# Modules only the commands that talk to Bitwarden or render tables may load
+HEAVY_MODULES = [
+    "bitwarden_sdk",
+    "cryptography",
+    "keyring",
+    "pydantic",
+    "pydantic_settings",
+    "rich",
+    "yaml",
+]
+
+# Generous enough for slow CI machines; the module check above is the precise gate
+IMPORT_BUDGET_US = 500_000
+
+
+def import_times(code: str) -> dict[str, int]:
+    """Run code in a fresh interpreter and return cumulative import times in µs."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    @pytest.mark.parametrize(
+        "code",
+        [
+            "import vaultuner.cli",
+            "from vaultuner.cli import app; app(['generate'], standalone_mode=False)",
+            "from vaultuner.cli import app; app(['--version'], standalone_mode=False)",
+        ],
+    )
+    def test_heavy_modules_are_not_imported(self, code):
+        loaded = import_times(code)
+        leaked = [name for name in HEAVY_MODULES if name in loaded]
+        assert leaked == []
+
+    def test_import_within_budget(self):
+        loaded = import_times("import vaultuner.cli")
+        assert loaded["vaultuner.cli"] < IMPORT_BUDGET_US
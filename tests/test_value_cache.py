@@ -0,0 +1,152 @@
+# ABOUTME: Tests for the value_cache module.
+# ABOUTME: Tests per-secret freshness, stale serving, pruning, clearing and revalidation locks.
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from vaultuner.cache import cache_path, clear_cache, write_cache
+from vaultuner.config import Settings
+from vaultuner.value_cache import (
+    REVALIDATION_TIMEOUT,
+    CachedValue,
+    claim_revalidation,
+    clear_values,
+    lookup_value,
+    release_revalidation,
+    revalidation_lock_path,
+    start_revalidation,
+    store_value,
+)
+
+
+@pytest.fixture
+def settings():
+    return Settings(
+        access_token="token",
+        organization_id="org-123",
+        value_cache_ttl=60,
+        value_cache_stale=300,
+    )
+
+
+class TestLookupValue:
+    @patch("vaultuner.value_cache.time.time")
+    def test_fresh_then_stale_then_expired(self, mock_time, settings):
+        mock_time.return_value = 1000.0
+        store_value(settings, "myapp/api-key", "abc")
+
+        mock_time.return_value = 1030.0
+        assert lookup_value(settings, "myapp/api-key") == CachedValue("abc", 30.0, True)
+        mock_time.return_value = 1100.0
+        assert lookup_value(settings, "myapp/api-key") == CachedValue(
+            "abc", 100.0, False
+        )
+        mock_time.return_value = 1360.0
+        assert lookup_value(settings, "myapp/api-key") is None
+
+    @patch("vaultuner.value_cache.time.time")
+    def test_each_secret_has_its_own_age(self, mock_time, settings):
+        mock_time.return_value = 1000.0
+        store_value(settings, "myapp/old", "1")
+        mock_time.return_value = 1050.0
+        store_value(settings, "myapp/new", "2")
+
+        mock_time.return_value = 1070.0
+        assert lookup_value(settings, "myapp/old").fresh is False
+        assert lookup_value(settings, "myapp/new").fresh is True
+
+    def test_missing_key(self, settings):
+        store_value(settings, "myapp/api-key", "abc")
+        assert lookup_value(settings, "myapp/other") is None
+
+    def test_disabled_by_default(self):
+        settings = Settings(access_token="token", organization_id="org-123")
+        store_value(settings, "myapp/api-key", "abc")
+        assert lookup_value(settings, "myapp/api-key") is None
+        assert not cache_path("values", settings).exists()
+
+    def test_other_access_token_cannot_read(self, settings):
+        store_value(settings, "myapp/api-key", "abc")
+        other = Settings(
+            access_token="other-token", organization_id="org-123", value_cache_ttl=60
+        )
+        assert lookup_value(other, "myapp/api-key") is None
+
+    def test_values_are_encrypted_on_disk(self, settings):
+        store_value(settings, "myapp/api-key", "plain-secret-value")
+        assert b"plain-secret-value" not in cache_path("values", settings).read_bytes()
+
+
+class TestStoreValue:
+    @patch("vaultuner.value_cache.time.time")
+    def test_prunes_entries_too_old_to_serve(self, mock_time, settings):
+        mock_time.return_value = 1000.0
+        store_value(settings, "myapp/old", "1")
+        mock_time.return_value = 2000.0
+        store_value(settings, "myapp/new", "2")
+
+        mock_time.return_value = 2001.0
+        with patch("vaultuner.value_cache.write_cache") as mock_write:
+            store_value(settings, "myapp/newest", "3")
+        entries = mock_write.call_args.args[2]
+        assert sorted(entries) == ["myapp/new", "myapp/newest"]
+
+    @patch("vaultuner.value_cache.write_cache", side_effect=OSError("read-only"))
+    def test_ignores_write_errors(self, mock_write, settings):
+        store_value(settings, "myapp/api-key", "abc")
+
+
+class TestClear:
+    def test_clear_values_keeps_other_entries(self, settings):
+        store_value(settings, "myapp/api-key", "abc")
+        write_cache("index", settings, {"myapp/api-key": "id"})
+
+        assert clear_values() == 1
+        assert lookup_value(settings, "myapp/api-key") is None
+        assert cache_path("index", settings).exists()
+
+    def test_clear_cache_keeps_sessions(self, settings, isolated_cache_dir):
+        store_value(settings, "myapp/api-key", "abc")
+        write_cache("index", settings, {})
+        session = isolated_cache_dir / "session-abc.json"
+        session.write_text("{}")
+
+        assert clear_cache() == 2
+        assert list(isolated_cache_dir.iterdir()) == [session]
+
+
+class TestRevalidation:
+    def test_only_one_claim_at_a_time(self):
+        assert claim_revalidation("myapp/api-key") is True
+        assert claim_revalidation("myapp/api-key") is False
+        assert claim_revalidation("myapp/other") is True
+
+        release_revalidation("myapp/api-key")
+        assert claim_revalidation("myapp/api-key") is True
+
+    def test_abandoned_claim_expires(self):
+        claim_revalidation("myapp/api-key")
+        lock = revalidation_lock_path("myapp/api-key")
+        old = lock.stat().st_mtime - REVALIDATION_TIMEOUT - 1
+        os.utime(lock, (old, old))
+
+        assert claim_revalidation("myapp/api-key") is True
+
+    @patch("vaultuner.value_cache.subprocess.Popen")
+    def test_starts_detached_get(self, mock_popen):
+        start_revalidation("myapp/api-key")
+        start_revalidation("myapp/api-key")
+
+        mock_popen.assert_called_once()
+        args = mock_popen.call_args.args[0]
+        assert args[0] == sys.executable
+        assert args[3:] == ["get", "myapp/api-key", "--value", "--revalidate"]
+        assert mock_popen.call_args.kwargs["start_new_session"] is True
+
+    @patch("vaultuner.value_cache.subprocess.Popen", side_effect=OSError)
+    def test_releases_claim_when_spawn_fails(self, mock_popen):
+        start_revalidation("myapp/api-key")
+        assert claim_revalidation("myapp/api-key") is True